@@ -1,11 +1,20 @@
 # src/app.py
-from flask import Flask, request, jsonify
-from sqlalchemy import select, desc
-from hashlib import sha256
+import json
+from datetime import date
 
+from flask import Flask, Response, request, jsonify, stream_with_context
+from sqlalchemy import func, select, desc
+
+from . import jobs
+from .config import REVIEWS_PAGE_MAX, SNAPSHOT_DIR
 from .db import SessionLocal
-from .models import Review
-from .insights import compute_insights
+from .models import Product, Review
+from .insights import cached_insights, cached_compare, cached_cooccurrence, cached_trends, cache_stats
+from .ingest.bulk import BATCH as BULK_BATCH, iter_json_array, iter_ndjson, store_stream
+from .products import lookup_id
+from .search import SearchError, search
+from .sink import to_row, upsert_rows
+from .snapshot import SnapshotMissing, load_manifest
 
 app = Flask(__name__)
 
@@ -13,36 +22,147 @@ app = Flask(__name__)
 def health():
     return {"ok": True}
 
+def _product_arg(args):
+    # ?product_id=12 또는 ?product_url=... → (product_id, 지정 여부). 모르는 URL 이면 (None, True)
+    if args.get("product_id"):
+        return int(args["product_id"]), True
+    if args.get("product_url"):
+        return lookup_id(args["product_url"]), True
+    return None, False
+
+def _async():
+    return request.args.get("async") in ("1", "true")
+
+def _submit_job(kind, params):
+    # ?async=1: 계산을 작업 풀로 넘기고 202 + 작업 id. 결과는 GET /api/jobs/<id>
+    try:
+        job = jobs.submit(kind, params)
+    except jobs.JobQueueFull as e:
+        return {"error": str(e)}, 429, {"Retry-After": "5"}
+    return job, 202, {"Location": f"/api/jobs/{job['job_id']}"}
+
+REVIEW_COLUMNS = (Review.id, Review.source, Review.rating, Review.body, Review.review_date, Review.review_day,
+                  Review.sentiment, Review.sentiment_label, Review.product_id, Review.dup_of,
+                  func.coalesce(Product.url, Review.product_url).label("product_url"))
+EXPORT_BATCH = 2_000
+
+def _review_page(source, pid, by_product, before, n):
+    # 키셋: WHERE [source=? | product_id=?] AND id < cursor ORDER BY id DESC (컬럼만 조회)
+    stmt = (select(*REVIEW_COLUMNS).outerjoin(Product, Review.product_id == Product.id)
+            .order_by(desc(Review.id)).limit(n))
+    if source:
+        stmt = stmt.where(Review.source == source)
+    if by_product:
+        stmt = stmt.where(Review.product_id == pid)
+    if before is not None:
+        stmt = stmt.where(Review.id < before)
+    with SessionLocal() as s:
+        return s.execute(stmt).all()
+
+def _review_dict(r):
+    return {"id": r.id, "source": r.source, "rating": r.rating, "body": r.body,
+            "review_date": r.review_date, "product_id": r.product_id, "product_url": r.product_url,
+            "review_day": r.review_day.isoformat() if r.review_day else None,
+            "sentiment": r.sentiment, "sentiment_label": r.sentiment_label, "dup_of": r.dup_of}
+
 @app.get("/api/reviews")
 def list_reviews():
-    limit = int(request.args.get("limit", 20))
+    # ?limit=&cursor=(이전 응답의 X-Next-Cursor)&source=&product_id=|product_url=
+    # format=ndjson(또는 Accept: application/x-ndjson) 이면 페이지 상한 없이 배치 단위 스트리밍(전체 내보내기)
+    source = request.args.get("source")
+    pid, by_product = _product_arg(request.args)
+    cursor = request.args.get("cursor", type=int)
+    ndjson = (request.args.get("format") == "ndjson"
+              or request.accept_mimetypes.best == "application/x-ndjson")
+    limit = request.args.get("limit", type=int)
+
+    if ndjson:
+        def generate(before=cursor, left=limit):
+            if by_product and pid is None:
+                return
+            while left is None or left > 0:
+                n = EXPORT_BATCH if left is None else min(EXPORT_BATCH, left)
+                rows = _review_page(source, pid, by_product, before, n)  # 배치마다 짧은 세션
+                if rows:
+                    yield "".join(json.dumps(_review_dict(r), ensure_ascii=False) + "\n" for r in rows)
+                if len(rows) < n:
+                    return
+                before = rows[-1].id
+                if left is not None:
+                    left -= len(rows)
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    limit = max(1, min(limit or 20, REVIEWS_PAGE_MAX))
+    rows = [] if by_product and pid is None else _review_page(source, pid, by_product, cursor, limit)
+    resp = jsonify([_review_dict(r) for r in rows])
+    if len(rows) == limit:
+        resp.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return resp
+
+@app.get("/api/products")
+def list_products():
+    limit = int(request.args.get("limit", 50))
     source = request.args.get("source")
     with SessionLocal() as s:
-        stmt = select(Review).order_by(desc(Review.id)).limit(limit)
+        stmt = select(Product).order_by(desc(Product.id)).limit(limit)
         if source:
-            stmt = select(Review).where(Review.source == source).order_by(desc(Review.id)).limit(limit)
+            stmt = stmt.where(Product.source == source)
         rows = s.execute(stmt).scalars().all()
-    return jsonify([
-        {"id": r.id, "source": r.source, "rating": r.rating, "body": r.body,
-         "review_date": r.review_date, "product_url": r.product_url}
-        for r in rows
-    ])
+    return jsonify([{"id": p.id, "url": p.url, "source": p.source} for p in rows])
 
 @app.post("/api/reviews")
 def create_review():
-    d = request.get_json(force=True) or {}
-    h = d.get("hash_id") or sha256((str(d.get("body","")) + str(d.get("review_date",""))).encode()).hexdigest()
-    rv = Review(
-        source=d.get("source","partner"),
-        product_url=d.get("product_url"),
-        rating=d.get("rating"),
-        body=d.get("body"),
-        review_date=d.get("review_date"),
-        hash_id=h,
-    )
+    # 단건 제출: 대량 경로와 같은 review_hash/저장 경로. 이미 있는 리뷰면 200 + 기존 id
+    d = request.get_json(force=True, silent=True)
+    if not isinstance(d, dict):
+        return {"error": "JSON object expected"}, 400
+    try:
+        row = to_row(d, source="partner")
+    except ValueError as e:
+        return {"error": str(e)}, 400
     with SessionLocal() as s:
-        s.add(rv); s.commit(); s.refresh(rv)
-        return {"id": rv.id}, 201
+        n = upsert_rows(s, [row])
+        s.commit()
+        rid = s.execute(select(Review.id).where(Review.hash_id == row["hash_id"])).scalar()
+    if n:
+        return {"id": rid}, 201
+    return {"id": rid, "duplicated": True}, 200
+
+BULK_BATCH_MAX = 5_000
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines")
+
+@app.post("/api/reviews/bulk")
+def create_reviews_bulk():
+    # 본문: JSON 배열 또는 NDJSON(Content-Type: application/x-ndjson). ?source=partner&batch=1000
+    # 본문을 스트림으로 읽으며 batch 건마다 커밋 → 배치별 inserted/duplicated 반환
+    source = request.args.get("source", "partner")
+    batch = max(1, min(request.args.get("batch", BULK_BATCH, type=int), BULK_BATCH_MAX))
+    stream = request.stream
+    records = iter_ndjson(stream) if request.mimetype in NDJSON_TYPES else iter_json_array(stream)
+    out = store_stream(records, source=source, batch=batch)
+    return jsonify(out), (400 if out["aborted"] else 200)
+
+@app.get("/api/search")
+def api_search():
+    # ?q=삐걱 "배송 느" -환불&source=&product_id=|product_url=&pain=냄새/소음&sort=rank|recent&limit=&cursor=
+    # raw=1 이면 q 를 FTS5 질의식으로 그대로 사용
+    pid, by_product = _product_arg(request.args)
+    if by_product and pid is None:
+        return {"query": None, "items": [], "next_cursor": None}
+    try:
+        data = search(
+            request.args.get("q", ""),
+            source=request.args.get("source"),
+            product_id=pid,
+            pain=request.args.get("pain"),
+            sort=request.args.get("sort", "rank"),
+            limit=int(request.args.get("limit", 20)),
+            cursor=request.args.get("cursor"),
+            raw=request.args.get("raw") in ("1", "true"),
+        )
+    except SearchError as e:
+        return {"error": str(e)}, 400
+    return jsonify(data)
 
 @app.get("/api/insights")
 def api_insights():
@@ -50,8 +170,99 @@ def api_insights():
     source = request.args.get("source")  # e.g. "coupang"
     topk   = int(request.args.get("topk", 15))
     min_df = int(request.args.get("min_df", 2))
-    data = compute_insights(limit=limit, source=source, topk=topk, min_df=min_df)
+    snapshot = request.args.get("snapshot") in ("1", "true")  # Parquet 스냅샷에서 읽기(src.snapshot)
+    if snapshot and load_manifest(SNAPSHOT_DIR) is None:
+        return {"error": str(SnapshotMissing(SNAPSHOT_DIR))}, 409
+    if _async():
+        return _submit_job("insights", {"limit": limit, "source": source, "topk": topk, "min_df": min_df,
+                                        "snapshot": SNAPSHOT_DIR if snapshot else None})
+    try:
+        data = cached_insights(limit=limit, source=source, topk=topk, min_df=min_df, snapshot=snapshot)
+    except SnapshotMissing as e:   # 확인 직후 스냅샷 디렉터리가 지워진 경우
+        return {"error": str(e)}, 409
     return jsonify(data)
 
+@app.get("/api/insights/cooccurrence")
+def api_cooccurrence():
+    limit     = int(request.args.get("limit", 5000))
+    source    = request.args.get("source")
+    topk      = int(request.args.get("topk", 30))
+    min_count = int(request.args.get("min_count", 5))
+    metric    = request.args.get("metric", "pmi")   # pmi / lift / npmi / count
+    max_vocab = int(request.args.get("vocab", 2000))
+    if metric not in ("pmi", "lift", "npmi", "count"):
+        return {"error": f"unknown metric: {metric}"}, 400
+    if _async():
+        return _submit_job("cooccurrence", {"limit": limit, "source": source, "topk": topk,
+                                            "min_count": min_count, "metric": metric, "max_vocab": max_vocab})
+    data = cached_cooccurrence(limit=limit, source=source, topk=topk, min_count=min_count,
+                               metric=metric, max_vocab=max_vocab)
+    return jsonify(data)
+
+@app.route("/api/insights/compare", methods=["GET", "POST"])
+def api_compare():
+    # GET ?product_id=1&product_id=2 / ?product_url=a&product_url=b 또는 ?source=coupang,
+    # 목록이 길면 POST {"product_ids": [...]} / {"product_urls": [...]}
+    d = (request.get_json(silent=True) or {}) if request.method == "POST" else {}
+    args = {**request.args.to_dict(), **d}
+    ids = d.get("product_ids") or request.args.getlist("product_id", type=int)
+    urls = d.get("product_urls") or request.args.getlist("product_url")
+    source = args.get("source")
+    if not ids and not urls and not source:
+        return {"error": "product_id(s), product_url(s) or source is required"}, 400
+    limit = args.get("limit", 1000)
+    params = dict(
+        product_ids=[int(i) for i in ids] or None,
+        product_urls=urls or None,
+        source=source,
+        limit=None if limit in (0, "0", "all") else int(limit),
+        topk=int(args.get("topk", 10)),
+        min_df=int(args.get("min_df", 2)),
+        max_products=int(args.get("max_products", 50)),
+    )
+    if _async():
+        return _submit_job("compare", params)
+    return jsonify(cached_compare(**params))
+
+@app.get("/api/insights/trends")
+def api_trends():
+    # ?product_id=...|product_url=...|source=...&from=2024-05-01&to=2024-06-30&bucket=day|week|month&topk=5
+    bucket = request.args.get("bucket", "week")
+    if bucket not in ("day", "week", "month"):
+        return {"error": f"unknown bucket: {bucket}"}, 400
+    try:
+        start = date.fromisoformat(request.args["from"]) if request.args.get("from") else None
+        end = date.fromisoformat(request.args["to"]) if request.args.get("to") else None
+    except ValueError:
+        return {"error": "from/to must be YYYY-MM-DD"}, 400
+    pid, by_product = _product_arg(request.args)
+    if by_product and pid is None:
+        return {"error": "unknown product"}, 404
+    params = dict(
+        product_id=pid,
+        source=request.args.get("source"),
+        start=start, end=end, bucket=bucket,
+        topk=int(request.args.get("topk", 5)),
+    )
+    if _async():
+        return _submit_job("trends", params)
+    return jsonify(cached_trends(**params))
+
+@app.get("/api/insights/cache")
+def api_insights_cache():
+    return cache_stats()
+
+@app.get("/api/jobs/<job_id>")
+def api_job(job_id):
+    # status: queued / running(stage: fetch·analyze·sentiment 등) / done(result) / error(error)
+    job = jobs.status(job_id)
+    if job is None:
+        return {"error": "unknown or expired job"}, 404
+    return jsonify(job)
+
+@app.get("/api/jobs")
+def api_jobs():
+    return jobs.stats()
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,63 @@
+# src/backfill_text.py
+"""
+기존 리뷰에 본문 전처리 결과(body_norm/tokens/pain_mask) 채우기.
+스키마에 컬럼이 없으면 먼저 추가하고, text_ver 가 현재 TEXT_VERSION 이 아닌 행만 id 순서로
+배치 갱신한다(중단 후 다시 실행하면 남은 행부터).
+
+예) python -m src.backfill_text
+    python -m src.backfill_text --source coupang --batch 5000
+"""
+import argparse, time
+from typing import Dict
+
+from sqlalchemy import or_, select, update
+
+from .cache import bump_data_version
+from .db import SessionLocal
+from .init_db import migrate
+from .models import Review
+from .text import TEXT_VERSION, text_features
+
+BATCH = 10_000
+
+
+def backfill(source: str | None = None, batch: int = BATCH) -> Dict:
+    added = migrate()
+    if added:
+        print(f"[MIGRATE] added columns: {', '.join(added)}", flush=True)
+
+    t0 = time.perf_counter()
+    done, last_id = 0, 0
+    stale = or_(Review.text_ver.is_(None), Review.text_ver != TEXT_VERSION)
+    with SessionLocal() as s:
+        while True:
+            stmt = select(Review.id, Review.body).where(stale, Review.id > last_id)
+            if source:
+                stmt = stmt.where(Review.source == source)
+            rows = s.execute(stmt.order_by(Review.id).limit(batch)).all()
+            if not rows:
+                break
+            # 기본키 기준 ORM bulk UPDATE (executemany 1회)
+            s.execute(update(Review), [{"id": rid, **text_features(body)} for rid, body in rows])
+            bump_data_version(s)
+            s.commit()
+            done += len(rows)
+            last_id = rows[-1][0]
+            print(f"[BACKFILL] rows={done} (id<={last_id})", flush=True)
+
+    return {"updated": done, "seconds": round(time.perf_counter() - t0, 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--source", default=None)
+    ap.add_argument("--batch", type=int, default=BATCH)
+    args = ap.parse_args()
+    out = backfill(source=args.source, batch=args.batch)
+    print(f"[OK] updated={out['updated']} in {out['seconds']}s (text_ver={TEXT_VERSION})")
+    if out["updated"]:
+        print("    규칙 버전이 바뀐 경우 용어 색인도 재구축: python -m src.term_index --rebuild")
+
+
+if __name__ == "__main__":
+    main()
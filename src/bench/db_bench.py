@@ -0,0 +1,126 @@
+# src/bench/db_bench.py
+"""
+SQLite 동시성 벤치마크: 수집기/적재기(쓰기)와 Flask 분석 조회(읽기)를 스레드로 동시에 돌려
+엔진 프로파일(db.make_engine)별 처리량과 "database is locked" 오류 수를 비교한다.
+프로파일마다 임시 DB 파일을 새로 만들어 같은 합성 데이터로 측정(운영 DB 는 건드리지 않음).
+
+- default: create_engine 기본값(롤백 저널, 읽기/쓰기 같은 풀)
+- wal:     WAL + synchronous=NORMAL + busy_timeout/mmap/cache PRAGMA, 읽기는 읽기 전용 엔진
+
+예) python -m src.bench.db_bench --rows 100000 --seconds 10 --readers 4 --writers 2
+"""
+import argparse, os, random, shutil, tempfile, threading, time
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+
+from ..db import Base, DB_PROFILES, make_engine
+from ..models import Review
+from .insights_bench import synth_texts
+
+LABELS = ("positive", "neutral", "negative")
+
+
+def _rows(texts: List[str], prefix: str, start: int) -> List[Dict]:
+    rnd = random.Random(start)
+    return [{"source": "bench", "body": t, "rating": float(rnd.randint(1, 5)), "hash_id": f"{prefix}-{start + i}",
+             "sentiment": rnd.uniform(-1, 1), "sentiment_label": rnd.choice(LABELS)}
+            for i, t in enumerate(texts)]
+
+
+def _read_query(window: int):
+    # 분석 조회와 같은 모양: 최근 window 건 창의 라벨별 건수/점수 합
+    sub = (select(Review.sentiment_label.label("label"), Review.sentiment.label("score"))
+           .where(Review.source == "bench").order_by(desc(Review.id)).limit(window).subquery())
+    return select(sub.c.label, func.count(), func.sum(sub.c.score)).group_by(sub.c.label)
+
+
+def run_profile(profile: str, rows: int, seconds: float, readers: int, writers: int,
+                batch: int, window: int) -> Dict:
+    tmp = tempfile.mkdtemp(prefix="db_bench_")
+    url = f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}"
+    w_eng = make_engine(url, profile)
+    r_eng = w_eng if profile == "default" else make_engine(url, profile, readonly=True)
+    Base.metadata.create_all(w_eng)
+    texts = synth_texts(max(rows, batch))
+    with w_eng.begin() as c:
+        for lo in range(0, rows, 10_000):
+            c.execute(Review.__table__.insert(), _rows(texts[lo:lo + 10_000], "seed", lo))
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    out = {"reads": 0, "written": 0, "locked": 0, "write_ms": [], "read_ms": []}
+
+    def reader():
+        q = _read_query(window)
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                with r_eng.connect() as c:
+                    c.execute(q).all()
+            except OperationalError:
+                with lock:
+                    out["locked"] += 1
+                continue
+            with lock:
+                out["reads"] += 1
+                out["read_ms"].append((time.perf_counter() - t0) * 1000)
+
+    def writer(k: int):
+        n = 0
+        while not stop.is_set():
+            params = _rows(texts[:batch], f"w{k}", n)
+            n += batch
+            t0 = time.perf_counter()
+            try:
+                with w_eng.begin() as c:
+                    c.execute(sqlite_insert(Review).on_conflict_do_nothing(index_elements=["hash_id"]), params)
+            except OperationalError:
+                with lock:
+                    out["locked"] += 1
+                continue
+            with lock:
+                out["written"] += batch
+                out["write_ms"].append((time.perf_counter() - t0) * 1000)
+
+    threads = ([threading.Thread(target=reader) for _ in range(readers)]
+               + [threading.Thread(target=writer, args=(k,)) for k in range(writers)])
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    w_eng.dispose()
+    r_eng.dispose()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    def p95(xs):
+        return float(np.percentile(xs, 95)) if xs else float("nan")
+    return {"profile": profile, "reads_per_s": out["reads"] / elapsed, "rows_per_s": out["written"] / elapsed,
+            "locked": out["locked"], "read_p95_ms": p95(out["read_ms"]), "write_p95_ms": p95(out["write_ms"])}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000, help="미리 채울 리뷰 수")
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--readers", type=int, default=4)
+    ap.add_argument("--writers", type=int, default=2)
+    ap.add_argument("--batch", type=int, default=100, help="쓰기 트랜잭션당 행 수")
+    ap.add_argument("--window", type=int, default=5000, help="읽기 조회 창(최근 N 건)")
+    ap.add_argument("--profiles", nargs="+", default=list(DB_PROFILES), choices=DB_PROFILES)
+    args = ap.parse_args()
+    print(f"{'profile':>8} {'reads/s':>9} {'rows/s':>9} {'locked':>7} {'read p95':>10} {'write p95':>10}")
+    for p in args.profiles:
+        r = run_profile(p, args.rows, args.seconds, args.readers, args.writers, args.batch, args.window)
+        print(f"{r['profile']:>8} {r['reads_per_s']:>9.1f} {r['rows_per_s']:>9.0f} {r['locked']:>7} "
+              f"{r['read_p95_ms']:>8.1f}ms {r['write_p95_ms']:>8.1f}ms", flush=True)
+
+if __name__ == "__main__":
+    main()
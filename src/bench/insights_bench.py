@@ -0,0 +1,102 @@
+# src/bench/insights_bench.py
+"""
+compute_insights 텍스트 파이프라인 벤치마크: 기존(CountVectorizer 2회 + 라벨별 정규식 8회)
+대비 단일 패스(_analyze). DB 없이 합성 리뷰로 측정하고 결과 동일성도 확인.
+
+예) python -m src.bench.insights_bench --sizes 10000 100000 1000000
+"""
+import argparse, random, re, time
+from typing import Dict, List
+
+try:
+    from sklearn.feature_extraction.text import CountVectorizer
+except ImportError as e:   # 서비스 의존성(requirements.txt)에는 없음 — 비교 기준 구현에만 필요
+    raise SystemExit("insights_bench 는 scikit-learn 이 필요합니다: "
+                     "pip install -r requirements-bench.txt") from e
+
+from ..insights import _analyze
+from ..text import PAIN_KEYWORDS, STOPWORDS, TOKEN_PATTERN, normalize
+
+_WORDS = (
+    "의자 책상 조립 설치 튼튼 흔들림 삐걱 소리 냄새 색상 실물 사이즈 크기 높이 허리 쿠션 편하고 "
+    "불편해요 빠르게 파손 가성비 할인 나사 볼트 설명서 구멍 수평 등받이 딱딱 푹신 그래도 괜찮 "
+    "생각보다 무겁 가볍 견고 마감 스크래치 찍힘 불량 교환 반품 재구매 아이 거실 사무실 공부 게임 "
+    "오래 앉아 피곤 예뻐요 깔끔 심플 디자인 넉넉 좁아 넓어요 Good nice OK"
+).split() + sorted(STOPWORDS)[:20]
+
+
+def synth_texts(n: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    punct = ["", "", " ", "!", "~", "ㅎㅎ", " 👍", "."]
+    return [
+        " ".join(rnd.choice(_WORDS) + rnd.choice(punct) for _ in range(rnd.randint(4, 40)))
+        for _ in range(n)
+    ]
+
+
+# ---------------------- 기존 구현(비교 기준) ----------------------
+def _legacy_top_ngrams(texts, ngram=(1, 1), topk=15, min_df=2):
+    docs = [normalize(t) for t in texts]
+    vec = CountVectorizer(token_pattern=TOKEN_PATTERN, stop_words=sorted(STOPWORDS),
+                          min_df=min_df, ngram_range=ngram)
+    try:
+        X = vec.fit_transform(docs)
+    except ValueError:
+        return []
+    vocab = vec.get_feature_names_out()
+    counts = X.sum(axis=0).A1
+    order = counts.argsort()[::-1][:topk]
+    return [{"term": str(vocab[i]), "freq": int(counts[i])} for i in order]
+
+def _legacy_pain_point_counts(texts):
+    out = []
+    for label, kws in PAIN_KEYWORDS.items():
+        pat = re.compile("|".join([re.escape(k) for k in kws]))
+        c = sum(1 for t in texts if t and pat.search(t))
+        if c > 0:
+            out.append({"label": label, "count": c})
+    out.sort(key=lambda x: x["count"], reverse=True)
+    return out
+
+def legacy_analyze(texts, topk=15, min_df=2) -> Dict:
+    return {
+        "total": len(texts),
+        "top_terms": _legacy_top_ngrams(texts, (1, 1), topk, min_df),
+        "top_bigrams": _legacy_top_ngrams(texts, (2, 2), topk, min_df),
+        "pain_points": _legacy_pain_point_counts(texts),
+    }
+
+
+def _same(a: Dict, b: Dict) -> bool:
+    # 기존 argsort 는 비안정 정렬이라 topk 경계의 동률 중 무엇이 남을지 정해져 있지 않음
+    # → 빈도 순서열과, 경계 빈도보다 큰 항목 집합이 같으면 동일 결과로 본다
+    def same_top(x, y):
+        fx, fy = [e["freq"] for e in x], [e["freq"] for e in y]
+        if fx != fy:
+            return False
+        edge = fx[-1] if fx else 0
+        return {e["term"] for e in x if e["freq"] > edge} == {e["term"] for e in y if e["freq"] > edge}
+    return (a["total"] == b["total"] and a["pain_points"] == b["pain_points"]
+            and same_top(a["top_terms"], b["top_terms"])
+            and same_top(a["top_bigrams"], b["top_bigrams"]))
+
+
+def run(sizes: List[int], topk: int = 15, min_df: int = 2):
+    print(f"{'reviews':>10} {'legacy(s)':>10} {'single(s)':>10} {'speedup':>8}  same")
+    for n in sizes:
+        texts = synth_texts(n)
+        t0 = time.perf_counter(); a = legacy_analyze(texts, topk, min_df); t1 = time.perf_counter() - t0
+        t0 = time.perf_counter(); b = _analyze(texts, topk, min_df); t2 = time.perf_counter() - t0
+        print(f"{n:>10} {t1:>10.2f} {t2:>10.2f} {t1 / t2:>7.1f}x  {_same(a, b)}", flush=True)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--topk", type=int, default=15)
+    ap.add_argument("--min-df", type=int, default=2)
+    args = ap.parse_args()
+    run(args.sizes, topk=args.topk, min_df=args.min_df)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# src/bench/sentiment_bench.py
+"""
+감성 채점(score_batch) 처리량 벤치마크. DB 없이 합성 리뷰 + 임의 평점으로 측정.
+body: 원문에서 정규화까지 포함(annotate 에 body_norm 이 없는 경우)
+norm: 저장된 body_norm 사용(INSERT 경로·재채점의 일반적인 경우)
+
+예) python -m src.bench.sentiment_bench --sizes 100000 1000000
+"""
+import argparse, random, time
+from collections import Counter
+from typing import List
+
+from ..sentiment import score_batch
+from ..text import normalize
+from .insights_bench import synth_texts
+
+
+def _timed(texts, ratings, norms, batch):
+    labels = Counter()
+    t0 = time.perf_counter()
+    for i in range(0, len(texts), batch):
+        _, label = score_batch(texts[i:i + batch], ratings[i:i + batch],
+                               norms[i:i + batch] if norms else None)
+        labels.update(label.tolist())
+    return time.perf_counter() - t0, labels
+
+
+def run(sizes: List[int], batch: int = 100_000):
+    print(f"{'reviews':>10} {'body(s)':>9} {'norm(s)':>9} {'norm rev/s':>11}  labels")
+    for n in sizes:
+        texts = synth_texts(n)
+        rnd = random.Random(n)
+        ratings = [rnd.choice([None, 1, 2, 3, 4, 5, 5]) for _ in range(n)]
+        norms = [normalize(t) for t in texts]
+        t_body, _ = _timed(texts, ratings, None, batch)
+        t_norm, labels = _timed(texts, ratings, norms, batch)
+        print(f"{n:>10} {t_body:>9.2f} {t_norm:>9.2f} {n / t_norm:>11,.0f}  {dict(labels)}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--batch", type=int, default=100_000)
+    args = ap.parse_args()
+    run(args.sizes, batch=args.batch)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# src/cache.py
+"""
+분석 결과용 LRU 캐시 + 영속 쓰기 카운터(data_version 테이블).
+리뷰를 바꾸는 쓰기 경로는 프로세스와 관계없이(API/sink, 수집기, CSV 적재, 삭제, 재채점, 재판정, 백필)
+같은 트랜잭션에서 bump_data_version(s) 을 호출 → 커밋되면 모든 프로세스의 캐시 키가 바뀜.
+max id 가 그대로인 쓰기(삭제/재채점/백필)도 감지되고, 롤백된 쓰기는 반영되지 않는다.
+
+- 카운터는 SHARDS 개 행으로 나눠(쓰기 프로세스/스레드마다 다른 행) 동시 쓰기 트랜잭션이 한 행 잠금에
+  줄 서지 않게 함. 값은 행들의 합.
+- SQLite 파일 DB 는 전용 연결의 PRAGMA data_version(어느 연결이든 커밋하면 바뀜, 파일 I/O 없음)으로
+  마지막 커밋 이후 바뀐 게 없으면 DB 카운터를 다시 읽지 않음(since_commit).
+"""
+import os, sqlite3, threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from sqlalchemy import func, select
+
+from .db import SessionLocal, dialect_insert, engine
+from .models import DataVersion
+
+SHARDS = 16
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+def data_version(s=None) -> int:
+    """현재 쓰기 카운터(샤드 행들의 합, 행이 없으면 0). PK 범위 조회 한 번."""
+    if s is None:
+        with SessionLocal() as s:
+            return data_version(s)
+    return s.execute(select(func.sum(DataVersion.version))).scalar() or 0
+
+def bump_data_version(s) -> None:
+    """현재 트랜잭션에서 쓰기 카운터 +1(커밋은 호출 측). 샤드는 (프로세스, 스레드)로 고름, 행이 없으면 만든다."""
+    shard = 1 + hash((os.getpid(), threading.get_ident())) % SHARDS
+    stmt = dialect_insert(DataVersion).values(id=shard, version=1)
+    s.execute(stmt.on_conflict_do_update(index_elements=["id"], set_={"version": DataVersion.version + 1}))
+
+
+# ---------------------- 커밋 감지(SQLite) ----------------------
+_watch_lock = threading.Lock()
+_watch: Dict[str, Any] = {"pid": None, "conn": None, "mark": None, "memo": {}}
+
+def _watch_conn():
+    # 파일 SQLite 만. fork 된 자식은 부모 연결을 쓰지 않고 새로 연다
+    url = engine.url
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:" \
+            or "mode=memory" in str(url):
+        return None
+    if _watch["pid"] != os.getpid():
+        _watch.update(pid=os.getpid(), mark=None, memo={},
+                      conn=sqlite3.connect(url.database, check_same_thread=False, isolation_level=None))
+    return _watch["conn"]
+
+def since_commit(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    마지막 커밋(이 DB 의 어느 연결/프로세스든) 이후 같은 key 로 compute() 한 값이 있으면 그대로 반환.
+    커밋 감지를 못 하는 DB(PostgreSQL, 메모리 SQLite)는 매번 compute().
+    """
+    with _watch_lock:
+        conn = _watch_conn()
+        if conn is None:
+            return compute()
+        mark = conn.execute("PRAGMA data_version").fetchone()[0]
+        if mark != _watch["mark"]:
+            _watch.update(mark=mark, memo={})
+        elif key in _watch["memo"]:
+            return _watch["memo"][key]
+    # compute 중 커밋이 끼어도 그 커밋은 mark 뒤라 다음 호출에서 mark 가 바뀌어 다시 계산됨
+    value = compute()
+    with _watch_lock:
+        if _watch["mark"] == mark:
+            _watch["memo"][key] = value
+    return value
@@ -0,0 +1,321 @@
+# src/collectors/coupang_parser.py
+"""
+쿠팡 상품 페이지 HTML 스냅샷(driver.page_source)에서 리뷰 카드를 파싱.
+
+WebDriver 요소 단위 호출(get_attribute/.text/find_elements)마다 크롬 왕복이
+발생하던 것을, 페이지 소스 1회 수신 후 BeautifulSoup으로 프로세스 내에서
+처리하도록 옮긴 것. 휴리스틱(컨테이너/카드/별점/본문/날짜)은 기존과 동일.
+"""
+import re
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment, Doctype, ProcessingInstruction
+
+
+# ---------------------- 셀렉터/상수 ----------------------
+CONTAINER_CSS = [
+    "[class*='sdp-review__article__list']",
+    "section[id*='review']",
+    "div[id*='review']",
+    "[data-component-id*='review']",
+]
+
+ITEM_CSS = [
+    ".sdp-review__article__list__review",
+    "li[class*='review__item']",
+    "article[class*='review']",
+    "div[class*='review__item']",
+    "li", "article", "div"  # 최후 폴백
+]
+
+BAN_WORDS = [
+    "seller", "option", "writer", "author", "nickname",
+    "image", "photo", "thumb", "btn", "badge", "star", "rating",
+    "score", "reg-date", "date", "meta", "name", "title"
+]
+
+# 브라우저가 렌더링하지 않는 태그(.text 에 포함되지 않음)
+_INVISIBLE_TAGS = {"script", "style", "noscript", "template", "head", "title", "meta", "link"}
+
+# innerText 기준 줄바꿈이 생기는 블록 요소
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "details", "dialog", "div",
+    "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2",
+    "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "summary", "table", "tbody", "thead", "tfoot", "tr", "ul",
+}
+
+_WS = re.compile(r"\s+")
+
+
+def _noop(*args):
+    pass
+
+
+# ---------------------- 렌더링 텍스트(WebElement.text 대응) ----------------------
+class _TextCache:
+    """
+    요소별 '보이는 텍스트'를 한 번만 계산해 재사용.
+    카드 폴백 셀렉터(li/article/div)로 중첩 요소가 반복 조회되므로 메모이제이션 필수.
+    """
+
+    def __init__(self):
+        self._raw: Dict[int, str] = {}
+
+    @staticmethod
+    def _hidden(tag: Tag) -> bool:
+        if tag.name in _INVISIBLE_TAGS:
+            return True
+        if tag.has_attr("hidden"):
+            return True
+        style = (tag.get("style") or "").lower().replace(" ", "")
+        return "display:none" in style or "visibility:hidden" in style
+
+    def _raw_text(self, tag: Tag) -> str:
+        key = id(tag)
+        hit = self._raw.get(key)
+        if hit is not None:
+            return hit
+        if self._hidden(tag):
+            self._raw[key] = ""
+            return ""
+        parts = []
+        for child in tag.children:
+            if isinstance(child, (Comment, Doctype, ProcessingInstruction)):
+                continue
+            if isinstance(child, NavigableString):
+                parts.append(_WS.sub(" ", str(child)))
+            elif isinstance(child, Tag):
+                if child.name == "br":
+                    parts.append("\n")
+                elif child.name in _BLOCK_TAGS:
+                    parts.append("\n" + self._raw_text(child) + "\n")
+                else:
+                    parts.append(self._raw_text(child))
+        out = "".join(parts)
+        self._raw[key] = out
+        return out
+
+    def text(self, tag: Tag) -> str:
+        lines = (_WS.sub(" ", line).strip() for line in self._raw_text(tag).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+def _attr(tag: Tag, name: str) -> str:
+    v = tag.get(name)
+    if v is None:
+        return ""
+    if isinstance(v, list):  # class 등 다중값 속성
+        return " ".join(v)
+    return str(v)
+
+
+# ---------------------- 카드 수집 ----------------------
+def _unique(tags: List[Tag]) -> List[Tag]:
+    # Tag.__eq__ 는 구조 비교라 동일한 마크업의 다른 카드를 합쳐버리므로 id 기준 중복 제거
+    seen, out = set(), []
+    for t in tags:
+        if id(t) not in seen:
+            seen.add(id(t))
+            out.append(t)
+    return out
+
+def find_review_cards(soup: BeautifulSoup, texts: _TextCache, log: Callable = _noop) -> List[Tag]:
+    # 1) 컨테이너 수집
+    containers = []
+    for sel in CONTAINER_CSS:
+        found = soup.select(sel)
+        log("try container:", sel, "=>", len(found))
+        containers.extend(found)
+    containers = _unique(containers)
+
+    if not containers:
+        log("no review containers")
+        return []
+
+    # 2) 컨테이너 → 카드(아이템) 수집 (폭넓게)
+    cards = []
+    for c in containers:
+        for sel in ITEM_CSS:
+            cards.extend(c.select(sel))
+
+    # 중복 제거 & 너무 짧은 카드 제거
+    cards = [el for el in _unique(cards) if len(texts.text(el)) >= 5]
+    log("cards raw:", len(cards))
+    return cards
+
+
+# ---------------------- 카드 파싱 헬퍼 ----------------------
+def _best_text_from_card(card: Tag, texts: _TextCache) -> str:
+    """
+    카드 내부에서 '본문' 후보 중 가장 자연어스러운 긴 텍스트를 선택.
+    이미지/버튼/배지/메타성 요소는 제외.
+    """
+    best = ""
+    for n in card.find_all(["p", "div", "span"]):
+        cls = _attr(n, "class").lower()
+        aria = _attr(n, "aria-hidden").lower()
+        style = _attr(n, "style").lower()
+        if aria in ("true", "1"):
+            continue
+        if "display:none" in style:
+            continue
+        if any(b in cls for b in BAN_WORDS):
+            continue
+        txt = texts.text(n)
+        if 8 <= len(txt) <= 600:
+            if len(txt) > len(best):
+                best = txt
+    if not best:
+        # 폴백: 카드 전체 텍스트에서 가장 긴 줄
+        lines = [(line.strip(), len(line.strip())) for line in texts.text(card).splitlines()]
+        lines = [t for t in lines if 8 <= t[1] <= 600]
+        if lines:
+            best = max(lines, key=lambda t: t[1])[0]
+    return best
+
+def _parse_rating_from_card(card: Tag, texts: _TextCache):
+    """
+    별점 파싱 우선순위:
+    1) aria-label의 '점' 숫자
+    2) style width% -> 100% = 5.0
+    3) 텍스트 '평점/점' 패턴
+    4) '★' 개수
+    """
+    # 1) aria-label
+    for el in card.find_all(attrs={"aria-label": True}):
+        label = _attr(el, "aria-label")
+        if "점" in label:
+            m = re.search(r"([0-9]+(?:\.[0-9]+)?)", label)
+            if m:
+                try:
+                    return float(m.group(1))
+                except Exception:
+                    pass
+
+    # 2) style width
+    for s in card.find_all(style=True):
+        st = _attr(s, "style")
+        if "width" not in st:
+            continue
+        m = re.search(r"width:\s*([0-9.]+)%", st)
+        if m:
+            pct = float(m.group(1))
+            return round(pct / 20.0, 1)  # 100% = 5.0
+
+    # 3) 텍스트 패턴
+    txt = texts.text(card)
+    m = re.search(r"평점\s*([0-9]+(?:\.[0-9]+)?)", txt)
+    if m:
+        try:
+            return float(m.group(1))
+        except Exception:
+            pass
+    m = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*점", txt)
+    if m:
+        try:
+            return float(m.group(1))
+        except Exception:
+            pass
+
+    # 4) 별 문자
+    if "★" in txt:
+        cnt = txt.count("★")
+        if 1 <= cnt <= 5:
+            return float(cnt)
+
+    return None
+
+def _parse_date_from_card(card: Tag, texts: _TextCache) -> str:
+    """
+    날짜 파싱:
+    - time 태그 / class에 date, reg 포함
+    - 텍스트 정규식: YYYY.MM.DD / YYYY-MM-DD / '일 전', '개월 전', '년 전'
+    """
+    for match in [
+        lambda t: t.name == "time",
+        lambda t: "date" in _attr(t, "class").lower(),
+        lambda t: "reg" in _attr(t, "class").lower(),
+    ]:
+        el = card.find(match)
+        if el is not None:
+            txt = texts.text(el)
+            if txt:
+                return txt
+
+    txt = texts.text(card)
+    # YYYY.MM.DD or YYYY-MM-DD
+    m = re.search(r"(20\d{2})[.\-](\d{1,2})[.\-](\d{1,2})", txt)
+    if m:
+        return f"{m.group(1)}-{int(m.group(2)):02d}-{int(m.group(3)):02d}"
+    # 상대 시점
+    m = re.search(r"(\d+)\s*(일|개월|년)\s*전", txt)
+    if m:
+        return f"{m.group(1)}{m.group(2)} 전"
+    return ""
+
+
+# ---------------------- 페이지 메타 ----------------------
+def is_bot_challenge(html: str) -> bool:
+    # loaded.html 패턴(차단 페이지) 탐지용
+    if not html:
+        return False
+    signs = ["XMLHttpRequest.prototype.send", "location.reload(true)", "t="]
+    return all(s in html for s in signs)
+
+def product_url_from_html(html: str) -> str | None:
+    """
+    저장된 스냅샷에서 상품 URL 복원: canonical 링크 → og:url 순.
+    """
+    soup = BeautifulSoup(html or "", "html.parser")
+    el = soup.find("link", rel="canonical")
+    if el is not None and el.get("href"):
+        return el["href"].split("?")[0]
+    el = soup.find("meta", attrs={"property": "og:url"})
+    if el is not None and el.get("content"):
+        return el["content"].split("?")[0]
+    return None
+
+
+# ---------------------- 추출 진입점 ----------------------
+def has_review_cards(html: str, log: Callable = _noop) -> bool:
+    soup = BeautifulSoup(html or "", "html.parser")
+    return bool(find_review_cards(soup, _TextCache(), log=log))
+
+def extract_reviews_from_html(html: str, log: Callable = _noop, dump_cards: int = 0) -> List[Dict]:
+    """
+    페이지 소스 문자열 → [{"rating", "body", "review_date"}, ...]
+    dump_cards > 0 이면 앞쪽 카드 outerHTML을 storage/review_card_{i}.html 로 저장(디버그).
+    """
+    soup = BeautifulSoup(html or "", "html.parser")
+    texts = _TextCache()
+    cards = find_review_cards(soup, texts, log=log)
+    if not cards:
+        log("cards found: 0")
+        return []
+
+    results = []
+    for idx, card in enumerate(cards):
+        try:
+            rating = _parse_rating_from_card(card, texts)
+            body   = _best_text_from_card(card, texts)
+            date   = _parse_date_from_card(card, texts)
+
+            # 디버그: 처음 N개 카드 저장
+            if idx < dump_cards:
+                try:
+                    Path("storage").mkdir(parents=True, exist_ok=True)
+                    with open(f"storage/review_card_{idx}.html", "w", encoding="utf-8") as f:
+                        f.write(str(card))
+                except Exception:
+                    pass
+
+            if (body and len(body) >= 8) or (rating is not None):
+                results.append({"rating": rating, "body": body, "review_date": date})
+        except Exception:
+            continue
+
+    log("extracted:", len(results))
+    return results
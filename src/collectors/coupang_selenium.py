@@ -1,5 +1,7 @@
 # src/collectors/coupang_selenium.py
-import os, re, time, random, argparse
+import os, re, time, argparse, threading
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict
 from urllib.parse import urlparse
@@ -11,13 +13,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import JavascriptException
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
-from sqlalchemy.exc import IntegrityError
-from ..db import SessionLocal
-from ..models import Review
-from ..utils import review_hash
+from ..sink import to_row
+from .coupang_parser import CONTAINER_CSS, ITEM_CSS, is_bot_challenge, extract_reviews_from_html, has_review_cards
+from ..dates import now
+from .crawl_state import crawl_pages
+from .pool import HostRateLimiter, run_url_queue
 
 
 # ---------------------- 로그/파일 유틸 ----------------------
@@ -27,6 +30,13 @@ def _log(*args):
 def _mkdir_storage():
     Path("storage").mkdir(parents=True, exist_ok=True)
 
+def _snap_tag(product_url: str, at: datetime) -> str:
+    # 워커/URL 마다 다른 스냅샷 이름(상품 id + 수집 시각 UTC). 고정 이름이면 --workers>1 에서 서로 덮어씀
+    # 시각은 replay 가 상대 날짜("3일 전") 기준으로 다시 읽음(collectors.replay.captured_at)
+    m = re.search(r"/products/(\d+)", product_url or "")
+    pid = m.group(1) if m else "unknown"
+    return f"{pid}_{at.astimezone(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{at.microsecond // 1000:03d}Z"
+
 def _snap(driver, name: str):
     _mkdir_storage()
     path = f"storage/{name}.png"
@@ -47,16 +57,20 @@ def _dump_html(driver, name: str):
         _log(f"html dump failed: {e}")
 
 
-# ---------------------- Anti-bot 감지 ----------------------
-def _is_bot_challenge(html: str) -> bool:
-    # 네가 올린 loaded.html 패턴(차단 페이지) 탐지용
-    if not html:
-        return False
-    signs = ["XMLHttpRequest.prototype.send", "location.reload(true)", "t="]
-    return all(s in html for s in signs)
+# ---------------------- 드라이버 생성 ----------------------
+_driver_lock = threading.Lock()
 
+@lru_cache(maxsize=1)
+def _resolve_driver_path() -> str:
+    path = ChromeDriverManager().install()
+    _log("chromedriver:", path)
+    return path
+
+def _driver_path() -> str:
+    # webdriver-manager 버전 조회/다운로드는 프로세스당 1회만(워커 스레드 동시 호출 대비 락)
+    with _driver_lock:
+        return _resolve_driver_path()
 
-# ---------------------- 드라이버 생성 ----------------------
 def _new_driver():
     """
     1) CHROME_DEBUGGING_ADDR 환경변수가 있으면 '실제 크롬(내 프로필)'에 attach
@@ -83,7 +97,7 @@ def _new_driver():
         driver = webdriver.Chrome(options=opts)
     else:
         # 새 세션
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+        driver = webdriver.Chrome(service=Service(_driver_path()), options=opts)
 
     # webdriver 흔적 최소화(CDP 가능할 때만)
     try:
@@ -100,6 +114,68 @@ def _new_driver():
     return driver
 
 
+# ---------------------- 브라우저 세션 ----------------------
+class BrowserSession:
+    """
+    여러 URL 에 걸쳐 크롬 1개를 재사용.
+    - recycle_after 개 URL 마다 새 브라우저로 교체(메모리 누수/상태 누적 방지, 0 이면 교체 안 함)
+    - 세션이 죽은 경우(크래시/창 닫힘)에만 재시작
+    """
+
+    def __init__(self, recycle_after: int = 50):
+        self.recycle_after = recycle_after
+        self.driver = None
+        self.uses = 0
+        self.cookies_applied = False
+        self.starts = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def alive(self) -> bool:
+        try:
+            self.driver.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+
+    def _start(self):
+        self.driver = _new_driver()
+        self.uses = 0
+        self.cookies_applied = False
+        self.starts += 1
+        _log(f"browser started (#{self.starts})")
+
+    def get(self):
+        """다음 URL 에 쓸 드라이버. 필요 시(최초/교체 주기/크래시) 새로 띄운다."""
+        if self.driver is not None:
+            if self.recycle_after and self.uses >= self.recycle_after:
+                _log(f"recycling browser after {self.uses} urls")
+                self.close()
+            elif not self.alive():
+                _log("browser session lost, restarting")
+                self.discard()
+        if self.driver is None:
+            self._start()
+        self.uses += 1
+        return self.driver
+
+    def discard(self):
+        # 크래시 난 드라이버: quit 실패는 무시하고 버림
+        self.close()
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
+
+
 # ---------------------- 쿠키 주입(선택) ----------------------
 def _parse_cookie_string(cookie_str: str) -> List[Dict]:
     out = []
@@ -112,7 +188,16 @@ def _parse_cookie_string(cookie_str: str) -> List[Dict]:
             out.append({"name": k, "value": v})
     return out
 
-def _apply_cookies_if_any(driver, url: str):
+def _navigate(driver, url: str, limiter=None, refresh: bool = False):
+    # 브라우저 탐색(get/refresh) 1회 = 호스트 요청 1건 → 매번 레이트 리미터 토큰을 받는다
+    if limiter:
+        limiter.acquire(url)
+    if refresh:
+        driver.refresh()
+    else:
+        driver.get(url)
+
+def _apply_cookies_if_any(driver, url: str, limiter=None):
     """
     .env 의 COUPANG_COOKIES 를 name=value; name2=value2 형태로 주입.
     attach 모드에선 이미 내 브라우저 쿠키가 있으므로 보통 불필요.
@@ -124,7 +209,7 @@ def _apply_cookies_if_any(driver, url: str):
     if not cookies:
         return False
 
-    driver.get(url)
+    _navigate(driver, url, limiter)
     time.sleep(1.0)
     domain = urlparse(url).hostname or "www.coupang.com"
 
@@ -137,37 +222,178 @@ def _apply_cookies_if_any(driver, url: str):
         except Exception:
             continue
 
-    driver.get(url)  # 쿠키 반영 위해 재접속
+    _navigate(driver, url, limiter)  # 쿠키 반영 위해 재접속
     _log(f"applied cookies: {ok}")
     return ok > 0
 
 
+# ---------------------- 조건 기반 대기 ----------------------
+MIN_DELAY = float(os.getenv("COUPANG_MIN_DELAY", "0.2"))  # 예의상 최소 간격(초)
+
+# 리뷰 컨테이너 안 카드 후보 수 + 문서 높이(둘 다 안 늘면 로딩 끝)
+_PROGRESS_JS = """
+const containers = document.querySelectorAll(arguments[0].join(','));
+let n = 0;
+for (const c of containers) n += c.querySelectorAll(arguments[1].join(',')).length;
+return [n, document.documentElement.scrollHeight];
+"""
+
+# MutationObserver 로 마지막 DOM 변경 시각 기록 → 경과 ms 반환
+_DOM_IDLE_JS = """
+if (!window.__revIdle) {
+  window.__revIdle = {t: Date.now()};
+  new MutationObserver(() => { window.__revIdle.t = Date.now(); })
+    .observe(document.documentElement, {subtree: true, childList: true, characterData: true});
+}
+return Date.now() - window.__revIdle.t;
+"""
+
+def _page_progress(driver):
+    try:
+        return tuple(driver.execute_script(_PROGRESS_JS, CONTAINER_CSS, ITEM_CSS))
+    except JavascriptException:
+        return (0, 0)
+
+def _wait_dom_quiet(driver, quiet_ms: int = 300, timeout: float = 4.0) -> bool:
+    """DOM 변경이 quiet_ms 동안 없을 때까지 대기(최대 timeout)."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: (d.execute_script(_DOM_IDLE_JS) or 0) >= quiet_ms)
+        return True
+    except (TimeoutException, JavascriptException):
+        return False
+
+
 # ---------------------- 스크롤/펼치기 ----------------------
-def _deep_scroll(driver, loops=12):
-    for _ in range(loops):
+def _deep_scroll(driver, loops=14, patience=2, step_timeout=1.5, min_delay=MIN_DELAY):
+    """
+    리뷰 카드 수/문서 높이가 더 이상 늘지 않을 때까지 스크롤(최대 loops 회).
+    매 스크롤 후 변화가 생기는 즉시 다음으로 넘어가고, patience 회 연속 변화 없으면 종료.
+    """
+    last = _page_progress(driver)
+    idle = 0
+    for i in range(loops):
         try:
             driver.execute_script("window.scrollBy(0, Math.max(600, window.innerHeight*0.9));")
         except JavascriptException:
             pass
-        time.sleep(random.uniform(0.35, 0.75))
-
-def _expand_more_in_reviews(driver):
-    # 리뷰 본문 '더보기', '펼치기' 버튼 클릭
-    for xp in [
+        t0 = time.monotonic()
+        try:
+            WebDriverWait(driver, step_timeout, poll_frequency=0.1).until(
+                lambda d: _page_progress(d) != last)
+        except TimeoutException:
+            pass
+        now = _page_progress(driver)
+        idle = idle + 1 if now == last else 0
+        last = now
+        rest = min_delay - (time.monotonic() - t0)
+        if rest > 0:
+            time.sleep(rest)
+        if idle >= patience:
+            _log(f"scroll settled after {i + 1} steps (cards={now[0]})")
+            return
+
+# 버튼 위치로 스크롤 후 클릭을 브라우저 안에서 한 번에 수행
+_CLICK_MORE_JS = """
+let n = 0;
+for (const xp of arguments[0]) {
+  const r = document.evaluate(xp, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  for (let i = 0; i < Math.min(r.snapshotLength, arguments[1]); i++) {
+    try { const b = r.snapshotItem(i); b.scrollIntoView({block: 'center'}); b.click(); n++; } catch (e) {}
+  }
+}
+return n;
+"""
+
+def _expand_more_in_reviews(driver, min_delay=MIN_DELAY):
+    # 리뷰 본문 '더보기', '펼치기' 버튼 클릭 → 펼쳐진 DOM 이 안정될 때까지 대기
+    xps = [
         "//button[contains(.,'더보기')]",
         "//button[contains(.,'펼치기')]",
         "//a[contains(.,'더보기')]",
         "//a[contains(.,'펼치기')]",
-    ]:
-        btns = driver.find_elements(By.XPATH, xp)
-        for b in btns[:20]:
-            try:
-                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", b)
-                time.sleep(0.15)
-                driver.execute_script("arguments[0].click();", b)
-                time.sleep(0.2)
-            except Exception:
-                pass
+    ]
+    try:
+        clicked = driver.execute_script(_CLICK_MORE_JS, xps, 20) or 0
+    except JavascriptException:
+        clicked = 0
+    if clicked:
+        _wait_dom_quiet(driver)
+        time.sleep(min_delay)
+    _log("expanded:", clicked)
+
+
+# ---------------------- 리뷰 정렬/페이지네이션 ----------------------
+# 텍스트가 정확히 일치하는 버튼/링크 클릭(예: '최신순')
+_CLICK_TEXT_JS = """
+for (const el of document.querySelectorAll('button, a, li')) {
+  if (el.textContent.trim() === arguments[0]) { el.scrollIntoView({block: 'center'}); el.click(); return true; }
+}
+return false;
+"""
+
+# 리뷰 컨테이너 안 페이지 버튼: data-page/번호 일치 우선, 없으면 '다음' 버튼
+_CLICK_PAGE_JS = """
+const page = String(arguments[1]);
+for (const c of document.querySelectorAll(arguments[0].join(','))) {
+  const btns = c.querySelectorAll("[class*='page'] button, [class*='page'] a, button[class*='page'], a[class*='page']");
+  for (const b of btns) {
+    if ((b.dataset && b.dataset.page === page) || b.textContent.trim() === page) {
+      b.scrollIntoView({block: 'center'}); b.click(); return 'page';
+    }
+  }
+  for (const b of btns) {
+    const cls = String(b.className || '');
+    if (/next/i.test(cls) || (b.getAttribute('aria-label') || '').includes('다음')) {
+      if (b.disabled || /disabled/i.test(cls)) return null;
+      b.scrollIntoView({block: 'center'}); b.click(); return 'next';
+    }
+  }
+}
+return null;
+"""
+
+# 리뷰 목록 내용 서명(페이지 전환 감지용)
+_REVIEW_SIG_JS = """
+return Array.from(document.querySelectorAll(arguments[0].join(',')))
+  .map(c => c.innerText.length + ':' + c.innerText.slice(0, 200)).join('|');
+"""
+
+def _review_signature(driver) -> str:
+    try:
+        return driver.execute_script(_REVIEW_SIG_JS, CONTAINER_CSS) or ""
+    except JavascriptException:
+        return ""
+
+def _sort_reviews_latest(driver, min_delay=MIN_DELAY) -> bool:
+    # 최신순 정렬이어야 '이미 본 리뷰'에서 멈추는 증분 수집이 성립
+    try:
+        ok = bool(driver.execute_script(_CLICK_TEXT_JS, "최신순"))
+    except JavascriptException:
+        ok = False
+    if ok:
+        _wait_dom_quiet(driver)
+        time.sleep(min_delay)
+    _log("sort latest:", ok)
+    return ok
+
+def _goto_review_page(driver, page: int, timeout: float = 8.0, min_delay=MIN_DELAY) -> bool:
+    """리뷰 목록을 page 번째로 넘기고 내용이 바뀔 때까지 대기. 더 없으면 False."""
+    before = _review_signature(driver)
+    try:
+        how = driver.execute_script(_CLICK_PAGE_JS, CONTAINER_CSS, page)
+    except JavascriptException:
+        how = None
+    if not how:
+        return False
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(lambda d: _review_signature(d) != before)
+    except TimeoutException:
+        _log(f"page {page}: content did not change")
+        return False
+    _wait_dom_quiet(driver)
+    time.sleep(min_delay)
+    return True
 
 
 # ---------------------- 컨테이너 감지 ----------------------
@@ -193,284 +419,137 @@ def _wait_review_area(driver, wait) -> bool:
     return False
 
 
-# ---------------------- 카드 파싱 헬퍼 ----------------------
-def _best_text_from_card(card):
-    """
-    카드 내부에서 '본문' 후보 중 가장 자연어스러운 긴 텍스트를 선택.
-    이미지/버튼/배지/메타성 요소는 제외.
-    """
-    ban_words = [
-        "seller", "option", "writer", "author", "nickname",
-        "image", "photo", "thumb", "btn", "badge", "star", "rating",
-        "score", "reg-date", "date", "meta", "name", "title"
-    ]
-    nodes = card.find_elements(By.XPATH, ".//p|.//div|.//span")
-    best = ""
-    for n in nodes:
-        try:
-            cls = (n.get_attribute("class") or "").lower()
-            aria = (n.get_attribute("aria-hidden") or "").lower()
-            style = (n.get_attribute("style") or "").lower()
-            if aria in ("true", "1"):
-                continue
-            if "display:none" in style:
-                continue
-            if any(b in cls for b in ban_words):
-                continue
-            txt = (n.text or "").strip()
-            if 8 <= len(txt) <= 600:
-                if len(txt) > len(best):
-                    best = txt
-        except Exception:
-            continue
-    if not best:
-        # 폴백: 카드 전체 텍스트에서 가장 긴 줄
-        lines = [(line.strip(), len(line.strip())) for line in (card.text or "").splitlines()]
-        lines = [t for t in lines if 8 <= t[1] <= 600]
-        if lines:
-            best = max(lines, key=lambda t: t[1])[0]
-    return best
-
-def _parse_rating_from_card(card):
-    """
-    별점 파싱 우선순위:
-    1) aria-label의 '점' 숫자
-    2) style width% -> 100% = 5.0
-    3) 텍스트 '평점/점' 패턴
-    4) '★' 개수
-    """
-    # 1) aria-label
-    els = card.find_elements(By.XPATH, ".//*[@aria-label]")
-    for el in els:
-        label = el.get_attribute("aria-label") or ""
-        if "점" in label:
-            m = re.search(r"([0-9]+(?:\.[0-9]+)?)", label)
-            if m:
-                try:
-                    return float(m.group(1))
-                except Exception:
-                    pass
-
-    # 2) style width
-    stars = card.find_elements(By.XPATH, ".//*[contains(@style,'width')]")
-    for s in stars:
-        st = s.get_attribute("style") or ""
-        m = re.search(r"width:\s*([0-9.]+)%", st)
-        if m:
-            pct = float(m.group(1))
-            return round(pct / 20.0, 1)  # 100% = 5.0
-
-    # 3) 텍스트 패턴
-    txt = (card.text or "")
-    m = re.search(r"평점\s*([0-9]+(?:\.[0-9]+)?)", txt)
-    if m:
-        try:
-            return float(m.group(1))
-        except Exception:
-            pass
-    m = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*점", txt)
-    if m:
-        try:
-            return float(m.group(1))
-        except Exception:
-            pass
-
-    # 4) 별 문자
-    if "★" in txt:
-        cnt = txt.count("★")
-        if 1 <= cnt <= 5:
-            return float(cnt)
-
-    return None
-
-def _parse_date_from_card(card):
+# ---------------------- 리뷰 추출 본체 ----------------------
+def _extract_reviews_on_page(driver, min_delay: float = MIN_DELAY) -> List[Dict]:
     """
-    날짜 파싱:
-    - time 태그 / class에 date, reg 포함
-    - 텍스트 정규식: YYYY.MM.DD / YYYY-MM-DD / '일 전', '개월 전', '년 전'
+    요소 단위 WebDriver 호출 대신 page_source 스냅샷을 받아 프로세스 내에서 파싱.
+    카드가 있을 때만 '더보기' 펼치기 후 스냅샷을 다시 받는다.
     """
-    for sel in [
-        ".//time",
-        ".//*[contains(translate(@class,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'date')]",
-        ".//*[contains(translate(@class,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'reg')]",
-    ]:
-        es = card.find_elements(By.XPATH, sel)
-        if es:
-            txt = (es[0].text or "").strip()
-            if txt:
-                return txt
-
-    txt = (card.text or "")
-    # YYYY.MM.DD or YYYY-MM-DD
-    m = re.search(r"(20\d{2})[.\-](\d{1,2})[.\-](\d{1,2})", txt)
-    if m:
-        return f"{m.group(1)}-{int(m.group(2)):02d}-{int(m.group(3)):02d}"
-    # 상대 시점
-    m = re.search(r"(\d+)\s*(일|개월|년)\s*전", txt)
-    if m:
-        return f"{m.group(1)}{m.group(2)} 전"
-    return ""
-
-
-# ---------------------- 리뷰 추출 본체 ----------------------
-def _extract_reviews_on_page(driver) -> List[Dict]:
-    # 1) 컨테이너 수집
-    containers = []
-    for sel in [
-        "[class*='sdp-review__article__list']",
-        "section[id*='review']",
-        "div[id*='review']",
-        "[data-component-id*='review']",
-    ]:
-        found = driver.find_elements(By.CSS_SELECTOR, sel)
-        _log("try container:", sel, "=>", len(found))
-        containers.extend(found)
-    containers = list(dict.fromkeys(containers))
-
-    if not containers:
-        _log("no review containers")
-        return []
-
-    # 2) 컨테이너 → 카드(아이템) 수집 (폭넓게)
-    cards = []
-    item_css = [
-        ".sdp-review__article__list__review",
-        "li[class*='review__item']",
-        "article[class*='review']",
-        "div[class*='review__item']",
-        "li", "article", "div"  # 최후 폴백
-    ]
-    for c in containers:
-        got = []
-        for sel in item_css:
-            found = c.find_elements(By.CSS_SELECTOR, sel)
-            if found:
-                got.extend(found)
-        if got:
-            cards.extend(got)
-
-    # 중복 제거 & 너무 짧은 카드 제거
-    uniq = []
-    seen = set()
-    for el in cards:
-        try:
-            oid = el.id
-            if oid not in seen:
-                seen.add(oid)
-                if len((el.text or "").strip()) >= 5:
-                    uniq.append(el)
-        except Exception:
-            continue
-    cards = uniq
-    _log("cards raw:", len(cards))
-    if not cards:
+    if not has_review_cards(driver.page_source or "", log=_log):
         _log("cards found: 0")
         return []
 
-    # 3) 펼치기/더보기
-    _expand_more_in_reviews(driver)
-
-    # 4) 필드 파싱
-    results = []
-    for idx, card in enumerate(cards):
-        try:
-            rating = _parse_rating_from_card(card)
-            body   = _best_text_from_card(card)
-            date   = _parse_date_from_card(card)
-
-            # 디버그: 처음 2개 카드 저장
-            if idx < 2:
-                try:
-                    html = card.get_attribute("outerHTML") or ""
-                    Path("storage").mkdir(parents=True, exist_ok=True)
-                    with open(f"storage/review_card_{idx}.html", "w", encoding="utf-8") as f:
-                        f.write(html)
-                except Exception:
-                    pass
-
-            if (body and len(body) >= 8) or (rating is not None):
-                results.append({"rating": rating, "body": body, "review_date": date})
-        except Exception:
-            continue
-
-    _log("extracted:", len(results))
-    return results
+    # 펼치기/더보기 → 펼쳐진 DOM 으로 필드 파싱
+    _expand_more_in_reviews(driver, min_delay=min_delay)
+    return extract_reviews_from_html(driver.page_source or "", dump_cards=2, log=_log)
 
 
 # ---------------------- 수집 플로우 ----------------------
-def scrape_coupang(product_url: str, max_pages: int = 1) -> int:
+def scrape_coupang(product_url: str, max_pages: int = 1, session: BrowserSession | None = None,
+                   min_delay: float = MIN_DELAY, limiter: HostRateLimiter | None = None) -> int:
+    """
+    최신순으로 최대 max_pages 페이지를 수집하되, 이미 저장된 리뷰(또는 crawl_state 의
+    최근 작성일보다 오래된 리뷰)가 나온 페이지에서 멈춘다(증분 수집).
+    이전 수집이 중간에 끝났으면(crawl_state.complete=False) 저장된 리뷰에서 멈추지 않고 그 수집이
+    못 본 구간까지 이어서 본다(crawl_state.reached_crawled). 진행 상황은 페이지마다 저장.
+    session 을 넘기면 그 브라우저를 재사용하고 닫지 않는다. 없으면 1회용 세션.
+    min_delay: 스크롤/펼치기/리프레시 사이 최소 간격(나머지 대기는 DOM 변화 기준)
+    limiter: 호스트 레이트 리미터. 탐색(get/refresh), 정렬 전환, 페이지 넘김 등 요청마다 토큰 1개
+    """
     load_dotenv()  # .env 로드
-    driver = _new_driver()
+    own_session = session is None
+    if own_session:
+        session = BrowserSession()
+    driver = session.get()
     wait = WebDriverWait(driver, 16)
-    count = 0
+    count, dup, pages = 0, 0, 0
+    crawled_at = now()  # 상대 날짜("3일 전") 해석 기준 → review_day/해시가 수집일과 무관하게 같음
 
     try:
-        # attach 모드가 아니면 쿠키 주입 시도
-        if not os.getenv("CHROME_DEBUGGING_ADDR"):
-            _apply_cookies_if_any(driver, product_url)
+        # attach 모드가 아니면 쿠키 주입 시도(브라우저당 1회)
+        if not os.getenv("CHROME_DEBUGGING_ADDR") and not session.cookies_applied:
+            _apply_cookies_if_any(driver, product_url, limiter)
+            session.cookies_applied = True
 
-        driver.get(product_url)
+        _navigate(driver, product_url, limiter)
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
-        _snap(driver, "loaded")
-        _dump_html(driver, "loaded")
+        tag = _snap_tag(product_url, crawled_at)
+        _snap(driver, f"{tag}_loaded")
+        _dump_html(driver, f"{tag}_loaded")
 
         # anti-bot 감지 시 1회 리프레시(크래시 없이 진행)
         html0 = driver.page_source or ""
-        if _is_bot_challenge(html0):
-            _log("BOT CHALLENGE detected (passive). retry once after sleep.")
-            time.sleep(2.0)
-            driver.refresh()
-            time.sleep(2.0)
-            _dump_html(driver, "after_refresh")
+        if is_bot_challenge(html0):
+            _log("BOT CHALLENGE detected (passive). retry once.")
+            time.sleep(min_delay)
+            _navigate(driver, product_url, limiter, refresh=True)
+            try:
+                WebDriverWait(driver, 10, poll_frequency=0.5).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                    and not is_bot_challenge(d.page_source or ""))
+            except TimeoutException:
+                _log("challenge still present after refresh (continue)")
+            _dump_html(driver, f"{tag}_after_refresh")
 
         # 리뷰 영역 노출 유도 + 감지
-        _deep_scroll(driver, loops=14)
+        _deep_scroll(driver, loops=14, min_delay=min_delay)
         try:
             wait.until(EC.presence_of_element_located((By.ID, "btfTab")))
             _log("btfTab detected")
         except Exception:
             _log("btfTab not detected (continue)")
 
-        items = _extract_reviews_on_page(driver)
-
-        # DB 저장
-        with SessionLocal() as s:
-            for it in items:
-                h = review_hash("coupang", product_url, it["body"], it["review_date"])
-                rv = Review(
-                    source="coupang",
-                    product_url=product_url,
-                    rating=it["rating"],
-                    body=it["body"],
-                    review_date=it["review_date"],
-                    hash_id=h,
-                )
-                try:
-                    s.add(rv); s.commit(); count += 1
-                except IntegrityError:
-                    s.rollback()
-
+        if max_pages > 1 and limiter:
+            limiter.acquire(product_url)  # 정렬 전환은 리뷰 목록을 다시 요청
+        sorted_latest = max_pages > 1 and _sort_reviews_latest(driver, min_delay=min_delay)
+        if max_pages > 1 and not sorted_latest:
+            # 최신순이 아니면 조기 종료 판정(known/high-water mark)을 쓸 수 없음 → 첫 페이지만
+            _log("latest sort unavailable, limiting to 1 page")
+            max_pages = 1
+
+        def fetch(page: int):
+            if page > 1:
+                if limiter:
+                    limiter.acquire(product_url)
+                if not _goto_review_page(driver, page, min_delay=min_delay):
+                    return None
+            return [to_row({**it, "crawled_at": crawled_at}, source="coupang", product_url=product_url)
+                    for it in _extract_reviews_on_page(driver, min_delay=min_delay)]
+
+        out = crawl_pages("coupang", product_url, fetch, max_pages, sorted_latest, log=_log)
+        count, dup, pages = out["inserted"], out["duplicated"], out["pages"]
+
+    except WebDriverException:
+        # 세션이 죽었으면 다음 URL 에서 새 브라우저를 띄우도록 버림
+        if not session.alive():
+            session.discard()
+        raise
     finally:
-        driver.quit()
+        if own_session:
+            session.close()
 
-    _log("inserted:", count)
+    _log("inserted:", count, "duplicated:", dup, "pages:", pages)
     return count
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--url", action="append", required=True)
-    ap.add_argument("--pages", type=int, default=1)  # 현재는 의미 없음(보존)
+    ap.add_argument("--pages", type=int, default=10, help="상품당 최대 리뷰 페이지 수(이미 수집한 리뷰에 닿으면 조기 종료)")
+    ap.add_argument("--recycle-after", type=int, default=50, help="브라우저 교체 주기(URL 수, 0=교체 안 함)")
+    ap.add_argument("--workers", type=int, default=1, help="동시 브라우저 워커 수")
+    ap.add_argument("--rate", type=float, default=0.5, help="호스트당 최대 요청 속도(건/초, 전체 워커 합계)")
+    ap.add_argument("--burst", type=int, default=1, help="호스트당 연속 허용 요청 수")
+    ap.add_argument("--min-delay", type=float, default=MIN_DELAY, help="페이지 내 동작 간 최소 간격(초)")
     args = ap.parse_args()
 
-    total = 0
-    for u in args.url:
-        clean = u.split("?")[0]  # 트래킹 파라미터 제거
-        total += scrape_coupang(clean, max_pages=args.pages)
-        time.sleep(random.uniform(1.2, 2.0))
-
-    print(f"[OK] inserted: {total}", flush=True)
+    urls = list(dict.fromkeys(u.split("?")[0] for u in args.url))  # 트래킹 파라미터 제거
+    limiter = HostRateLimiter(rate=args.rate, burst=args.burst)
+    results = run_url_queue(
+        urls,
+        lambda session, u: scrape_coupang(u, max_pages=args.pages, session=session,
+                                          min_delay=args.min_delay, limiter=limiter),
+        workers=args.workers,
+        # limiter 는 scrape_coupang 이 요청(탐색/페이지 넘김)마다 직접 적용 → 큐에는 넘기지 않음
+        worker_context=lambda: BrowserSession(recycle_after=args.recycle_after),
+    )
+
+    total = sum(r["inserted"] for r in results)
+    failed = [r for r in results if not r["ok"]]
+    for r in failed:
+        _log(f"failed: {r['url']} ({r['error']})")
+    print(f"[OK] inserted: {total} (urls ok={len(results) - len(failed)}, failed={len(failed)})", flush=True)
 
 
 if __name__ == "__main__":
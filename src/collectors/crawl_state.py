@@ -0,0 +1,146 @@
+# src/collectors/crawl_state.py
+"""
+상품별 증분 수집 상태(crawl_state) 조회/갱신.
+"""
+from typing import Callable, Dict, List
+
+from sqlalchemy import select
+
+from ..db import SessionLocal
+from ..models import CrawlState
+from ..sink import existing_hashes, store_reviews
+
+
+def day_key(row: Dict) -> str | None:
+    # 비교용 작성일(YYYY-MM-DD). to_row 가 정규화한 review_day(상대 날짜는 수집 시각 기준) 사용
+    d = row.get("review_day")
+    return d.isoformat() if d else None
+
+
+def load_state(source: str, product_url: str) -> Dict:
+    """
+    complete: 이전 수집이 목록 끝/완결 구간까지 이어졌는지(처음 수집하는 상품은 False).
+    backfill_before: complete=False 일 때 끝나지 않은 수집이 본 가장 오래된 작성일(없으면 None).
+    """
+    with SessionLocal() as s:
+        st = s.execute(
+            select(CrawlState).where(CrawlState.source == source, CrawlState.product_url == product_url)
+        ).scalar_one_or_none()
+        if st is None:
+            return {"last_hash_id": None, "last_review_date": None, "complete": False, "backfill_before": None}
+        return {"last_hash_id": st.last_hash_id, "last_review_date": st.last_review_date,
+                "complete": st.complete is not False, "backfill_before": st.backfill_before}
+
+
+def save_state(source: str, product_url: str, rows: List[Dict], pages: int,
+               complete: bool | None = None, backfill_before: str | None = None):
+    """
+    rows: 이번 수집에서 본 행들(최신순, 첫 행이 가장 최신). 비어 있으면 기존 high-water mark 유지.
+    complete=None 이면 완결 여부/backfill_before 는 그대로 둠(최신순이 아니어서 판단할 수 없는 수집).
+    수집기는 페이지마다 호출 → 중간에 죽어도 어디까지 봤는지가 남음.
+    """
+    with SessionLocal() as s:
+        st = s.execute(
+            select(CrawlState).where(CrawlState.source == source, CrawlState.product_url == product_url)
+        ).scalar_one_or_none()
+        if st is None:
+            st = CrawlState(source=source, product_url=product_url, complete=False)
+            s.add(st)
+        if rows:
+            st.last_hash_id = rows[0]["hash_id"]
+        dates = [d for d in map(day_key, rows) if d]
+        if st.last_review_date:
+            dates.append(st.last_review_date)
+        if dates:
+            st.last_review_date = max(dates)
+        st.pages_last_run = pages
+        if complete is not None:
+            st.complete = complete
+            st.backfill_before = None if complete else backfill_before
+        s.commit()
+
+
+def reached_crawled(state: Dict, rows: List[Dict], known: set) -> bool:
+    """
+    최신순 페이지 rows 가 이미 빠짐없이 수집된 구간에 닿았는지(이후 페이지는 볼 필요 없음).
+    이전 수집이 완결이면 저장된 리뷰 또는 high-water mark 보다 오래된 리뷰에서 멈추고,
+    끝나지 않았으면 그 수집이 본 가장 오래된 날(backfill_before)보다 오래된 저장 리뷰에서만 멈춤
+    (그 사이 페이지는 아직 못 본 구간).
+    """
+    if not rows:
+        return False
+    if state["complete"]:
+        hwm = state["last_review_date"]
+        return bool(known) or bool(hwm and any((day_key(r) or "9999") < hwm for r in rows))
+    cursor = state["backfill_before"]
+    return cursor is not None and any(r["hash_id"] in known and (day_key(r) or "9999") < cursor for r in rows)
+
+
+def next_cursor(state: Dict, walk_min: str | None) -> str | None:
+    """
+    이번 수집이 끝나지 않은 채 저장할 backfill_before. walk_min: 이번 수집이 지금까지 본 가장 오래된 작성일.
+    이전 미완결 구간(cursor)보다 아래로 내려갔으면 이번 수집 기준, 아니면 기존 cursor 유지.
+    """
+    cursor = state["backfill_before"]
+    if state["complete"] or cursor is None or (walk_min and walk_min < cursor):
+        return walk_min
+    return cursor
+
+
+def _noop(*args):
+    pass
+
+
+def crawl_pages(source: str, product_url: str, fetch: Callable[[int], List[Dict] | None],
+                max_pages: int, sorted_latest: bool, log=_noop) -> Dict:
+    """
+    리뷰 목록 페이지를 차례로 받아 저장하는 증분 수집 루프(브라우저와 무관한 부분).
+    fetch(page): 그 페이지의 행(to_row 결과) 또는 None(다음 페이지 없음). page 1 은 이미 열린 목록.
+    sorted_latest=False 면 조기 종료/완결 판단 없이 max_pages 만큼만 봄.
+    반환: {"inserted", "duplicated", "pages"}
+    """
+    state = load_state(source, product_url)
+    count, dup, pages = 0, 0, 0
+    seen_rows: List[Dict] = []
+    finished = False   # 목록 끝 또는 완결 구간에 닿음 → 다음 수집은 새 리뷰에서 멈춰도 됨
+    walk_min = None    # 이번 수집이 본 가장 오래된 작성일(미완결로 끝날 때 backfill_before)
+    budget = 0         # max_pages 예산. 이미 전부 저장된 페이지(미완결 수집 따라잡기)는 세지 않음
+    page = 0
+    while budget < max(1, max_pages):
+        page += 1
+        rows = fetch(page)
+        if rows is None:
+            log(f"no more review pages after {page - 1}")
+            finished = sorted_latest
+            break
+        pages = page
+        rows = list({r["hash_id"]: r for r in rows}.values())  # 페이지 내 중복 카드 제거
+        known = existing_hashes(r["hash_id"] for r in rows)
+        seen_rows.extend(rows)
+
+        # DB 저장(페이지 단위 배치, 트랜잭션 1회)
+        i, d = store_reviews(rows)
+        count += i; dup += d
+        log(f"page {page}: cards={len(rows)} inserted={i} known={len(known)}")
+
+        if not rows:
+            break
+        if not sorted_latest or len(known) < len(rows):
+            budget += 1
+        if not sorted_latest:
+            continue
+        # 최신순일 때 완결 구간 도달 → 이후 페이지는 모두 이미 본 리뷰
+        if reached_crawled(state, rows, known):
+            log(f"reached previously crawled reviews at page {page}")
+            finished = True
+            break
+        # 페이지마다 진행 상황 저장: 여기서 죽어도 다음 수집이 이 아래를 이어서 봄
+        walk_min = min([k for k in [walk_min, *map(day_key, rows)] if k], default=None)
+        save_state(source, product_url, seen_rows, pages,
+                   complete=False, backfill_before=next_cursor(state, walk_min))
+
+    if finished:
+        save_state(source, product_url, seen_rows, pages, complete=True)
+    elif not sorted_latest:
+        save_state(source, product_url, seen_rows, pages)   # 최신순이 아니면 완결 여부 판단 불가
+    return {"inserted": count, "duplicated": dup, "pages": pages}
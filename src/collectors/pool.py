@@ -0,0 +1,100 @@
+# src/collectors/pool.py
+"""
+URL 큐 + 워커 풀 + 호스트별 토큰 버킷 레이트 리미터.
+브라우저와 무관하게 동작하므로(handler 주입) 로컬 HTTP 서버로도 검증 가능.
+
+    limiter = HostRateLimiter(rate=0.5, burst=1)     # 호스트당 초당 0.5건
+    results = run_url_queue(urls, handler, workers=4, limiter=limiter,
+                            worker_context=lambda: BrowserSession())
+"""
+import queue, threading, time
+from contextlib import nullcontext
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+
+
+def _log(*args):
+    print("[POOL]", *args, flush=True)
+
+
+# ---------------------- 레이트 리미터 ----------------------
+class HostRateLimiter:
+    """
+    호스트별 토큰 버킷. 워커 수와 무관하게 호스트당 요청 속도가 rate(건/초)를 넘지 않음.
+    burst 만큼은 연속 허용. 토큰이 없으면 예약(음수 잔량) 후 락 밖에서 대기 → 선착순 공정.
+    """
+
+    def __init__(self, rate: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, list] = {}  # host -> [tokens, updated_at]
+
+    def _reserve(self, host: str) -> float:
+        with self._lock:
+            now = self._clock()
+            b = self._buckets.setdefault(host, [float(self.burst), now])
+            b[0] = min(self.burst, b[0] + (now - b[1]) * self.rate)
+            b[1] = now
+            b[0] -= 1.0
+            return 0.0 if b[0] >= 0 else -b[0] / self.rate
+
+    def acquire(self, url_or_host: str) -> float:
+        """요청 1건 허가를 받을 때까지 대기. 대기한 초를 반환."""
+        host = urlparse(url_or_host).hostname or url_or_host
+        wait = self._reserve(host)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+# ---------------------- 워커 풀 ----------------------
+def run_url_queue(urls: List[str], handler: Callable, workers: int = 1,
+                  limiter: HostRateLimiter | None = None,
+                  worker_context: Callable | None = None) -> List[Dict]:
+    """
+    공유 큐에서 URL 을 꺼내 workers 개 스레드가 처리.
+    - worker_context(): 워커별 자원(예: BrowserSession)을 만드는 컨텍스트 매니저 팩토리
+    - handler(ctx, url) -> int: 처리 건수(예: 삽입된 리뷰 수)
+    - limiter: URL 마다 handler 호출 전 토큰 1개. handler 가 URL 당 요청을 여러 번 보내면 여기엔 넘기지 말고
+      handler 안에서 요청마다 acquire(예: scrape_coupang)
+    반환: URL 순서대로 {"url", "ok", "inserted", "error", "seconds", "waited", "worker"}
+    """
+    q: "queue.Queue[tuple[int, str]]" = queue.Queue()
+    for i, u in enumerate(urls):
+        q.put((i, u))
+    results: List[Dict | None] = [None] * len(urls)
+    make_ctx = worker_context or nullcontext
+
+    def _worker(wid: int):
+        with make_ctx() as ctx:
+            while True:
+                try:
+                    i, url = q.get_nowait()
+                except queue.Empty:
+                    return
+                waited = limiter.acquire(url) if limiter else 0.0
+                t0 = time.perf_counter()
+                try:
+                    n = handler(ctx, url)
+                    res = {"url": url, "ok": True, "inserted": int(n or 0), "error": None}
+                except Exception as e:
+                    res = {"url": url, "ok": False, "inserted": 0, "error": f"{type(e).__name__}: {e}"}
+                res.update(seconds=round(time.perf_counter() - t0, 3), waited=round(waited, 3), worker=wid)
+                results[i] = res
+                _log(f"w{wid} {'OK  ' if res['ok'] else 'FAIL'} {url} "
+                     f"inserted={res['inserted']} {res['seconds']}s" + (f" ({res['error']})" if res["error"] else ""))
+
+    threads = [threading.Thread(target=_worker, args=(w,), daemon=True)
+               for w in range(max(1, min(workers, len(urls))))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [r for r in results if r is not None]
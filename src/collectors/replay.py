@@ -0,0 +1,122 @@
+# src/collectors/replay.py
+"""
+저장된 HTML 스냅샷(storage/*.html)을 다시 파싱해 리뷰로 적재하는 오프라인 재처리.
+셀렉터 수정 후 브라우저/네트워크 없이 재추출·파서 벤치마크 용도.
+
+예) python -m src.collectors.replay --path storage --workers 8
+    python -m src.collectors.replay --path "archive/2024-05/*.html" --dry-run
+"""
+import argparse, glob, os, re, time
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from ..sink import store_reviews
+from .coupang_parser import extract_reviews_from_html, is_bot_challenge, product_url_from_html
+
+
+def _log(*args):
+    print("[REPLAY]", *args, flush=True)
+
+
+def _resolve_paths(patterns: List[str]) -> List[str]:
+    """
+    디렉터리면 하위 *.html, 아니면 glob 패턴으로 해석. 순서 유지 + 중복 제거.
+    """
+    out = []
+    for p in patterns:
+        if os.path.isdir(p):
+            out.extend(sorted(str(x) for x in Path(p).rglob("*.html")))
+        else:
+            out.extend(sorted(glob.glob(p, recursive=True)))
+    return list(dict.fromkeys(out))
+
+
+_TAG_TIME = re.compile(r"_(\d{8}-\d{6})(?:-(\d{3}))?(Z?)_")
+
+
+def captured_at(path: str) -> datetime:
+    """
+    스냅샷 수집 시각: 수집기 파일명(<상품id>_YYYYmmdd-HHMMSS-mmmZ_*.html, UTC)의 시각,
+    없으면 파일 수정 시각. 상대 날짜("3일 전")를 재처리 시각이 아닌 수집 시각 기준으로 해석하기 위함.
+    """
+    m = _TAG_TIME.search(os.path.basename(path))
+    if m:
+        t = datetime.strptime(m.group(1), "%Y%m%d-%H%M%S").replace(microsecond=int(m.group(2) or 0) * 1000)
+        return t.replace(tzinfo=timezone.utc) if m.group(3) else t.astimezone(timezone.utc)  # Z 없음 = 로컬 시각
+    return datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+
+
+def _parse_file(path: str) -> Dict:
+    """
+    워커 프로세스에서 실행: 파일 1개 → 추출 결과 + 처리 시간.
+    """
+    t0 = time.perf_counter()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        html = f.read()
+    blocked = is_bot_challenge(html)
+    if blocked:
+        items, url = [], None
+    else:
+        items = extract_reviews_from_html(html)
+        url = product_url_from_html(html)
+    return {
+        "path": path,
+        "bytes": len(html.encode("utf-8")),
+        "seconds": time.perf_counter() - t0,
+        "product_url": url,
+        "items": items,
+        "blocked": blocked,
+        "captured_at": captured_at(path),
+    }
+
+
+def replay(patterns: List[str], source: str = "coupang", product_url: str | None = None,
+           workers: int | None = None, dry_run: bool = False) -> Dict:
+    paths = _resolve_paths(patterns)
+    if not paths:
+        _log("no snapshot files matched:", patterns)
+        return {"files": 0, "items": 0, "inserted": 0, "duplicated": 0}
+
+    t0 = time.perf_counter()
+    total_bytes, total_items, inserted, dup = 0, 0, 0, 0
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        # 파싱은 병렬, DB 쓰기는 메인 프로세스 한 곳에서
+        for res in ex.map(_parse_file, paths, chunksize=4):
+            url = product_url or res["product_url"]
+            n = len(res["items"])
+            mbps = res["bytes"] / 1e6 / res["seconds"] if res["seconds"] > 0 else 0.0
+            note = " (bot challenge)" if res["blocked"] else ""
+            _log(f"{res['path']}: cards={n} {res['bytes'] / 1e6:.2f}MB "
+                 f"{res['seconds'] * 1000:.1f}ms {mbps:.1f}MB/s{note}")
+            total_bytes += res["bytes"]
+            total_items += n
+            if n and not dry_run:
+                # 같은 스냅샷은 언제 재처리해도 같은 review_day/해시(상대 날짜 기준 = 수집 시각)
+                items = [{**it, "crawled_at": res["captured_at"]} for it in res["items"]]
+                i, d = store_reviews(items, source=source, product_url=url)
+                inserted += i; dup += d
+
+    elapsed = time.perf_counter() - t0
+    _log(f"files={len(paths)} items={total_items} {total_bytes / 1e6:.1f}MB in {elapsed:.2f}s "
+         f"({len(paths) / elapsed:.1f} files/s, {total_bytes / 1e6 / elapsed:.1f}MB/s)")
+    return {"files": len(paths), "items": total_items, "inserted": inserted, "duplicated": dup}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--path", action="append", required=True, help="스냅샷 디렉터리 또는 glob (반복 가능)")
+    ap.add_argument("--source", default="coupang")
+    ap.add_argument("--url", default=None, help="상품 URL 강제 지정(미지정 시 canonical/og:url)")
+    ap.add_argument("--workers", type=int, default=None, help="프로세스 수(기본: CPU 코어 수)")
+    ap.add_argument("--dry-run", action="store_true", help="DB 저장 없이 파싱/처리량만 측정")
+    args = ap.parse_args()
+
+    out = replay(args.path, source=args.source, product_url=args.url,
+                 workers=args.workers, dry_run=args.dry_run)
+    print(f"[OK] inserted={out['inserted']}, duplicated={out['duplicated']}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# src/compare.py
+"""
+상품별 비교 인사이트(신제품 vs 경쟁 상품). 상품 N개를 한 번의 조회로 읽고, 공유 어휘로
+문서-단어 희소행렬을 만든 뒤 상품 그룹 행렬 G(상품 × 문서)와의 곱 G·X 로
+상품별 단어/바이그램 빈도를 한 번에 집계한다. 평점/감성/불만 라벨은 np.bincount 로 그룹 합.
+
+- 상품 지정: product_ids / product_urls 목록, 또는 source 의 리뷰 수 상위 max_products 개
+- 상품당 최근 limit 건(ROW_NUMBER() OVER (PARTITION BY product_id ...) 로 같은 쿼리에서 제한)
+- 배치 스트리밍(yield_per) + 배치별 G_b·X_b 누적 → 메모리는 상품 수 × 어휘 크기에 비례
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import desc, func, select
+
+from .db import ReadSession
+from .models import Review
+from .products import lookup_id, product_urls as urls_for_ids
+from .sentiment import LABELS as SENTIMENT_LABELS
+from .text import PAIN_MATCHER, doc_tokens
+
+BATCH = 20_000
+MAX_PRODUCTS = 50
+
+
+def _products_for_source(source: str, max_products: int) -> List[int]:
+    with ReadSession() as s:
+        n = func.count()
+        stmt = (select(Review.product_id).where(Review.source == source, Review.product_id.is_not(None),
+                                                Review.dup_of.is_(None))
+                .group_by(Review.product_id).order_by(desc(n), Review.product_id).limit(max_products))
+        return [r[0] for r in s.execute(stmt).all()]
+
+
+def _window_stmt(product_ids: Sequence[int], source: str | None, limit: int | None):
+    cols = (Review.product_id, Review.rating, Review.sentiment_label,
+            Review.body, Review.tokens, Review.pain_mask, Review.text_ver)
+    cond = [Review.product_id.in_(product_ids), Review.body.is_not(None), Review.body != "",
+            Review.dup_of.is_(None)]
+    if source:
+        cond.append(Review.source == source)
+    if limit is None:
+        return select(*cols).where(*cond)
+    rn = func.row_number().over(partition_by=Review.product_id, order_by=desc(Review.id)).label("rn")
+    sub = select(*cols, rn).where(*cond).subquery()
+    return select(*(sub.c[c.key] for c in cols)).where(sub.c.rn <= limit)
+
+
+class _Vocab:
+    """단어 → 열 번호(배치 간 공유, 새 단어는 뒤에 추가)."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.terms: List[str] = []
+
+    def encode(self, docs: List[List[str]]) -> sparse.csr_matrix:
+        # 문서별 단어 목록 → tf CSR (중복 열은 합산)
+        index, terms = self.index, self.terms
+        cols = []
+        for toks in docs:
+            row = []
+            for t in toks:
+                i = index.get(t)
+                if i is None:
+                    i = index[t] = len(terms)
+                    terms.append(t)
+                row.append(i)
+            cols.append(row)
+        indptr = np.zeros(len(cols) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in cols], out=indptr[1:])
+        indices = np.fromiter((i for c in cols for i in c), dtype=np.int64, count=int(indptr[-1]))
+        X = sparse.csr_matrix((np.ones(len(indices), dtype=np.int64), indices, indptr),
+                              shape=(len(cols), max(len(terms), 1)))
+        X.sum_duplicates()
+        return X
+
+
+def _group_add(acc, G, X):
+    # acc += G·X (어휘가 늘었으면 acc 열을 먼저 넓힘)
+    part = (G @ X).tocsr()
+    if acc is None:
+        return part
+    if acc.shape[1] < part.shape[1]:
+        acc.resize(acc.shape[0], part.shape[1])
+    return acc + part
+
+
+def _top_row(terms: List[str], tf, df, row: int, topk: int, min_df: int) -> List[Dict]:
+    """상품 행 하나에서 df >= min_df 인 단어 tf 상위 topk (동률은 term 내림차순, insights 와 동일)."""
+    lo, hi = tf.indptr[row], tf.indptr[row + 1]
+    idx, freq, dfs = tf.indices[lo:hi], tf.data[lo:hi], df.data[lo:hi]
+    ok = dfs >= min_df
+    idx, freq = idx[ok], freq[ok]
+    if not len(idx) or topk <= 0:
+        return []
+    if topk < len(idx):
+        cand = np.argpartition(-freq, topk - 1)[:topk]
+        keep = freq >= freq[cand].min()  # 경계 동률 포함 후 정렬
+        idx, freq = idx[keep], freq[keep]
+    order = sorted(range(len(idx)), key=lambda k: terms[idx[k]], reverse=True)
+    order.sort(key=lambda k: freq[k], reverse=True)
+    return [{"term": terms[idx[k]], "freq": int(freq[k])} for k in order[:topk]]
+
+
+def _distinctive_row(terms: List[str], tf, row: int, total_tf: np.ndarray, topk: int,
+                     min_tf: int) -> List[Dict]:
+    """다른 상품 대비 이 상품에서 두드러진 단어: (상품 내 비중 / 전체 비중) 상위."""
+    lo, hi = tf.indptr[row], tf.indptr[row + 1]
+    idx, freq = tf.indices[lo:hi], tf.data[lo:hi].astype(np.float64)
+    ok = freq >= min_tf
+    idx, freq = idx[ok], freq[ok]
+    if not len(idx) or topk <= 0:
+        return []
+    lift = (freq / freq.sum()) / (total_tf[idx] / total_tf.sum())
+    k = min(topk, len(idx))
+    cand = np.argpartition(-lift, k - 1)[:k]
+    cand = cand[np.lexsort((-freq[cand], -lift[cand]))]
+    return [{"term": terms[idx[c]], "freq": int(freq[c]), "lift": round(float(lift[c]), 3)} for c in cand]
+
+
+def compare_products(product_urls: Sequence[str] | None = None, source: str | None = None,
+                     limit: int | None = 1000, topk: int = 10, min_df: int = 2,
+                     max_products: int = MAX_PRODUCTS, product_ids: Sequence[int] | None = None) -> Dict:
+    """
+    반환: {"products": [상품별 total/rating/sentiment/top_terms/top_bigrams/pain_points/distinctive_terms],
+           "vocab_size": {"uni", "bi"}}
+    등록되지 않은 product_url 은 total=0 으로 그대로 돌려준다.
+    """
+    if product_ids:
+        ids = list(dict.fromkeys(product_ids))
+        urls = urls_for_ids(ids)
+        products = [(i, urls.get(i)) for i in ids]
+    elif product_urls:
+        products = [(lookup_id(u), u) for u in dict.fromkeys(product_urls)]
+    elif source:
+        ids = _products_for_source(source, max_products)
+        urls = urls_for_ids(ids)
+        products = [(i, urls.get(i)) for i in ids]
+    else:
+        raise ValueError("product_ids, product_urls or source is required")
+    if not products:
+        return {"products": [], "vocab_size": {"uni": 0, "bi": 0}}
+
+    p_index = {pid: i for i, (pid, _) in enumerate(products) if pid is not None}
+    n_prod = len(products)
+    n_labels = len(PAIN_MATCHER.order)
+    docs = np.zeros(n_prod, dtype=np.int64)
+    r_cnt, r_sum, r_sq = np.zeros(n_prod), np.zeros(n_prod), np.zeros(n_prod)
+    r_dist = np.zeros(n_prod * 5, dtype=np.int64)
+    s_dist = np.zeros(n_prod * len(SENTIMENT_LABELS), dtype=np.int64)
+    pains = np.zeros((n_labels, n_prod), dtype=np.int64)
+    uni, bi = _Vocab(), _Vocab()
+    uni_tf = uni_df = bi_tf = bi_df = None
+    s_code = {label: i for i, label in enumerate(SENTIMENT_LABELS)}
+
+    with ReadSession() as s:
+        stmt = _window_stmt(list(p_index), source, limit)
+        for part in s.execute(stmt.execution_options(yield_per=BATCH)).partitions():
+            g = np.fromiter((p_index[r[0]] for r in part), dtype=np.int64, count=len(part))
+            toks, masks = zip(*(doc_tokens(*r[3:]) for r in part))
+            G = sparse.csr_matrix((np.ones(len(g)), (g, np.arange(len(g)))), shape=(n_prod, len(g)))
+
+            X = uni.encode(toks)
+            uni_tf = _group_add(uni_tf, G, X)
+            X.data[:] = 1
+            uni_df = _group_add(uni_df, G, X)
+            X = bi.encode([[f"{a} {b}" for a, b in zip(t, t[1:])] for t in toks])
+            bi_tf = _group_add(bi_tf, G, X)
+            X.data[:] = 1
+            bi_df = _group_add(bi_df, G, X)
+
+            docs += np.bincount(g, minlength=n_prod)
+            r = np.array([np.nan if x[1] is None else x[1] for x in part], dtype=np.float64)
+            ok = ~np.isnan(r)
+            r_cnt += np.bincount(g[ok], minlength=n_prod)
+            r_sum += np.bincount(g[ok], weights=r[ok], minlength=n_prod)
+            r_sq += np.bincount(g[ok], weights=r[ok] ** 2, minlength=n_prod)
+            star = np.clip(np.rint(r[ok]).astype(np.int64), 1, 5) - 1
+            r_dist += np.bincount(g[ok] * 5 + star, minlength=n_prod * 5)
+            lab = np.array([s_code.get(x[2], -1) for x in part], dtype=np.int64)
+            has = lab >= 0
+            s_dist += np.bincount(g[has] * len(SENTIMENT_LABELS) + lab[has], minlength=s_dist.size)
+            m = np.array(masks, dtype=np.int64)
+            for b in range(n_labels):
+                pains[b] += np.bincount(g, weights=(m >> b) & 1, minlength=n_prod).astype(np.int64)
+
+    for mat in (uni_tf, uni_df, bi_tf, bi_df):
+        if mat is not None:
+            mat.sort_indices()
+    total_uni = np.asarray(uni_tf.sum(axis=0)).ravel() if uni_tf is not None else None
+
+    out = []
+    for p, (pid, url) in enumerate(products):
+        item = {"product_id": pid, "product_url": url, "total": int(docs[p])}
+        if not docs[p]:
+            out.append({**item, "rating": None, "sentiment": None, "top_terms": [], "top_bigrams": [],
+                        "pain_points": [], "distinctive_terms": []})
+            continue
+        n = r_cnt[p]
+        mean = r_sum[p] / n if n else None
+        item["rating"] = {
+            "count": int(n),
+            "mean": round(mean, 3) if n else None,
+            "std": round(float(np.sqrt(max(r_sq[p] / n - mean ** 2, 0.0))), 3) if n else None,
+            "dist": {str(k + 1): int(r_dist[p * 5 + k]) for k in range(5)},
+        }
+        sd = s_dist[p * len(SENTIMENT_LABELS):(p + 1) * len(SENTIMENT_LABELS)]
+        item["sentiment"] = {label: int(sd[i]) for i, label in enumerate(SENTIMENT_LABELS)}
+        item["top_terms"] = _top_row(uni.terms, uni_tf, uni_df, p, topk, min_df)
+        item["top_bigrams"] = _top_row(bi.terms, bi_tf, bi_df, p, topk, min_df)
+        item["pain_points"] = sorted(
+            ({"label": label, "count": int(pains[b, p])} for b, label in enumerate(PAIN_MATCHER.order)
+             if pains[b, p] > 0),
+            key=lambda x: x["count"], reverse=True)
+        item["distinctive_terms"] = (_distinctive_row(uni.terms, uni_tf, p, total_uni, topk, min_df)
+                                     if n_prod > 1 else [])
+        out.append(item)
+    return {"products": out, "vocab_size": {"uni": len(uni.terms), "bi": len(bi.terms)}}
@@ -1,4 +1,20 @@
 import os
 from dotenv import load_dotenv
 load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///storage/reviews.sqlite3")
\ No newline at end of file
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///storage/reviews.sqlite3")
+INSIGHTS_CACHE_SIZE = int(os.getenv("INSIGHTS_CACHE_SIZE", "128"))
+REVIEW_TZ = os.getenv("REVIEW_TZ", "Asia/Seoul")  # 상대 날짜("3일 전") 해석 시간대
+REVIEWS_PAGE_MAX = int(os.getenv("REVIEWS_PAGE_MAX", "1000"))  # GET /api/reviews JSON 페이지 상한
+NEAR_DUP_MODE = os.getenv("NEAR_DUP_MODE", "link")  # 유사 중복: link(저장+dup_of 표시) / skip(저장 안 함) / off
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))  # 본문 3-gram Jaccard
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "storage/snapshots")  # Parquet 분석 스냅샷(src.snapshot)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))            # 백그라운드 분석 작업 프로세스 수(src.jobs)
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "16"))   # 대기+실행 중 작업 상한(넘으면 429)
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "600"))    # 끝난 작업 결과 보관(초)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")        # 분석 조회용 복제본(없으면 DATABASE_URL 을 읽기 전용으로)
+DB_PROFILE = os.getenv("DB_PROFILE", "wal")                # wal(동시성 PRAGMA/풀 설정) / default(create_engine 기본값)
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))  # SQLite 잠금 대기
+DB_CACHE_KB = int(os.getenv("DB_CACHE_KB", "65536"))       # SQLite 연결당 페이지 캐시
+DB_MMAP_MB = int(os.getenv("DB_MMAP_MB", "256"))           # SQLite mmap_size
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "16"))
@@ -0,0 +1,172 @@
+# src/cooccurrence.py
+"""
+키워드 공동출현(같은 리뷰에 함께 나온 단어 쌍) 순위 + 토픽 힌트.
+
+1) 어휘 선정: 창(window)을 스트리밍으로 읽으며 문서 빈도(df)를 세되, 후보 수가
+   max_vocab * VOCAB_SLACK 를 넘으면 하위 절반을 버리는 유한 카운터(빈도 상위 단어는 유지).
+2) 공동출현: 문서 배치마다 이진 문서-단어 희소행렬 X_b 를 만들고 C += X_bᵀX_b.
+   C 는 어휘 × 어휘 희소행렬이라 메모리는 창 크기가 아니라 어휘 상한에 비례.
+3) 순위: C 의 상삼각 비영 원소에서 PMI/lift/NPMI 를 계산해 argpartition 으로 top-k
+   (밀집 행렬을 만들지 않음).
+4) 토픽 힌트: df 상위 단어를 씨앗으로, NPMI 가 높은 이웃을 묶는다.
+"""
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import desc, select
+
+from .db import ReadSession
+from .models import Review
+from .text import PAIN_MATCHER, doc_tokens
+
+MAX_VOCAB = 2_000
+VOCAB_SLACK = 8         # 어휘 선정 중 유지할 후보 수 = max_vocab * VOCAB_SLACK
+BATCH = 20_000
+METRICS = ("pmi", "lift", "npmi", "count")
+
+
+def _iter_doc_terms(limit: int, source: str | None = None, batch: int = BATCH,
+                    span: List[int] | None = None, id_range: Tuple[int, int] | None = None) -> Iterator[List[set]]:
+    """
+    최근 limit 건(빈 본문 제외)의 문서별 단어 집합을 batch 단위로 스트리밍.
+    span: 넘기면 읽은 창의 [최대 id, 최소 id] 를 채움. id_range=(최소, 최대): 그 id 범위 안에서만 읽음.
+    """
+    with ReadSession() as s:
+        stmt = (select(Review.id, Review.body, Review.tokens, Review.pain_mask, Review.text_ver)
+                .where(Review.body.is_not(None), Review.body != "", Review.dup_of.is_(None)))
+        if source:
+            stmt = stmt.where(Review.source == source)
+        if id_range:
+            stmt = stmt.where(Review.id.between(*id_range))
+        stmt = stmt.order_by(desc(Review.id)).limit(limit).execution_options(yield_per=batch)
+        for part in s.execute(stmt).partitions():
+            if span is not None:
+                span[:] = [span[0] if span else part[0][0], part[-1][0]]
+            yield [set(doc_tokens(*r[1:])[0]) for r in part]
+
+
+def _select_vocab(batches: Iterable[List[set]], max_vocab: int, min_df: int) -> List[str]:
+    """
+    df 상위 max_vocab 단어. 후보가 많아지면 df 하위 절반을 버려 메모리를 어휘 상한에 묶어 둔다
+    (버려진 뒤 다시 나온 단어는 df 가 낮게 잡히므로, 상위권 단어의 순위만 보장).
+    """
+    df: Counter = Counter()
+    cap = max_vocab * VOCAB_SLACK
+    for docs in batches:
+        for terms in docs:
+            df.update(terms)
+        if len(df) > cap:
+            df = Counter(dict(df.most_common(cap // 2)))
+    return [t for t, n in df.most_common(max_vocab) if n >= min_df]
+
+
+def _npmi(c, df_a, df_b, n_docs: int):
+    # 정규화 PMI ∈ [-1, 1]: log(p_ab / p_a p_b) / -log p_ab (항상 함께 나오면 1)
+    p_ab = c / n_docs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.log(c * n_docs / (df_a * df_b)) / -np.log(p_ab)
+    return np.where(p_ab < 1, out, 1.0)
+
+
+def cooccurrence_matrix(batches: Iterable[List[set]], vocab: List[str]):
+    """
+    반환: (C, n_docs). C[i, j] = 단어 i, j 가 함께 나온 문서 수(대각선 = df), scipy CSR.
+    """
+    index = {t: i for i, t in enumerate(vocab)}
+    v = len(vocab)
+    C = sparse.csr_matrix((v, v), dtype=np.int64)
+    n_docs = 0
+    for docs in batches:
+        cols = [[index[t] for t in terms if t in index] for terms in docs]
+        indptr = np.zeros(len(cols) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in cols], out=indptr[1:])
+        indices = np.fromiter((i for c in cols for i in c), dtype=np.int32, count=int(indptr[-1]))
+        X = sparse.csr_matrix((np.ones(len(indices), dtype=np.int64), indices, indptr), shape=(len(cols), v))
+        C = C + (X.T @ X).tocsr()
+        n_docs += len(cols)
+    return C, n_docs
+
+
+def rank_pairs(C, vocab: List[str], n_docs: int, topk: int = 30, min_count: int = 5,
+               metric: str = "pmi") -> List[Dict]:
+    """C 상삼각 비영 원소만으로 PMI/lift/NPMI 계산 후 top-k (동률은 공동출현 수 우선)."""
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}")
+    U = sparse.triu(C, k=1).tocoo()
+    keep = U.data >= min_count
+    i, j, c = U.row[keep], U.col[keep], U.data[keep].astype(np.float64)
+    if not len(c) or topk <= 0:
+        return []
+    df = C.diagonal().astype(np.float64)
+    lift = c * n_docs / (df[i] * df[j])
+    pmi = np.log(lift)
+    npmi = _npmi(c, df[i], df[j], n_docs)
+    key = {"pmi": pmi, "lift": lift, "npmi": npmi, "count": c}[metric]
+
+    k = min(topk, len(key))
+    cand = np.argpartition(-key, k - 1)[:k]
+    order = cand[np.lexsort((-c[cand], -key[cand]))]
+    return [
+        {"a": vocab[i[x]], "b": vocab[j[x]], "count": int(c[x]),
+         "pmi": round(float(pmi[x]), 4), "lift": round(float(lift[x]), 4), "npmi": round(float(npmi[x]), 4)}
+        for x in order
+    ]
+
+
+def topic_hints(C, vocab: List[str], n_docs: int, n_topics: int = 8, per_topic: int = 6,
+                min_count: int = 5, min_npmi: float = 0.1) -> List[Dict]:
+    """
+    df 상위 단어를 씨앗으로 NPMI >= min_npmi 인 이웃(공동출현 min_count 이상)을 묶는다.
+    이미 다른 토픽에 들어간 단어는 씨앗/이웃으로 다시 쓰지 않음. 불만 라벨이 걸리면 함께 표시.
+    """
+    df = C.diagonal().astype(np.float64)
+    used: set = set()
+    topics = []
+    for seed in np.argsort(-df, kind="stable"):
+        if len(topics) >= n_topics or df[seed] < min_count:
+            break
+        if seed in used:
+            continue
+        row = C.getrow(seed)
+        nb, c = row.indices, row.data.astype(np.float64)
+        keep = (nb != seed) & (c >= min_count)
+        nb, c = nb[keep], c[keep]
+        if not len(nb):
+            continue
+        npmi = _npmi(c, df[seed], df[nb], n_docs)
+        sel = [(float(s), int(t)) for s, t in zip(npmi, nb) if s >= min_npmi and t not in used]
+        sel.sort(reverse=True)
+        members = [int(seed)] + [t for _, t in sel[:per_topic - 1]]
+        if len(members) < 2:
+            continue
+        used.update(members)
+        terms = [vocab[t] for t in members]
+        topics.append({
+            "seed": vocab[seed],
+            "terms": terms,
+            "docs": int(df[seed]),
+            "pain_labels": PAIN_MATCHER.labels(PAIN_MATCHER.mask(" ".join(terms))),
+        })
+    return topics
+
+
+def compute_cooccurrence(limit: int = 5000, source: str | None = None, topk: int = 30,
+                         min_count: int = 5, metric: str = "pmi", max_vocab: int = MAX_VOCAB,
+                         n_topics: int = 8) -> Dict:
+    span: List[int] = []
+    vocab = _select_vocab(_iter_doc_terms(limit, source, span=span), max_vocab, min_df=min_count)
+    if len(vocab) < 2:
+        return {"total": 0, "vocab_size": len(vocab), "pairs": [], "topics": []}
+    # 두 번째 읽기는 첫 읽기의 id 범위로 고정: 그사이 삽입된 리뷰가 "최근 limit 건" 창을 밀어내면
+    # 어휘/df 와 C/n_docs 가 서로 다른 창에서 나와 PMI 가 틀어짐
+    C, n_docs = cooccurrence_matrix(_iter_doc_terms(limit, source, id_range=(span[1], span[0])), vocab)
+    return {
+        "total": n_docs,
+        "vocab_size": len(vocab),
+        "nnz": int(C.nnz),
+        "metric": metric,
+        "pairs": rank_pairs(C, vocab, n_docs, topk=topk, min_count=min_count, metric=metric),
+        "topics": topic_hints(C, vocab, n_docs, n_topics=n_topics, min_count=min_count),
+    }
@@ -0,0 +1,151 @@
+# src/dates.py
+"""
+리뷰 작성일 문자열 → date 정규화(수집기/CSV/API 공용).
+절대 날짜(2024-05-01, 2024.5.1, 24.05.01, 2024년 5월 1일)와 상대 날짜(3일 전, 2주 전,
+1개월 전, 오늘, 어제 ...)를 처리하며, 상대 날짜는 기준 시각(수집 시각)으로 계산한다.
+
+예) python -m src.dates --backfill      # review_day 가 비어 있는 행 채우기(기준: created_at)
+"""
+import argparse, re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, update
+
+from .cache import bump_data_version
+from .config import REVIEW_TZ
+from .db import SessionLocal
+from .init_db import migrate
+from .models import Review
+
+TZ = ZoneInfo(REVIEW_TZ)
+
+_ABS = re.compile(r"(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})")
+_ABS_SHORT = re.compile(r"(?<!\d)(\d{2})\.(\d{1,2})\.(\d{1,2})(?!\d)")   # 24.05.01
+_REL = re.compile(r"(\d+)\s*(분|시간|일|주|주일|개월|달|년)\s*전")
+_REL_WORDS = {"오늘": 0, "방금": 0, "어제": 1, "그제": 2, "그저께": 2}
+
+
+def _ref_date(ref: datetime | date | None) -> date | None:
+    # 기준 시각 → 리뷰 표시 시간대(REVIEW_TZ)의 날짜. naive datetime 은 UTC 로 간주(DB created_at)
+    if ref is None or type(ref) is date:
+        return ref
+    if ref.tzinfo is None:
+        ref = ref.replace(tzinfo=timezone.utc)
+    return ref.astimezone(TZ).date()
+
+
+def _minus_months(d: date, months: int) -> date:
+    y, m = divmod(d.year * 12 + d.month - 1 - months, 12)
+    m += 1
+    last = (date(y + (m == 12), m % 12 + 1, 1) - timedelta(days=1)).day
+    return date(y, m, min(d.day, last))
+
+
+def _safe_date(y: int, m: int, d: int) -> date | None:
+    try:
+        return date(y, m, d)
+    except ValueError:
+        return None
+
+
+def parse_review_date(value: str | None, ref: datetime | date | None = None) -> date | None:
+    """
+    절대 날짜는 그대로, 상대 날짜는 ref 기준으로 계산(ref 가 없으면 None). 해석 불가면 None.
+    """
+    if not value:
+        return None
+    text = str(value).strip()
+    m = _ABS.search(text)
+    if m:
+        return _safe_date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    m = _ABS_SHORT.search(text)
+    if m:
+        return _safe_date(2000 + int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+    base = _ref_date(ref)
+    if base is None:
+        return None
+    m = _REL.search(text)
+    if m:
+        n, unit = int(m.group(1)), m.group(2)
+        if unit in ("분", "시간"):
+            # 시각 단위는 기준 시각에서 빼야 날짜가 넘어가는지 알 수 있음
+            if isinstance(ref, datetime):
+                delta = timedelta(minutes=n) if unit == "분" else timedelta(hours=n)
+                return _ref_date(ref - delta)
+            return base
+        if unit == "일":
+            return base - timedelta(days=n)
+        if unit in ("주", "주일"):
+            return base - timedelta(weeks=n)
+        if unit in ("개월", "달"):
+            return _minus_months(base, n)
+        return _minus_months(base, 12 * n)
+    for word, days in _REL_WORDS.items():
+        if word in text:
+            return base - timedelta(days=days)
+    return None
+
+
+def now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------- 기간 버킷 ----------------------
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(d: date, bucket: str) -> date:
+    if bucket == "day":
+        return d
+    if bucket == "week":
+        return d - timedelta(days=d.weekday())  # ISO 주(월요일 시작)
+    if bucket == "month":
+        return d.replace(day=1)
+    raise ValueError(f"bucket must be one of {BUCKETS}")
+
+
+# ---------------------- 백필 ----------------------
+def backfill(batch: int = 20_000) -> Dict:
+    """review_day 가 비어 있고 review_date 가 있는 행을 created_at(적재 시각) 기준으로 정규화."""
+    migrate()
+    done, parsed, last_id = 0, 0, 0
+    with SessionLocal() as s:
+        while True:
+            rows = s.execute(
+                select(Review.id, Review.review_date, Review.created_at)
+                .where(Review.review_day.is_(None), Review.review_date.is_not(None), Review.id > last_id)
+                .order_by(Review.id).limit(batch)
+            ).all()
+            if not rows:
+                break
+            params = [{"id": rid, "review_day": day} for rid, raw, created in rows
+                      if (day := parse_review_date(raw, created or now())) is not None]
+            if params:
+                s.execute(update(Review), params)
+                bump_data_version(s)
+            s.commit()
+            done += len(rows)
+            parsed += len(params)
+            last_id = rows[-1][0]
+            print(f"[DATES] scanned={done} parsed={parsed} (id<={last_id})", flush=True)
+    return {"scanned": done, "parsed": parsed}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backfill", action="store_true", help="기존 행 review_day 채우기")
+    ap.add_argument("--parse", default=None, help="문자열 하나 해석 확인(기준: 지금)")
+    args = ap.parse_args()
+    if args.parse is not None:
+        print(parse_review_date(args.parse, now()))
+    elif args.backfill:
+        out = backfill()
+        print(f"[OK] scanned={out['scanned']}, parsed={out['parsed']}")
+    else:
+        ap.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,64 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from .config import DATABASE_URL
+from .config import (DATABASE_READ_URL, DATABASE_URL, DB_BUSY_TIMEOUT_MS, DB_CACHE_KB, DB_MMAP_MB,
+                     DB_MAX_OVERFLOW, DB_POOL_SIZE, DB_PROFILE)
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
\ No newline at end of file
+DB_PROFILES = ("default", "wal")
+
+def _sqlite_pragmas(readonly: bool):
+    # 연결마다 적용(PRAGMA 는 연결 단위, journal_mode=WAL 만 파일에 기록되어 유지됨)
+    def on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        if not readonly:
+            cur.execute("PRAGMA journal_mode=WAL")        # 읽기와 쓰기가 서로 막지 않음
+        cur.execute("PRAGMA synchronous=NORMAL")          # WAL 에서는 체크포인트 때만 fsync
+        cur.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+        cur.execute(f"PRAGMA cache_size=-{DB_CACHE_KB}")  # 음수 = KiB 단위
+        cur.execute(f"PRAGMA mmap_size={DB_MMAP_MB * 1024 * 1024}")
+        if readonly:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+    return on_connect
+
+def make_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE, readonly: bool = False):
+    """
+    profile="wal": SQLite 는 WAL/synchronous=NORMAL/busy_timeout/mmap/cache PRAGMA + 스레드 공유 풀,
+    그 외 DB 는 풀 크기/pre_ping. "default" 는 create_engine 기본값(비교용, src.bench.db_bench).
+    readonly=True 면 분석 조회 전용(SQLite 는 query_only).
+    """
+    if profile not in DB_PROFILES:
+        raise ValueError(f"DB_PROFILE must be one of {DB_PROFILES}")
+    if profile == "default":
+        return create_engine(url, echo=False, future=True)
+    kw = {}
+    sqlite = url.startswith("sqlite")
+    memory = sqlite and (url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url)
+    if sqlite:
+        # Flask 는 요청마다 다른 스레드 → 연결을 스레드 간에 돌려 씀(한 번에 한 스레드만 사용)
+        kw["connect_args"] = {"check_same_thread": False, "timeout": DB_BUSY_TIMEOUT_MS / 1000}
+    if not memory:
+        kw.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+        if not sqlite:
+            kw.update(pool_pre_ping=True, pool_recycle=1800)
+    eng = create_engine(url, echo=False, future=True, **kw)
+    if sqlite and not memory:
+        event.listen(eng, "connect", _sqlite_pragmas(readonly))
+    return eng
+
+engine = make_engine()
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+# 분석(insights/compare/trends/cooccurrence/snapshot) 조회용. DATABASE_READ_URL(복제본)이 없으면
+# 같은 DB 에 별도 풀 + 읽기 전용 연결 → 긴 분석 조회가 수집/적재 쓰기 풀을 점유하지 않음
+read_engine = make_engine(DATABASE_READ_URL or DATABASE_URL, readonly=True)
+ReadSession = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
+
+def dialect_insert(table):
+    # ON CONFLICT 절을 쓰는 INSERT (SQLite/PostgreSQL)
+    insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+    return insert(table)
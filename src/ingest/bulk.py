@@ -0,0 +1,177 @@
+# src/ingest/bulk.py
+"""
+대량 리뷰 제출(파트너 피드) 공용: JSON 배열 / NDJSON 본문을 조금씩 읽어 레코드 단위로 풀고,
+batch 건마다 sink 공통 경로(review_hash → INSERT ... ON CONFLICT DO NOTHING)로 한 트랜잭션씩 저장.
+요청 본문 전체를 메모리에 올리지 않는다(읽기 버퍼 + 배치 1개 분량만 유지).
+
+예) python -m src.ingest.bulk --path feed.ndjson --source partner
+"""
+import argparse, codecs, json, re
+from typing import Dict, IO, Iterator, List, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..db import SessionLocal
+from ..sink import to_row, upsert_rows
+
+BATCH = 1_000
+READ_SIZE = 64 * 1024
+MAX_ERRORS = 20          # 응답에 담을 오류 상세 수(개수는 전부 셈)
+MAX_RECORD = 1 << 20     # JSON 배열 원소 하나의 최대 크기(문자)
+
+_decoder = json.JSONDecoder()
+_NUM_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def iter_ndjson(stream: IO[bytes]) -> Iterator[Tuple[int, Dict | None, str | None]]:
+    """한 줄에 JSON 객체 하나. (줄 번호, 레코드 | None, 오류 | None), 빈 줄은 건너뜀."""
+    for no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield no, json.loads(line), None
+        except ValueError as e:
+            yield no, None, str(e)
+
+
+def iter_json_array(stream: IO[bytes]) -> Iterator[Tuple[int, Dict | None, str | None]]:
+    """
+    최상위 JSON 배열 [ {...}, {...} ] 을 원소 단위로 증분 파싱. (원소 번호, 레코드, None).
+    배열 형식이 깨졌거나 원소 하나가 MAX_RECORD 를 넘으면 ValueError.
+    """
+    dec = codecs.getincrementaldecoder("utf-8")()   # 청크 경계에서 잘린 멀티바이트 문자 처리
+    buf, pos, no, eof = "", 0, 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = stream.read(READ_SIZE)
+        eof = not chunk
+        buf = buf[pos:] + dec.decode(chunk, final=eof)
+        pos = 0
+        if len(buf) > MAX_RECORD:
+            raise ValueError(f"record too large near element {no + 1}")
+
+    def peek() -> str:
+        # 공백을 건너뛴 다음 문자("" 이면 입력 끝)
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            fill()
+
+    if peek() != "[":
+        raise ValueError("JSON array expected")
+    pos += 1
+    if peek() == "]":
+        return
+    while True:
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise ValueError(f"invalid JSON at element {no + 1}")
+                fill()
+                continue
+            # 숫자가 버퍼 끝에서 잘렸으면("1." + "5", "12e" + "3") 앞부분만 읽힘: 숫자 뒤 남은 버퍼가
+            # 전부 숫자 문자이면(구분자가 아직 안 보임) 더 읽고 다시 파싱
+            if (not eof and isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and _NUM_TAIL.match(buf, end).end() == len(buf)):
+                fill()
+                continue
+            break
+        pos = end
+        no += 1
+        yield no, obj, None
+        c = peek()
+        if c == "]":
+            return
+        if c != ",":
+            raise ValueError(f"',' expected after element {no}")
+        pos += 1
+        peek()
+
+
+def store_stream(records: Iterator[Tuple[int, Dict | None, str | None]], source: str = "partner",
+                 batch: int = BATCH) -> Dict:
+    """
+    레코드 스트림을 batch 건씩 저장(배치마다 커밋). 파싱 실패, 객체가 아닌 값, to_row 검증 실패
+    (rating 이 숫자가 아님, source 없음 등) 레코드는 건너뛰고 errors 로 세며 계속 진행.
+    배치 저장 자체가 실패하면 그 배치만 롤백해 errors 로 세고 계속. 배열 형식이 깨지면 그 앞까지 저장하고
+    중단(aborted 에 사유).
+    반환: {"inserted", "duplicated", "errors", "batches": [{"rows", "inserted", "duplicated", "errors"}],
+           "error_detail", "aborted"}
+    """
+    out = {"inserted": 0, "duplicated": 0, "errors": 0, "batches": [], "error_detail": [], "aborted": None}
+    rows: List[Dict] = []
+    nos: List[int] = []
+    pending = 0   # 이번 배치에 속한 오류 레코드 수
+
+    def error(no, err):
+        nonlocal pending
+        pending += 1
+        out["errors"] += 1
+        if len(out["error_detail"]) < MAX_ERRORS:
+            out["error_detail"].append({"record": no, "error": err})
+
+    def flush(s):
+        nonlocal pending
+        n = 0
+        if rows:
+            try:
+                n = upsert_rows(s, rows)
+                s.commit()
+            except SQLAlchemyError as e:
+                s.rollback()
+                for no in nos:
+                    error(no, f"batch failed: {type(getattr(e, 'orig', None) or e).__name__}")
+                n = None
+        stored = 0 if n is None else len(rows)
+        out["batches"].append({"rows": len(rows), "inserted": n or 0, "duplicated": stored - (n or 0),
+                               "errors": pending})
+        out["inserted"] += n or 0
+        out["duplicated"] += stored - (n or 0)
+        rows.clear()
+        nos.clear()
+        pending = 0
+
+    with SessionLocal() as s:
+        try:
+            for no, d, err in records:
+                if err is None:
+                    try:
+                        rows.append(to_row(d, source=source))
+                        nos.append(no)
+                    except ValueError as e:
+                        err = str(e)
+                if err is not None:
+                    error(no, err)
+                    continue
+                if len(rows) >= batch:
+                    flush(s)
+        except ValueError as e:
+            out["aborted"] = str(e)
+        if rows or pending:
+            flush(s)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--path", required=True, help="NDJSON(.ndjson/.jsonl) 또는 JSON 배열(.json) 파일")
+    ap.add_argument("--source", default="partner")
+    ap.add_argument("--batch", type=int, default=BATCH)
+    args = ap.parse_args()
+    with open(args.path, "rb") as f:
+        records = iter_json_array(f) if args.path.endswith(".json") else iter_ndjson(f)
+        out = store_stream(records, source=args.source, batch=args.batch)
+    if out["aborted"]:
+        print(f"[WARN] aborted: {out['aborted']}")
+    print(f"[OK] inserted={out['inserted']}, duplicated={out['duplicated']}, errors={out['errors']}, "
+          f"batches={len(out['batches'])}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
-import argparse, json
+import argparse, glob, io, json, math, os, re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List
 import pandas as pd
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from ..dates import parse_review_date
 from ..db import SessionLocal
-from ..models import Review
+from ..models import IngestCheckpoint
+from ..sentiment import annotate
+from ..sink import upsert_rows
+from ..text import text_features
 from ..utils import review_hash
 
 # 예시 프리셋: 각자 컬럼명에 맞게 수정
@@ -12,39 +20,284 @@ PRESETS = {
     "generic":    {"product_url":"product_url","rating":"rating","body":"body","review_date":"review_date"},
 }
 
-def ingest_csv(path: str, source: str, preset: str):
+BATCH_SIZE = 50_000
+CHUNK_BYTES = 32 * 1024 * 1024   # 스트리밍 청크(바이트 구간) 크기
+SCAN_ROWS = 200_000               # date_kind 훑기 청크(행)
+_READ_BLOCK = 1 << 20
+
+def _read_kwargs(m: dict) -> dict:
+    # 텍스트 컬럼은 문자열로 고정: 청크마다 dtype 추론이 달라지면 해시가 흔들림
+    return {"dtype": {m["product_url"]: str, m["body"]: str, m["review_date"]: str}}
+
+# ---------------------- 작성일 해시 입력(기존 적재와 호환) ----------------------
+# 예전 적재기는 dtype 추론으로 파일 전체를 읽고 str(값)을 해시/저장했다. 숫자로 추론되는 작성일 컬럼
+# (20240501, 빈 칸이 섞이면 20240501.0)은 문자열로 읽은 값과 달라지므로, 파일 전체 기준 추론 결과
+# (date_kind)를 구해 같은 문자열로 되돌린다. 모든 컬럼이 숫자인 파일의 행 단위 float 승격은 재현하지 않음.
+_INT = re.compile(r"[+-]?\d+")
+_FLOAT = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?|[+-]?inf(inity)?", re.IGNORECASE)
+_BOOL = {"true": True, "false": False}
+_INT64, _UINT64 = 2 ** 63, 2 ** 64
+DATE_KINDS = ("int", "float", "bool", "str")
+
+def _value_kinds(values: Iterable) -> set:
+    """작성일 값(문자열/NaN)들의 종류 집합: na/int/neg/uint/float/bool/str"""
+    out = set()
+    for v in values:
+        if v is None or v != v:
+            out.add("na")
+            continue
+        t = v.strip()
+        if _INT.fullmatch(t):
+            n = int(t)
+            out.add("int" if -_INT64 <= n < _INT64 else "uint" if 0 <= n < _UINT64 else "str")
+            if n < 0:
+                out.add("neg")
+        elif _FLOAT.fullmatch(t):
+            out.add("float" if math.isfinite(float(t)) or "inf" in t.lower() else "str")
+        else:
+            out.add("bool" if t.lower() in _BOOL else "str")
+    return out
+
+def date_kind(kinds: set) -> str:
+    """값 종류 집합(파일 전체) → pandas 가 파일 전체를 추론했을 때의 컬럼 종류(DATE_KINDS)"""
+    if "str" in kinds:
+        return "str"
+    if "bool" in kinds:
+        return "bool" if kinds <= {"bool", "na"} else "str"
+    if "uint" in kinds and "neg" in kinds:
+        return "str"
+    if kinds & {"float", "na"} or not kinds:
+        return "float"   # 정수 + 빈 칸, 전부 빈 칸 → float64
+    return "int"
+
+def _date_text(v, kind: str) -> str:
+    # 예전 적재기의 str(값)과 같은 문자열
+    if v is None or v != v:
+        return str(v)
+    if kind == "int":
+        return str(int(v.strip()))
+    if kind == "float":
+        return str(float(v.strip()))
+    if kind == "bool":
+        return str(_BOOL[v.strip().lower()])
+    return v
+
+def _column(df: pd.DataFrame, name: str) -> list:
+    # 프리셋 컬럼이 없으면 전부 None (기존 r.get() 동작과 동일)
+    if name in df.columns:
+        return df[name].tolist()
+    return [None] * len(df)
+
+def _none_if_nan(v):
+    return None if v != v else v  # NaN 체크
+
+def _file_time(path: str) -> datetime:
+    # CSV 안의 상대 날짜("3일 전")는 파일을 내보낸 시각(mtime) 기준으로 해석
+    return datetime.fromtimestamp(os.stat(path).st_mtime, timezone.utc)
+
+def _rows_from_frame(df: pd.DataFrame, source: str, m: dict, ref: datetime | None = None,
+                     kind: str = "str") -> list[dict]:
+    """
+    프리셋 매핑 + 해시 + 본문 전처리(text_features) + 감성 점수를 계산해 INSERT 파라미터 목록으로 변환.
+    review_day 는 review_date 를 정규화(상대 날짜는 ref 기준). kind: 파일 전체 기준 작성일 컬럼 종류(date_kind).
+    스트리밍 모드에서는 워커 프로세스에서 실행되므로 전처리 비용도 병렬로 분산된다.
+    """
+    product_urls = _column(df, m["product_url"])
+    bodies = _column(df, m["body"])
+    review_dates = [_date_text(v, kind) for v in _column(df, m["review_date"])]
+    if m["rating"] in df.columns:
+        ratings = pd.to_numeric(df[m["rating"]], errors="coerce").astype(object)
+        ratings = ratings.where(ratings.notna(), None).tolist()
+    else:
+        ratings = [None] * len(df)
+
+    # 해시 입력은 행 단위 경로와 같게 유지 (기존 hash_id 와 중복 판정이 일치해야 함)
+    hashes = [review_hash(source, u, b, d) for u, b, d in zip(product_urls, bodies, review_dates)]
+    days = {d: parse_review_date(d, ref) for d in set(review_dates)}  # 날짜 문자열은 종류가 적음
+    return annotate([
+        {"source": source, "product_url": _none_if_nan(u), "rating": r,
+         "body": _none_if_nan(b), "review_date": d, "review_day": days[d], "hash_id": h,
+         **text_features(_none_if_nan(b))}
+        for u, r, b, d, h in zip(product_urls, ratings, bodies, review_dates, hashes)
+    ])
+
+def ingest_csv(path: str, source: str, preset: str, batch_size: int = BATCH_SIZE):
     m = PRESETS[preset]
-    df = pd.read_csv(path)
+    df = pd.read_csv(path, **_read_kwargs(m))
+    kind = date_kind(_value_kinds(_column(df, m["review_date"])))
+    rows = _rows_from_frame(df, source, m, ref=_file_time(path), kind=kind)
     inserted, dup = 0, 0
     with SessionLocal() as s:
-        for _, r in df.iterrows():
-            product_url = r.get(m["product_url"])
-            rating = r.get(m["rating"])
-            try:
-                rating = float(rating) if rating==rating else None  # NaN 체크
-            except Exception:
-                rating = None
-            body = r.get(m["body"])
-            review_date = str(r.get(m["review_date"]))
-
-            h = review_hash(source, product_url, body, review_date)
-            rv = Review(
-                source=source, product_url=product_url, rating=rating,
-                body=body, review_date=review_date, hash_id=h
-            )
-            try:
-                s.add(rv); s.commit(); inserted += 1
-            except IntegrityError:
-                s.rollback(); dup += 1
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            # 배치당 트랜잭션 1개(= fsync 1회), 실제 삽입 건수는 upsert_rows 의 RETURNING 행 수
+            n = upsert_rows(s, batch)
+            s.commit()
+            inserted += n
+            dup += len(batch) - n
+    print(f"[OK] inserted={inserted}, duplicated={dup}")
+
+# ---------------------- 스트리밍 모드 ----------------------
+def _expand_paths(patterns: List[str]) -> List[str]:
+    out = []
+    for p in patterns:
+        hits = sorted(glob.glob(p, recursive=True)) or [p]
+        out.extend(os.path.abspath(h) for h in hits)
+    return list(dict.fromkeys(out))
+
+def _load_checkpoint(s, path: str, source: str) -> IngestCheckpoint:
+    st = os.stat(path)
+    cp = s.execute(
+        select(IngestCheckpoint).where(IngestCheckpoint.path == path, IngestCheckpoint.source == source)
+    ).scalar_one_or_none()
+    if cp is None:
+        cp = IngestCheckpoint(path=path, source=source, rows_done=0, completed=False)
+        s.add(cp)
+    if cp.file_size != st.st_size or cp.file_mtime != st.st_mtime:
+        # 새 파일이거나 내용이 바뀐 파일: 처음부터 (이미 들어간 행은 hash_id 로 걸러짐)
+        cp.file_size, cp.file_mtime = st.st_size, st.st_mtime
+        cp.rows_done, cp.bytes_done, cp.completed, cp.date_kind = 0, None, False, None
+    s.commit()
+    return cp
+
+def _scan_date_kind(path: str, m: dict, chunk_size: int = SCAN_ROWS) -> str:
+    """
+    스트리밍 모드용 date_kind: 작성일 컬럼만 청크로 훑어 파일 전체 기준 종류를 구함.
+    문자열 값(보통의 2024-05-01 등)이 나오면 바로 끝나므로 숫자 컬럼일 때만 파일을 끝까지 읽는다.
+    """
+    col = m["review_date"]
+    if col not in pd.read_csv(path, nrows=0).columns:
+        return "str"
+    kinds = set()
+    for chunk in pd.read_csv(path, usecols=[col], dtype=str, chunksize=chunk_size):
+        kinds |= _value_kinds(chunk[col].tolist())
+        if "str" in kinds:
+            break
+    return date_kind(kinds)
+
+def _header(path: str) -> bytes:
+    # 헤더 레코드(바이트 구간을 따로 파싱할 때 앞에 붙임)
+    for _, end in _ranges(path, 0, 0):
+        with open(path, "rb") as f:
+            return f.read(end)
+    return b""
+
+def _ranges(path: str, start: int, chunk_bytes: int) -> Iterator[tuple[int, int]]:
+    """
+    start(레코드 경계)부터 파일 끝까지 약 chunk_bytes 크기의 (시작, 끝) 바이트 구간.
+    경계는 따옴표(") 개수가 짝수인 위치의 줄바꿈 바로 뒤 → 여러 줄 따옴표 필드 안에서는 자르지 않음
+    ("" 이스케이프는 짝수라 영향 없음). 파일을 앞에서부터 한 번 훑지만 따옴표/줄바꿈 세기만 한다.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos, lo, quotes = start, start, 0
+        while True:
+            block = f.read(_READ_BLOCK)
+            if not block:
+                break
+            counted = 0
+            i = max(0, lo + chunk_bytes - pos)
+            while i < len(block):
+                j = block.find(b"\n", i)
+                if j < 0:
+                    break
+                quotes += block.count(b'"', counted, j)
+                counted = j
+                if quotes % 2 == 0:
+                    yield lo, pos + j + 1
+                    lo = pos + j + 1
+                    i = max(j + 1, lo + chunk_bytes - pos)
+                else:
+                    i = j + 1
+            quotes += block.count(b'"', counted)
+            pos += len(block)
+        if lo < pos:
+            yield lo, pos
+
+def _parse_range(path: str, header: bytes, start: int, end: int, source: str, m: dict,
+                 ref: datetime, kind: str) -> list[dict]:
+    """워커 프로세스에서 실행: 바이트 구간 읽기 + CSV 파싱 + 매핑·해시·전처리."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(header + data), **_read_kwargs(m))
+    return _rows_from_frame(df, source, m, ref, kind)
+
+def ingest_csv_stream(patterns: List[str], source: str, preset: str,
+                      chunk_bytes: int = CHUNK_BYTES, workers: int | None = None) -> dict:
+    """
+    여러 파일/glob 을 바이트 구간(chunk_bytes) 단위로 적재. 메인 프로세스는 레코드 경계만 찾고,
+    구간 읽기·CSV 파싱·매핑·해시는 워커 프로세스에서, DB 쓰기는 메인(단일 writer)에서 순서대로 수행.
+    청크 INSERT 와 체크포인트(처리한 바이트 위치) 갱신은 같은 트랜잭션 → 중단 후 재실행하면
+    그 위치로 바로 이동해 이어서 적재(앞부분을 다시 읽지 않음).
+    동시에 떠 있는 청크 수를 제한하므로 최대 메모리는 파일 크기와 무관. 반환: {"inserted", "duplicated"}
+    """
+    m = PRESETS[preset]
+    workers = workers or os.cpu_count() or 1
+    inserted, dup = 0, 0
+
+    with SessionLocal() as s, ProcessPoolExecutor(max_workers=workers) as ex:
+        for path in _expand_paths(patterns):
+            if not os.path.exists(path):
+                print(f"[SKIP] not found: {path}")
+                continue
+            cp = _load_checkpoint(s, path, source)
+            if cp.completed:
+                print(f"[SKIP] already ingested: {path}")
+                continue
+            if cp.bytes_done:
+                print(f"[RESUME] {path} from byte {cp.bytes_done} (row {cp.rows_done})")
+            if cp.date_kind is None:
+                cp.date_kind = _scan_date_kind(path, m)   # 재개 시 다시 훑지 않도록 저장
+                s.commit()
+
+            f_ins, f_dup = 0, 0
+            pending = deque()
+            ref = _file_time(path)
+            header = _header(path)
+
+            def _drain(limit: int):
+                nonlocal f_ins, f_dup
+                while len(pending) > limit:
+                    end, fut = pending.popleft()
+                    rows = fut.result()
+                    n = upsert_rows(s, rows)
+                    cp.bytes_done = end
+                    cp.rows_done += len(rows)
+                    s.commit()
+                    f_ins += n
+                    f_dup += len(rows) - n
+
+            for lo, hi in _ranges(path, max(cp.bytes_done or 0, len(header)), chunk_bytes):
+                pending.append((hi, ex.submit(_parse_range, path, header, lo, hi, source, m, ref, cp.date_kind)))
+                _drain(workers)
+            _drain(0)
+
+            cp.completed = True
+            s.commit()
+            print(f"[FILE] {path}: rows={cp.rows_done} inserted={f_ins}, duplicated={f_dup}")
+            inserted += f_ins
+            dup += f_dup
+
     print(f"[OK] inserted={inserted}, duplicated={dup}")
+    return {"inserted": inserted, "duplicated": dup}
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--path", required=True)
+    ap.add_argument("--path", action="append", required=True, help="CSV 경로 또는 glob (반복 가능)")
     ap.add_argument("--source", required=True, help="예: smartstore/todayhouse/partner 등")
     ap.add_argument("--preset", choices=list(PRESETS.keys()), default="generic")
+    ap.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    ap.add_argument("--stream", action="store_true", help="청크 단위 스트리밍 적재(대용량/다중 파일, 재개 가능)")
+    ap.add_argument("--chunk-mb", type=float, default=CHUNK_BYTES / 2 ** 20, help="스트리밍 청크 크기(MiB)")
+    ap.add_argument("--workers", type=int, default=None, help="파싱/해시 프로세스 수(기본: CPU 코어 수)")
     args = ap.parse_args()
-    ingest_csv(args.path, args.source, args.preset)
+    if args.stream:
+        ingest_csv_stream(args.path, args.source, args.preset,
+                          chunk_bytes=int(args.chunk_mb * 2 ** 20), workers=args.workers)
+    else:
+        for path in _expand_paths(args.path):
+            ingest_csv(path, args.source, args.preset, batch_size=args.batch_size)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
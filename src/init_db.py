@@ -1,6 +1,69 @@
+from sqlalchemy import inspect, text
+
 from .db import engine, Base
 from . import models  # noqa: F401  # 테이블 로딩
 
+def migrate(bind=engine) -> list[str]:
+    """
+    create_all + 기존 테이블에 빠진 컬럼/인덱스 추가(ALTER TABLE ADD COLUMN, 전부 NULL 허용).
+    이미 만들어진 DB 에 새 버전 모델을 반영할 때 사용. 반환: 추가한 항목 목록
+    """
+    Base.metadata.create_all(bind)
+    added = []
+    insp = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            have = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in have:
+                    continue
+                ddl = col.type.compile(dialect=bind.dialect)
+                for fk in col.foreign_keys:
+                    ddl += f" REFERENCES {fk.column.table.name}({fk.column.name})"
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {col.name} {ddl}'))
+                added.append(f"{table.name}.{col.name}")
+    for table in Base.metadata.sorted_tables:
+        for idx in table.indexes:
+            idx.create(bind, checkfirst=True)
+    if bind.dialect.name == "sqlite" and ensure_fts(bind):
+        added.append(FTS_TABLE)
+    return added
+
+# ---------------------- 전문 검색(SQLite FTS5) ----------------------
+FTS_TABLE = "reviews_fts"
+# 외부 콘텐츠 테이블(본문은 reviews 에만 저장) + 2/3글자 접두 색인(한국어 어간 접두 검색용)
+FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        body, content='reviews', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON reviews BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON reviews BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF body ON reviews BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body);
+    END""",
+]
+
+def ensure_fts(bind=engine, rebuild: bool = False) -> bool:
+    """
+    reviews 본문 FTS5 색인 + 동기화 트리거(모든 쓰기 경로에 적용). 새로 만들었으면 기존 행으로 채우고 True.
+    rebuild=True 면 색인을 reviews 에서 다시 만든다.
+    """
+    with bind.begin() as conn:
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"),
+                              {"n": FTS_TABLE}).first() is not None
+        if not exists:
+            conn.execute(text(FTS_DDL[0]))
+        for ddl in FTS_DDL[1:]:
+            conn.execute(text(ddl))
+        if rebuild or not exists:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    return not exists
+
 if __name__ == "__main__":
-    Base.metadata.create_all(engine)
-    print("[OK] SQLite tables created.")
\ No newline at end of file
+    added = migrate()
+    print("[OK] SQLite tables created." + (f" added: {', '.join(added)}" if added else ""))
@@ -1,88 +1,277 @@
 # src/insights.py
-import re
-from typing import List, Dict
-from sqlalchemy import select, desc
-from sklearn.feature_extraction.text import CountVectorizer
-
-from .db import SessionLocal
-from .models import Review
-
-# 한국어/일반 리뷰에서 자주 등장하는 의미 없는 단어들(필요시 계속 추가)
-STOPWORDS = {
-    "그리고","하지만","해서","해서요","정말","진짜","너무","조금","약간","그냥","아주","매우","많이",
-    "제품","상품","구매","사용","리뷰","후기","평가","배송","포장","판매자","구매자","가격","사진",
-    "같아요","같습니다","듯","부분","정도","이번","이것","저것","그것","거","것","때","보고","보고싶",
-    "좋아요","괜찮아요","추천","비추","만족","불만","최고","최악","문의","답변","설명","상세",
-}
-
-PAIN_KEYWORDS = {
-    "가격":        ["가격","가성비","비싸","비용","할인","쿠폰"],
-    "배송/포장":   ["배송","포장","파손","늦","지연","빠르","택배"],
-    "색상/이미지": ["색상","색깔","컬러","사진","이미지","화면","실물","색감"],
-    "사이즈/규격": ["사이즈","크기","규격","높이","폭","길이","두께","맞지"],
-    "내구성/품질": ["내구","튼튼","약함","헐겁","부러","스크래치","하자","불량","휘어","찍힘"],
-    "설치/조립":   ["설치","조립","설명서","드라이버","피스","구멍","수평","볼트","나사"],
-    "냄새/소음":   ["냄새","향","소음","삐걱","삑","소리"],
-    "착석감/사용감":["편하","불편","앉았","쿠션","등받이","허리","딱딱","푹신"],
-}
-
-TOKEN_PATTERN = r"(?u)[가-힣A-Za-z]{2,}"  # 한글/영문 2자 이상 토큰
-
-def _normalize(text: str) -> str:
-    if not text:
-        return ""
-    t = text.replace("\n"," ").strip()
-    t = re.sub(r"[^가-힣A-Za-z0-9\s]", " ", t)
-    t = re.sub(r"\s+", " ", t)
-    return t
-
-def _fetch_texts(limit: int = 1000, source: str | None = None) -> List[str]:
-    with SessionLocal() as s:
-        stmt = select(Review.body).where(Review.body.is_not(None))
+from collections import Counter
+from typing import Callable, List, Dict, Tuple
+import numpy as np
+from sqlalchemy import Integer, case, cast, select, desc, func
+
+from .cache import LRUCache, since_commit
+from .config import INSIGHTS_CACHE_SIZE, SNAPSHOT_DIR
+from .compare import compare_products
+from .cooccurrence import compute_cooccurrence
+from .db import ReadSession, SessionLocal
+from .models import DataVersion, Review
+from .sentiment import LABELS as SENTIMENT_LABELS
+from .text import PAIN_MATCHER, doc_tokens
+from .snapshot import SnapshotMissing, load_manifest, snapshot_docs, snapshot_sentiment
+from .trends import compute_trends
+from . import term_index
+
+def _fetch_docs(limit: int = 1000, source: str | None = None) -> List[Tuple[List[str], int]]:
+    """
+    최근 limit 건의 (토큰, 불만 마스크). 저장된 전처리 결과를 읽고, 백필 전 행만 본문에서 계산.
+    빈 본문은 LIMIT 전에 SQL 에서 제외 → 창의 문서 수가 용어 색인의 docs 와 같은 기준(_index_covers).
+    """
+    with ReadSession() as s:
+        stmt = (select(Review.body, Review.tokens, Review.pain_mask, Review.text_ver)
+                .where(Review.body.is_not(None), Review.body != "", Review.dup_of.is_(None)))
         if source:
             stmt = stmt.where(Review.source == source)
         stmt = stmt.order_by(desc(Review.id)).limit(limit)
         rows = s.execute(stmt).all()
-    return [r[0] for r in rows if r and r[0]]
+    return [doc_tokens(*r) for r in rows]
 
-def _top_ngrams(texts: List[str], ngram=(1,1), topk=15, min_df=2):
-    if not texts:
+def _top_k(tf: Counter, df: Counter, topk=15, min_df=2) -> List[Dict]:
+    """
+    df >= min_df 인 항목 중 tf 상위 topk. argpartition 으로 후보만 고른 뒤 정렬
+    (동률은 term 내림차순 = 정렬된 어휘에 대한 역순 argsort 와 같은 순서).
+    """
+    terms = [t for t, d in df.items() if d >= min_df]
+    if not terms or topk <= 0:
         return []
-    docs = [_normalize(t) for t in texts]
-    vec = CountVectorizer(
-        token_pattern=TOKEN_PATTERN,
-        stop_words=STOPWORDS,
-        min_df=min_df,
-        ngram_range=ngram
-    )
-    X = vec.fit_transform(docs)
-    vocab = vec.get_feature_names_out()
-    counts = X.sum(axis=0).A1
-    order = counts.argsort()[::-1][:topk]
-    return [{"term": vocab[i], "freq": int(counts[i])} for i in order]
-
-def _pain_point_counts(texts: List[str]):
-    out = []
-    for label, kws in PAIN_KEYWORDS.items():
-        pat = re.compile("|".join([re.escape(k) for k in kws]))
-        c = sum(1 for t in texts if t and pat.search(t))
-        if c > 0:
-            out.append({"label": label, "count": c})
-    out.sort(key=lambda x: x["count"], reverse=True)
-    return out
+    freqs = np.fromiter((tf[t] for t in terms), dtype=np.int64, count=len(terms))
+    if topk < len(terms):
+        cand = np.argpartition(-freqs, topk - 1)[:topk]
+        idx = np.flatnonzero(freqs >= freqs[cand].min())  # 경계 동률까지 포함
+    else:
+        idx = np.arange(len(terms))
+    order = sorted(idx.tolist(), key=lambda i: terms[i], reverse=True)
+    order.sort(key=lambda i: freqs[i], reverse=True)
+    return [{"term": terms[i], "freq": int(freqs[i])} for i in order[:topk]]
+
+def _analyze(texts: List[str], topk=15, min_df=2) -> Dict:
+    """
+    텍스트당 정규화/토큰화 1회로 단어·바이그램 빈도와 불만 라벨을 함께 집계.
+    결과는 CountVectorizer(1,1)/(2,2) 두 번 + 라벨별 정규식 검색과 같다.
+    """
+    return _analyze_docs([doc_tokens(t) for t in texts], topk=topk, min_df=min_df)
 
-def compute_insights(limit=1000, source: str | None = None, topk=15, min_df=2) -> Dict:
-    texts = _fetch_texts(limit=limit, source=source)
-    if not texts:
-        return {"total": 0, "top_terms": [], "top_bigrams": [], "pain_points": []}
+def _analyze_docs(docs: List[Tuple[List[str], int]], topk=15, min_df=2) -> Dict:
+    # docs: 문서별 (토큰, 불만 마스크) — 정규식 작업 없이 집계만
+    uni_tf, uni_df, bi_tf, bi_df = Counter(), Counter(), Counter(), Counter()
+    pain_masks = Counter()
+    # 색인(term_index.TERM_MAX_LEN)과 같은 상한: 너무 긴 용어는 어느 경로에서도 세지 않음.
+    # 토큰이 모두 (cap-1)//2 이하면 바이그램도 cap 이하라 거를 것이 없음
+    cap = term_index.TERM_MAX_LEN
+    for toks, mask in docs:
+        bg = list(map(" ".join, zip(toks, toks[1:])))
+        if toks and max(map(len, toks)) > (cap - 1) // 2:
+            toks = [t for t in toks if len(t) <= cap]
+            bg = [b for b in bg if len(b) <= cap]
+        uni_tf.update(toks); uni_df.update(set(toks))
+        bi_tf.update(bg); bi_df.update(set(bg))
+        pain_masks[mask] += 1
 
-    top_terms   = _top_ngrams(texts, ngram=(1,1), topk=topk, min_df=min_df)
-    top_bigrams = _top_ngrams(texts, ngram=(2,2), topk=topk, min_df=min_df)
-    pains       = _pain_point_counts(texts)
+    pain_counts = Counter()
+    for mask, n in pain_masks.items():
+        for label in PAIN_MATCHER.labels(mask):
+            pain_counts[label] += n
+    pains = [{"label": label, "count": pain_counts[label]}
+             for label in PAIN_MATCHER.order if pain_counts[label] > 0]
+    pains.sort(key=lambda x: x["count"], reverse=True)
 
     return {
-        "total": len(texts),
-        "top_terms": top_terms,
-        "top_bigrams": top_bigrams,
+        "total": len(docs),
+        "top_terms": _top_k(uni_tf, uni_df, topk=topk, min_df=min_df),
+        "top_bigrams": _top_k(bi_tf, bi_df, topk=topk, min_df=min_df),
         "pain_points": pains,
-    }
\ No newline at end of file
+    }
+
+def _sentiment_summary(limit: int | None = 1000, source: str | None = None, bins: int = 10) -> Dict:
+    """
+    저장된 감성 라벨 분포(건수/비율/평균 점수) + 점수 히스토그램([-1,1] 을 bins 구간).
+    limit=None 이면 소스 전체, 아니면 텍스트 분석과 같은 최근 limit 건 창.
+    """
+    with ReadSession() as s:
+        base = (select(Review.sentiment.label("score"), Review.sentiment_label.label("label"))
+                .where(Review.body.is_not(None), Review.body != "", Review.dup_of.is_(None)))
+        if source:
+            base = base.where(Review.source == source)
+        if limit is not None:
+            base = base.order_by(desc(Review.id)).limit(limit)
+        sub = base.subquery()
+        by_label = s.execute(
+            select(sub.c.label, func.count(), func.sum(sub.c.score)).group_by(sub.c.label)
+        ).all()
+        bucket = case((sub.c.score >= 1, bins - 1), else_=cast((sub.c.score + 1) * (bins / 2), Integer))
+        hist = dict(s.execute(
+            select(bucket, func.count()).where(sub.c.score.is_not(None)).group_by(bucket)
+        ).all())
+
+    return sentiment_dict(by_label, hist, bins)
+
+def sentiment_dict(by_label, hist: Dict[int, int], bins: int = 10) -> Dict:
+    """(라벨, 건수, 점수 합) 목록 + {구간 번호: 건수} → 응답 형태(DB/스냅샷 공용)."""
+    counts = {label: 0 for label in SENTIMENT_LABELS}
+    unscored, total, score_sum = 0, 0, 0.0
+    for label, n, ssum in by_label:
+        if label is None:
+            unscored += n
+            continue
+        counts[label] = counts.get(label, 0) + n
+        total += n
+        score_sum += ssum or 0.0
+    width = 2 / bins
+    return {
+        "counts": counts,
+        "share": {k: round(v / total, 4) if total else 0.0 for k, v in counts.items()},
+        "mean_score": round(score_sum / total, 4) if total else None,
+        "unscored": unscored,
+        "histogram": [{"from": round(-1 + i * width, 2), "to": round(-1 + (i + 1) * width, 2),
+                       "count": int(hist.get(i, 0))} for i in range(bins)],
+    }
+
+def _max_review_id(source: str | None = None) -> int:
+    with SessionLocal() as s:
+        stmt = select(func.max(Review.id))
+        if source:
+            stmt = stmt.where(Review.source == source)
+        return s.execute(stmt).scalar() or 0
+
+def _index_covers(limit: int, source: str | None = None) -> bool:
+    """
+    limit 창이 소스 전체를 덮고 용어 색인이 최신(max id 반영)이면 색인으로 답해도 결과가 같다.
+    docs 는 빈 본문/유사 중복을 뺀 문서 수 — _fetch_docs 도 같은 행을 LIMIT 전에 걸러 창 크기가 일치.
+    """
+    st = term_index.index_status(source)
+    return st["docs"] > 0 and limit >= st["docs"] and st["max_review_id"] >= _max_review_id(source)
+
+def _insights_from_index(source: str | None = None, topk=15, min_df=2) -> Dict:
+    # 어휘 크기에 비례하는 조회만 수행(리뷰 본문을 읽지 않음)
+    total = term_index.index_status(source)["docs"]
+    if not total:
+        return {"total": 0, "top_terms": [], "top_bigrams": [], "pain_points": [], "sentiment": None}
+    return {
+        "total": total,
+        "top_terms": term_index.top_terms("uni", source=source, topk=topk, min_df=min_df),
+        "top_bigrams": term_index.top_terms("bi", source=source, topk=topk, min_df=min_df),
+        "pain_points": term_index.pain_point_counts(source=source),
+        "sentiment": _sentiment_summary(limit=None, source=source),
+    }
+
+def _insights_from_snapshot(root: str, limit: int | None, source: str | None = None, topk=15, min_df=2) -> Dict:
+    # Parquet 스냅샷의 토큰/불만 마스크/감성 열만 읽음(DB 조회 없음). 스냅샷 시점(last_id)까지의 데이터
+    # 내보낸 적이 없으면 빈 결과("리뷰 0건")가 아니라 SnapshotMissing
+    manifest = load_manifest(root)
+    if manifest is None:
+        raise SnapshotMissing(root)
+    docs = snapshot_docs(limit, source, root)
+    if not docs:
+        out = {"total": 0, "top_terms": [], "top_bigrams": [], "pain_points": [], "sentiment": None}
+    else:
+        out = _analyze_docs(docs, topk=topk, min_df=min_df)
+        out["sentiment"] = sentiment_dict(*snapshot_sentiment(limit, source, root=root))
+    out["snapshot"] = {"last_id": manifest["last_id"], "exported_at": manifest["exported_at"]}
+    return out
+
+def compute_insights(limit=1000, source: str | None = None, topk=15, min_df=2,
+                     use_index: bool | None = None, snapshot: str | None = None,
+                     progress: Callable[[str], None] | None = None) -> Dict:
+    """
+    use_index: None 이면 자동(창이 소스 전체를 덮을 때 term_stats 색인 사용), True 면 강제.
+    snapshot: Parquet 스냅샷 디렉터리(src.snapshot)를 주면 DB 대신 스냅샷에서 창을 읽음(limit=None 이면 전체).
+    progress: 단계 이름("snapshot"/"index"/"fetch"/"analyze"/"sentiment")을 받는 콜백(백그라운드 작업 진행 표시용)
+    """
+    step = progress or (lambda stage: None)
+    if snapshot:
+        step("snapshot")
+        return _insights_from_snapshot(snapshot, limit, source=source, topk=topk, min_df=min_df)
+    if use_index is None:
+        use_index = _index_covers(limit, source)
+    if use_index:
+        step("index")
+        return _insights_from_index(source=source, topk=topk, min_df=min_df)
+
+    step("fetch")
+    docs = _fetch_docs(limit=limit, source=source)
+    if not docs:
+        return {"total": 0, "top_terms": [], "top_bigrams": [], "pain_points": [], "sentiment": None}
+    step("analyze")
+    out = _analyze_docs(docs, topk=topk, min_df=min_df)
+    step("sentiment")
+    out["sentiment"] = _sentiment_summary(limit=limit, source=source)
+    return out
+
+# ---------------------- 결과 캐시 ----------------------
+_cache = LRUCache(maxsize=INSIGHTS_CACHE_SIZE)
+
+def result_version(source: str | None = None, snapshot: str | None = None):
+    """
+    분석 결과의 데이터 버전(캐시 키, 백그라운드 작업 합치기 키 공용).
+    DB: (소스별 max id, 영속 쓰기 카운터). 어느 프로세스든 리뷰를 바꾸는 쓰기(삽입/삭제/재채점/재판정/백필)가
+    커밋되면 값이 바뀌어 캐시가 자연 무효화. 두 값을 한 문장(인덱스 조회)으로 읽고, SQLite 는 마지막
+    커밋 이후 바뀐 게 없으면 그마저 생략(cache.since_commit).
+    snapshot 디렉터리를 주면 DB 가 아니라 스냅샷 내보내기 시각.
+    """
+    if snapshot:
+        manifest = load_manifest(snapshot)
+        return manifest and manifest["exported_at"]
+    return since_commit(("result_version", source), lambda: _db_version(source))
+
+def _db_version(source: str | None = None):
+    mx = select(func.max(Review.id))
+    if source:
+        mx = mx.where(Review.source == source)
+    with SessionLocal() as s:
+        max_id, ver = s.execute(select(mx.scalar_subquery(),
+                                       select(func.sum(DataVersion.version)).scalar_subquery())).one()
+    return (max_id or 0, ver or 0)
+
+def cached_insights(limit=1000, source: str | None = None, topk=15, min_df=2, snapshot: bool = False) -> Dict:
+    if snapshot:
+        # 스냅샷 모드는 DB 가 아니라 스냅샷 내보내기 시각으로 무효화
+        key = ("snap", limit, source, topk, min_df, result_version(snapshot=SNAPSHOT_DIR))
+    else:
+        key = (limit, source, topk, min_df, result_version(source))
+    out = _cache.get(key)
+    if out is None:
+        out = compute_insights(limit=limit, source=source, topk=topk, min_df=min_df,
+                               snapshot=SNAPSHOT_DIR if snapshot else None)
+        _cache.put(key, out)
+    return out
+
+def cached_cooccurrence(limit=5000, source: str | None = None, topk=30, min_count=5,
+                        metric="pmi", max_vocab=2000) -> Dict:
+    # 같은 LRU 를 공유(키 앞에 종류 구분), 무효화 규칙도 cached_insights 와 동일
+    key = ("cooc", limit, source, topk, min_count, metric, max_vocab, result_version(source))
+    out = _cache.get(key)
+    if out is None:
+        out = compute_cooccurrence(limit=limit, source=source, topk=topk, min_count=min_count,
+                                   metric=metric, max_vocab=max_vocab)
+        _cache.put(key, out)
+    return out
+
+def cached_compare(product_urls: List[str] | None = None, source: str | None = None,
+                   limit: int | None = 1000, topk=10, min_df=2, max_products=50,
+                   product_ids: List[int] | None = None) -> Dict:
+    # 상품 목록 비교는 source 를 모를 수 있어 전체 기준 버전(max id)으로 무효화
+    key = ("compare", tuple(product_ids or ()), tuple(product_urls or ()), source, limit, topk, min_df,
+           max_products, result_version(source))
+    out = _cache.get(key)
+    if out is None:
+        out = compare_products(product_urls=product_urls, source=source, limit=limit, topk=topk,
+                               min_df=min_df, max_products=max_products, product_ids=product_ids)
+        _cache.put(key, out)
+    return out
+
+def cached_trends(product_id: int | None = None, source: str | None = None, start=None, end=None,
+                  bucket="week", topk=5) -> Dict:
+    key = ("trends", product_id, source, start, end, bucket, topk, result_version(source))
+    out = _cache.get(key)
+    if out is None:
+        out = compute_trends(product_id=product_id, source=source, start=start, end=end,
+                             bucket=bucket, topk=topk)
+        _cache.put(key, out)
+    return out
+
+def cache_stats() -> Dict:
+    return _cache.stats()
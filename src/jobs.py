@@ -0,0 +1,172 @@
+# src/jobs.py
+"""
+무거운 분석 요청의 백그라운드 실행. Flask 요청 스레드에서 수 초씩 벡터화를 돌리지 않도록
+요청은 작업 id 만 바로 돌려받고, 계산은 크기가 정해진 프로세스 풀(JOB_WORKERS)에서 수행한다.
+
+- 같은 (종류, 파라미터, 데이터 버전) 요청은 대기/실행 중이거나 결과가 남아 있는 작업 하나로 합침
+- 대기+실행 중 작업이 JOB_MAX_PENDING 을 넘으면 JobQueueFull(→ 429)
+- 끝난 작업 결과는 JOB_RESULT_TTL 초 동안 보관 후 삭제(작은 결과 저장소)
+- 진행 단계는 작업 프로세스가 공유 dict(multiprocessing.Manager)에 기록
+"""
+import atexit, json, multiprocessing, threading, time, uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict
+
+from .config import JOB_MAX_PENDING, JOB_RESULT_TTL, JOB_WORKERS
+from .insights import result_version
+
+KINDS = ("insights", "cooccurrence", "compare", "trends")
+
+_lock = threading.Lock()
+_jobs: Dict[str, Dict] = {}      # job id -> 상태/결과
+_by_key: Dict[str, str] = {}     # 합치기 키 -> job id
+_pool: ProcessPoolExecutor | None = None
+_manager = None
+_progress = None                 # Manager().dict(): job id -> 단계
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+# ---------------------- 작업 프로세스 ----------------------
+def _run(kind: str, params: Dict, job_id: str, progress) -> Dict:
+    from . import insights   # 작업 프로세스(spawn)에서 처음 불릴 때 로딩
+
+    def step(stage: str):
+        try:
+            progress[job_id] = stage
+        except Exception:  # 부모가 먼저 종료된 경우 등 — 진행 표시는 부가 기능
+            pass
+
+    step("running")
+    if kind == "insights":
+        return insights.compute_insights(**params, progress=step)
+    fn = {"cooccurrence": insights.compute_cooccurrence, "compare": insights.compare_products,
+          "trends": insights.compute_trends}[kind]
+    return fn(**params)
+
+
+# ---------------------- 부모(API) 프로세스 ----------------------
+def _ensure_pool() -> ProcessPoolExecutor:
+    # spawn: 부모의 DB 연결/스레드 상태를 복제하지 않음. 풀은 처음 제출할 때 만든다
+    global _pool, _manager, _progress
+    if _pool is None:
+        ctx = multiprocessing.get_context("spawn")
+        _manager = ctx.Manager()
+        _progress = _manager.dict()
+        _pool = ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=ctx)
+    return _pool
+
+
+def _reset_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+
+
+def _purge(now: float):
+    for jid in [j for j, job in _jobs.items() if job["finished_at"] and now - job["finished_at"] > JOB_RESULT_TTL]:
+        job = _jobs.pop(jid)
+        if _by_key.get(job["key"]) == jid:
+            del _by_key[job["key"]]
+
+
+def _finish(job_id: str, fut: Future):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        job["finished_at"] = time.time()
+        try:
+            job["result"] = fut.result()
+            job["status"] = "done"
+        except BrokenProcessPool:
+            job["status"], job["error"] = "error", "worker process died"
+            _reset_pool()
+        except Exception as e:
+            job["status"], job["error"] = "error", f"{type(e).__name__}: {e}"
+        if job["status"] == "error" and _by_key.get(job["key"]) == job_id:
+            del _by_key[job["key"]]   # 실패한 작업은 합치지 않음(다시 요청하면 새로 실행)
+        try:
+            _progress.pop(job_id, None)
+        except Exception:
+            pass
+
+
+def submit(kind: str, params: Dict) -> Dict:
+    """
+    작업 제출(또는 같은 요청과 합치기). params 는 해당 compute_* 함수의 키워드 인자.
+    데이터가 바뀐 뒤의 요청은 이전 작업과 합치지 않음. 반환: status() 형태(result 제외).
+    """
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of {KINDS}")
+    version = result_version(params.get("source"), params.get("snapshot"))   # 결과 캐시와 같은 무효화 기준
+    key = json.dumps([kind, params, version], sort_keys=True, default=str)
+    now = time.time()
+    with _lock:
+        _purge(now)
+        jid = _by_key.get(key)
+        if jid is not None:
+            job = _jobs[jid]
+            job["merged"] += 1
+            return _view(job)
+        if sum(1 for j in _jobs.values() if j["finished_at"] is None) >= JOB_MAX_PENDING:
+            raise JobQueueFull(f"too many pending jobs (max {JOB_MAX_PENDING})")
+        jid = uuid.uuid4().hex
+        job = _jobs[jid] = {"id": jid, "kind": kind, "params": params, "key": key, "status": "queued",
+                            "created_at": now, "finished_at": None, "merged": 0, "result": None, "error": None}
+        _by_key[key] = jid
+        try:
+            fut = _ensure_pool().submit(_run, kind, params, jid, _progress)
+        except BrokenProcessPool:
+            _reset_pool()
+            fut = _ensure_pool().submit(_run, kind, params, jid, _progress)
+    fut.add_done_callback(lambda f: _finish(jid, f))
+    with _lock:
+        return _view(_jobs[jid])
+
+
+def _view(job: Dict, with_result: bool = False) -> Dict:
+    status = job["status"]
+    stage = None
+    if status == "queued":
+        try:
+            stage = _progress.get(job["id"])
+        except Exception:
+            stage = None
+        if stage:
+            status = "running"
+    end = job["finished_at"] or time.time()
+    out = {"job_id": job["id"], "kind": job["kind"], "status": status, "stage": stage,
+           "elapsed": round(end - job["created_at"], 3), "merged": job["merged"], "error": job["error"]}
+    if with_result and job["status"] == "done":
+        out["result"] = job["result"]
+    return out
+
+
+def status(job_id: str) -> Dict | None:
+    """작업 상태(끝났으면 result 포함). 모르는/만료된 id 면 None."""
+    with _lock:
+        _purge(time.time())
+        job = _jobs.get(job_id)
+        return _view(job, with_result=True) if job else None
+
+
+def stats() -> Dict:
+    with _lock:
+        by = {}
+        for j in _jobs.values():
+            by[j["status"]] = by.get(j["status"], 0) + 1
+        return {"workers": JOB_WORKERS, "max_pending": JOB_MAX_PENDING, "ttl": JOB_RESULT_TTL,
+                "jobs": by, "pool_started": _pool is not None}
+
+
+@atexit.register
+def _shutdown():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    if _manager is not None:
+        _manager.shutdown()
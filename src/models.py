@@ -1,21 +1,149 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, String, Float, Text, Date, DateTime, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from .db import Base
 
+class Product(Base):
+    """
+    상품 차원 테이블. 리뷰는 긴 URL 대신 정수 product_id 로 참조.
+    """
+    __tablename__ = "products"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(Text, nullable=False)            # 정규화 URL(utils.canonical_url)
+    source = Column(String(50))                   # 처음 본 채널
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('url', name='uq_product_url'),
+    )
+
 class Review(Base):
     __tablename__ = "reviews"
 
     id = Column(Integer, primary_key=True)
     source = Column(String(50), nullable=False)
-    product_url = Column(Text)
+    product_id = Column(Integer, ForeignKey("products.id"))
+    product_url = Column(Text)                    # 레거시: products 이전 전 행만(src.products --backfill 후 NULL)
     rating = Column(Float)
     body = Column(Text)
     review_date = Column(String(32))              # 원문 날짜 문자열
+    review_day = Column(Date)                     # 정규화 날짜(상대 날짜는 수집 시각 기준, src.dates)
     hash_id = Column(String(64), nullable=False)  # 중복 방지용 해시
+    # INSERT 시 함께 저장하는 전처리 결과(text.text_features). 분석은 정규식 대신 이 값을 읽음
+    body_norm = Column(Text)                      # normalize(body)
+    tokens = Column(Text)                         # 불용어 제거 토큰(공백 구분)
+    pain_mask = Column(Integer)                   # PAIN_KEYWORDS 라벨 비트마스크
+    text_ver = Column(Integer)                    # 전처리 규칙 버전(text.TEXT_VERSION)
+    sentiment = Column(Float)                     # 감성 점수 [-1, 1] (src.sentiment)
+    sentiment_label = Column(String(8))           # positive / neutral / negative
+    dup_of = Column(Integer, ForeignKey("reviews.id"))  # 유사 중복이면 원본 리뷰 id(src.neardup), 분석에서 제외
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     __table_args__ = (
         UniqueConstraint('hash_id', name='uq_review_hash'),
         Index('idx_reviews_source_id', 'source', 'id'),
         Index('idx_reviews_created_at', 'created_at'),
-    )
\ No newline at end of file
+        Index('idx_reviews_source_sentiment', 'source', 'sentiment_label'),
+        Index('idx_reviews_product_created', 'product_id', 'created_at'),
+        Index('idx_reviews_product_id_day', 'product_id', 'review_day'),
+        Index('idx_reviews_product_id_id', 'product_id', 'id'),           # 상품별 키셋 페이지
+        Index('idx_reviews_source_day', 'source', 'review_day'),
+    )
+
+class ReviewBand(Base):
+    """
+    유사 중복 탐지용 MinHash LSH 밴드 색인(src.neardup). 원본(dup_of 없음) 리뷰만 등록.
+    (band, key) 가 같으면 후보 → 본문 shingle Jaccard 로 확인.
+    """
+    __tablename__ = "review_bands"
+
+    band = Column(SmallInteger, primary_key=True)
+    key = Column(BigInteger, primary_key=True)       # 밴드 안 MinHash 값들 + product_id 를 섞은 해시
+    review_id = Column(Integer, ForeignKey("reviews.id"), primary_key=True)
+
+    __table_args__ = (
+        {"sqlite_with_rowid": False},
+    )
+
+class IngestCheckpoint(Base):
+    """
+    스트리밍 CSV 적재 진행 위치(파일별 처리 완료 바이트 위치/행 수). 중단 후 재실행 시 그 위치부터 이어서 적재.
+    """
+    __tablename__ = "ingest_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    path = Column(Text, nullable=False)           # 절대 경로
+    source = Column(String(50), nullable=False)
+    file_size = Column(Integer)                   # 파일이 바뀌면 처음부터 다시
+    file_mtime = Column(Float)
+    rows_done = Column(Integer, nullable=False, default=0)
+    bytes_done = Column(BigInteger)               # 적재를 끝낸 마지막 청크의 끝(레코드 경계) 바이트 위치
+    date_kind = Column(String(8))                 # 작성일 컬럼의 파일 전체 기준 dtype(해시 입력 호환, csv_to_sqlite.date_kind)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('path', 'source', name='uq_ingest_checkpoint'),
+    )
+
+
+class CrawlState(Base):
+    """
+    상품별 증분 수집 high-water mark. 다음 수집은 여기(또는 이미 저장된 리뷰)에 닿으면 페이징 중단.
+    """
+    __tablename__ = "crawl_state"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String(50), nullable=False)
+    product_url = Column(Text, nullable=False)
+    last_hash_id = Column(String(64))             # 가장 최근 수집 시 최신 리뷰의 hash_id
+    last_review_date = Column(String(32))         # 지금까지 본 가장 최근 작성일(YYYY-MM-DD)
+    pages_last_run = Column(Integer)
+    # 최신순 목록을 끝(또는 이미 완결된 구간)까지 이어서 봤는지. False 면 다음 수집은 조기 종료하지 않고
+    # backfill_before(끝나지 않은 수집이 본 가장 오래된 작성일)보다 오래된 저장 리뷰에 닿을 때까지 진행
+    complete = Column(Boolean)                    # NULL: 이 컬럼 이전에 만든 상태(완결로 간주)
+    backfill_before = Column(String(32))
+    last_crawled_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('source', 'product_url', name='uq_crawl_state_product'),
+    )
+
+
+class TermStat(Base):
+    """
+    소스별 용어 색인: 단어(uni)/바이그램(bi)/불만 라벨(pain) 의 전체 등장 수(tf)와 문서 수(df).
+    리뷰 삽입·삭제 시 증분 갱신, src.term_index --rebuild 로 재구축.
+    """
+    __tablename__ = "term_stats"
+
+    source = Column(String(50), primary_key=True)
+    kind = Column(String(8), primary_key=True)    # uni / bi / pain
+    term = Column(String(200), primary_key=True)
+    tf = Column(Integer, nullable=False, default=0)
+    df = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('idx_term_stats_rank', 'source', 'kind', 'tf'),
+    )
+
+
+class TermIndexSource(Base):
+    """소스별 색인 문서 수와 반영된 최대 리뷰 id(색인 최신 여부 판단)."""
+    __tablename__ = "term_index_sources"
+
+    source = Column(String(50), primary_key=True)
+    docs = Column(Integer, nullable=False, default=0)
+    max_review_id = Column(Integer)
+
+
+class DataVersion(Base):
+    """
+    리뷰 데이터 쓰기 카운터(샤드 행 id=1..cache.SHARDS, 값은 합). 분석 결과에 영향을 주는 모든 쓰기
+    (삽입/삭제/재채점/재판정/백필)가 같은 트랜잭션에서 자기 샤드 +1 → 다른 프로세스의 쓰기도 분석 캐시 키
+    (cache.data_version)로 감지.
+    """
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
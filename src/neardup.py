@@ -0,0 +1,247 @@
+# src/neardup.py
+"""
+유사 중복 리뷰 탐지(MinHash + LSH). hash_id 는 본문/날짜가 한 글자만 달라도 다른 리뷰로 보므로
+공백·이모지·문장부호 차이, 상대 날짜("3일 전" vs "4일 전")만 다른 재수집 리뷰가 다시 저장되어
+단어 빈도를 왜곡한다.
+
+- 정규화: 소문자 + 글자/숫자만 남김(공백·이모지·문장부호 제거) → 글자 3-gram shingle
+- 서명: NUM_PERM 개 해시 (a·h + b) mod p 의 최솟값. 배치 전체를 numpy 로 한 번에 계산
+- LSH: BANDS × ROWS 로 나눈 밴드마다 (MinHash 값들 + product_id) 해시 키를 review_bands 에 저장
+  → 새 리뷰는 밴드 키 조회(인덱스)로 같은 상품의 후보만 찾고, 후보는 실제 Jaccard 로 확인
+- 원본 = 먼저 저장된 리뷰. 유사 중복은 dup_of 로 원본을 가리키고 분석(인사이트/색인/추세)에서 제외
+  (NEAR_DUP_MODE=skip 이면 저장하지 않음)
+- 짧은 리뷰(MIN_CHARS 미만, "좋아요" 등)는 서로 다른 사람이 같은 문장을 쓰므로 검사하지 않음
+
+예) python -m src.neardup --recluster     # 기존 코퍼스 전체 재판정 + 밴드 색인/용어 색인 재구축
+"""
+import argparse, re
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, select, update
+
+from .cache import bump_data_version
+from .config import NEAR_DUP_THRESHOLD
+from .db import SessionLocal
+from .init_db import migrate
+from .models import Review, ReviewBand
+from .term_index import INDEX_COLUMNS, rebuild
+
+NUM_PERM = 128
+BANDS, ROWS = 16, 8      # 후보가 될 확률 1-(1-J^8)^16: J=0.8 → 0.9996, J=0.5 → 0.06
+SHINGLE = 3
+MIN_CHARS = 15
+CHUNK_DOCS = 256         # 서명 계산 시 한 번에 올리는 문서 수(메모리 ≈ NUM_PERM × shingle 수 × 8B)
+BATCH = 5_000
+
+_NON_WORD = re.compile(r"[\W_]+")
+_P = np.uint64(4294967291)                     # 2^32 미만 최대 소수
+# 저장된 밴드 키가 프로세스마다 같아야 하므로 고정 시드
+_rng = np.random.RandomState(20240501)
+_A = _rng.randint(1, 4294967291, NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 4294967291, NUM_PERM, dtype=np.uint64)
+_MIX = _rng.randint(1, 2 ** 62, ROWS, dtype=np.uint64) | np.uint64(1)
+_PID_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def dedup_text(body: str | None) -> str:
+    return _NON_WORD.sub("", (body or "").lower())
+
+
+def shingles(norm: str) -> set:
+    return {norm[i:i + SHINGLE] for i in range(len(norm) - SHINGLE + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def signatures(norms: Sequence[str]) -> np.ndarray:
+    """
+    정규화 본문들(모두 SHINGLE 글자 이상) → (n, NUM_PERM) uint32 MinHash 서명.
+    3-gram 해시는 코드포인트 배열에서 벡터 연산으로, 문서별 최솟값은 minimum.reduceat 으로.
+    """
+    out = np.empty((len(norms), NUM_PERM), dtype=np.uint32)
+    for lo in range(0, len(norms), CHUNK_DOCS):
+        part = norms[lo:lo + CHUNK_DOCS]
+        lens = np.fromiter(map(len, part), dtype=np.int64, count=len(part))
+        codes = np.frombuffer("".join(part).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        doc = np.repeat(np.arange(len(part)), lens)
+        pos = np.flatnonzero(doc[:len(codes) - SHINGLE + 1] == doc[SHINGLE - 1:])  # 문서 경계를 넘지 않는 시작점
+        h = codes[pos]
+        for k in range(1, SHINGLE):
+            h = h * np.uint64(0x100000001B3) + codes[pos + k]
+        h = (h ^ (h >> np.uint64(29))) & np.uint64(0xFFFFFFFF)
+        vals = (_A[:, None] * h[None, :] + _B[:, None]) % _P
+        starts = np.searchsorted(doc[pos], np.arange(len(part)))
+        out[lo:lo + len(part)] = np.minimum.reduceat(vals, starts, axis=1).T
+    return out
+
+
+def band_keys(sig: np.ndarray, product_ids: Sequence[int | None]) -> np.ndarray:
+    """(n, NUM_PERM) 서명 → (n, BANDS) int64 밴드 키. 같은 상품끼리만 키가 겹치도록 product_id 를 섞음."""
+    bands = sig.astype(np.uint64).reshape(len(sig), BANDS, ROWS)
+    keys = (bands * _MIX).sum(axis=2)
+    pid = np.fromiter((p or 0 for p in product_ids), dtype=np.uint64, count=len(sig))
+    keys ^= (pid * _PID_MIX)[:, None]
+    return keys.view(np.int64)
+
+
+def keys_for(items: Sequence[Tuple[str | None, int | None]]) -> List:
+    """(본문, product_id) 목록 → 원본으로 등록할 밴드 키 배열(짧은 리뷰는 None). check 의 keys 와 같은 값."""
+    keys: List = [None] * len(items)
+    norms = [dedup_text(b) for b, _ in items]
+    todo = [i for i in range(len(items)) if len(norms[i]) >= MIN_CHARS]
+    if todo:
+        kmat = band_keys(signatures([norms[i] for i in todo]), [items[i][1] for i in todo])
+        for j, i in enumerate(todo):
+            keys[i] = kmat[j]
+    return keys
+
+
+def check(s, items: Sequence[Tuple[str | None, int | None]], threshold: float = NEAR_DUP_THRESHOLD):
+    """
+    items: (본문, product_id) 목록(같은 배치 안에서는 앞선 항목이 원본).
+    반환: (targets, keys)
+      targets[i]: None | ("id", 저장된 원본 id) | ("row", 배치 안 원본 위치)
+      keys[i]: 원본으로 등록할 밴드 키 배열(짧은 리뷰는 None)
+    """
+    n = len(items)
+    targets: List = [None] * n
+    keys: List = [None] * n
+    norms = [dedup_text(b) for b, _ in items]
+    todo = [i for i in range(n) if len(norms[i]) >= MIN_CHARS]
+    if not todo:
+        return targets, keys
+    kmat = band_keys(signatures([norms[i] for i in todo]), [items[i][1] for i in todo])
+    klists = kmat.tolist()
+    for j, i in enumerate(todo):
+        keys[i] = kmat[j]
+
+    # 저장된 원본 후보: 밴드별 key IN (...) 조회(PK 인덱스)
+    cands: Dict[int, set] = defaultdict(set)
+    for b in range(BANDS):
+        want: Dict[int, List[int]] = defaultdict(list)
+        for j, i in enumerate(todo):
+            want[klists[j][b]].append(i)
+        klist = list(want)
+        for lo in range(0, len(klist), 500):
+            for key, rid in s.execute(select(ReviewBand.key, ReviewBand.review_id)
+                                      .where(ReviewBand.band == b, ReviewBand.key.in_(klist[lo:lo + 500]))):
+                for i in want[key]:
+                    cands[i].add(rid)
+    stored = {}
+    ids = sorted(set().union(*cands.values())) if cands else []
+    for lo in range(0, len(ids), 500):
+        for rid, body, pid in s.execute(select(Review.id, Review.body, Review.product_id)
+                                        .where(Review.id.in_(ids[lo:lo + 500]))):
+            stored[rid] = (shingles(dedup_text(body)), pid)
+
+    seen: Dict[Tuple[int, int], List[int]] = defaultdict(list)   # (band, key) → 배치 안 원본 위치
+    sh = {}
+    for j, i in enumerate(todo):
+        sh[i] = mine = shingles(norms[i])
+        pid = items[i][1]
+        for rid in sorted(cands.get(i, ())):
+            other, opid = stored.get(rid, (None, None))
+            if other is not None and opid == pid and jaccard(mine, other) >= threshold:
+                targets[i] = ("id", rid)
+                break
+        if targets[i] is None:
+            near = sorted({p for b, k in enumerate(klists[j]) for p in seen.get((b, k), ())})
+            for p in near:
+                if items[p][1] == pid and jaccard(mine, sh[p]) >= threshold:
+                    targets[i] = ("row", p)
+                    break
+        if targets[i] is None:
+            for b, k in enumerate(klists[j]):
+                seen[(b, k)].append(i)
+    return targets, keys
+
+
+def register(s, ids: Sequence[int], keys: Sequence[np.ndarray]):
+    """원본 리뷰들의 밴드 키 등록(현재 트랜잭션)."""
+    rows = [{"band": b, "key": key, "review_id": rid}
+            for rid, k in zip(ids, keys) if k is not None for b, key in enumerate(k.tolist())]
+    if rows:
+        s.execute(ReviewBand.__table__.insert(), rows)
+
+
+def promote(s, deleted: Sequence[int]) -> List[Tuple]:
+    """
+    삭제될 리뷰들(deleted) 중 원본을 가리키던 유사 중복 가운데 가장 먼저 저장된 것(id 최소)을 새 원본으로
+    올림: dup_of 를 비우고 밴드 키를 등록, 나머지 중복은 새 원본을 가리키게 함(현재 트랜잭션, 삭제 전에 호출).
+    deleted 에 함께 들어 있는 중복은 건드리지 않음(dup_of 는 항상 원본을 가리키므로 원본만 따로 고르지 않아도 됨).
+    반환: 새 원본들의 term_index.INDEX_COLUMNS 행(용어 색인 반영용)
+    """
+    if not deleted:
+        return []
+    rows = s.execute(select(*INDEX_COLUMNS, Review.dup_of, Review.product_id)
+                     .where(Review.dup_of.in_(deleted), Review.id.not_in(deleted))
+                     .order_by(Review.id)).all()
+    heads: Dict[int, Tuple] = {}
+    links = []
+    for r in rows:
+        head = heads.setdefault(r.dup_of, r)
+        links.append({"id": r.id, "dup_of": None if head is r else head.id})
+    if not links:
+        return []
+    s.execute(update(Review), links)
+    promoted = list(heads.values())
+    register(s, [r.id for r in promoted], keys_for([(r.body, r.product_id) for r in promoted]))
+    return [tuple(r[:len(INDEX_COLUMNS)]) for r in promoted]
+
+
+# ---------------------- 기존 코퍼스 재판정 ----------------------
+def recluster(batch: int = BATCH, threshold: float = NEAR_DUP_THRESHOLD) -> Dict:
+    """
+    밴드 색인/dup_of 를 비우고 id 순(먼저 저장된 리뷰가 원본)으로 다시 판정한 뒤 용어 색인 재구축.
+    """
+    migrate()
+    done, dups, last_id = 0, 0, 0
+    with SessionLocal() as s:
+        s.execute(delete(ReviewBand))
+        s.execute(update(Review).where(Review.dup_of.is_not(None)).values(dup_of=None))
+        bump_data_version(s)
+        s.commit()
+        while True:
+            rows = s.execute(select(Review.id, Review.body, Review.product_id)
+                             .where(Review.id > last_id).order_by(Review.id).limit(batch)).all()
+            if not rows:
+                break
+            targets, keys = check(s, [(r.body, r.product_id) for r in rows], threshold)
+            params = []
+            for r, t in zip(rows, targets):
+                if t is not None:
+                    target = t[1] if t[0] == "id" else rows[t[1]].id
+                    params.append({"id": r.id, "dup_of": target})
+            if params:
+                s.execute(update(Review), params)
+            register(s, [r.id for r, t in zip(rows, targets) if t is None],
+                     [k for k, t in zip(keys, targets) if t is None])
+            if params:
+                bump_data_version(s)
+            s.commit()
+            done += len(rows)
+            dups += len(params)
+            last_id = rows[-1].id
+            print(f"[NEARDUP] rows={done} dups={dups} (id<={last_id})", flush=True)
+    idx = rebuild()
+    return {"rows": done, "dups": dups, "indexed_docs": idx["docs"]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--recluster", action="store_true", help="전체 리뷰 유사 중복 재판정")
+    ap.add_argument("--threshold", type=float, default=NEAR_DUP_THRESHOLD)
+    ap.add_argument("--batch", type=int, default=BATCH)
+    args = ap.parse_args()
+    if args.recluster:
+        out = recluster(batch=args.batch, threshold=args.threshold)
+        print(f"[OK] rows={out['rows']}, dups={out['dups']}, indexed docs={out['indexed_docs']}")
+    else:
+        ap.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# src/products.py
+"""
+상품 차원 테이블(products) 조회/등록과 기존 리뷰 이전.
+URL → product_id 는 프로세스 캐시에 두되, 등록한 트랜잭션이 커밋된 뒤에만 캐시에 반영
+(롤백된 id 가 캐시에 남지 않도록).
+
+예) python -m src.products --backfill     # reviews.product_url → products + product_id, 원문 URL 비움
+"""
+import argparse
+from typing import Dict, Iterable, List
+
+from sqlalchemy import event, func, select, text, update
+
+from .cache import bump_data_version
+from .db import SessionLocal, dialect_insert
+from .init_db import migrate
+from .models import Product, Review
+from .utils import canonical_url
+
+CACHE_MAX = 1_000_000
+_ids: Dict[str, int] = {}    # canonical url -> id (커밋된 것만)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish(s):
+    pending = s.info.pop("product_ids", None)
+    if pending:
+        if len(_ids) + len(pending) > CACHE_MAX:
+            _ids.clear()
+        _ids.update(pending)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard(s):
+    s.info.pop("product_ids", None)
+
+
+def resolve_ids(s, urls: Iterable[str | None], source: str | None = None, chunk: int = 500) -> Dict[str, int]:
+    """
+    원문 URL 들 → {원문 URL: product_id}. 없는 상품은 현재 트랜잭션에서 등록(충돌 무시).
+    """
+    canon = {u: canonical_url(u) for u in set(urls) if u}
+    pending = s.info.setdefault("product_ids", {})
+    known = {c: _ids.get(c) or pending.get(c) for c in set(canon.values())}
+    missing = [c for c, i in known.items() if i is None]
+    if missing:
+        s.execute(dialect_insert(Product.__table__).on_conflict_do_nothing(index_elements=["url"]),
+                  [{"url": c, "source": source} for c in missing])
+        for i in range(0, len(missing), chunk):
+            part = missing[i:i + chunk]
+            for pid, url in s.execute(select(Product.id, Product.url).where(Product.url.in_(part))):
+                known[url] = pending[url] = pid
+    return {u: known[c] for u, c in canon.items()}
+
+
+def attach_product_ids(s, rows: List[Dict]) -> List[Dict]:
+    """INSERT 파라미터의 product_url 을 product_id 로 교체(제자리). 원문 URL 은 리뷰 행에 저장하지 않음."""
+    ids = resolve_ids(s, (r.get("product_url") for r in rows),
+                      source=rows[0].get("source") if rows else None)
+    for r in rows:
+        r["product_id"] = ids.get(r.pop("product_url", None))
+    return rows
+
+
+def lookup_id(url: str | None) -> int | None:
+    """조회용(등록하지 않음). 없는 상품이면 None."""
+    c = canonical_url(url)
+    if c is None:
+        return None
+    if c in _ids:
+        return _ids[c]
+    with SessionLocal() as s:
+        return s.execute(select(Product.id).where(Product.url == c)).scalar()
+
+
+def product_urls(ids: Iterable[int]) -> Dict[int, str]:
+    ids = [i for i in set(ids) if i is not None]
+    if not ids:
+        return {}
+    with SessionLocal() as s:
+        return dict(s.execute(select(Product.id, Product.url).where(Product.id.in_(ids))).all())
+
+
+# ---------------------- 기존 행 이전 ----------------------
+def backfill(batch: int = 20_000) -> Dict:
+    """
+    product_id 가 없는 레거시 행: URL 별로 상품 등록 → product_id 채우고 product_url 은 NULL.
+    이전 인덱스(product_url, review_day)는 제거. 공간 회수는 VACUUM(SQLite) 별도.
+    """
+    migrate()
+    done, last_id = 0, 0
+    with SessionLocal() as s:
+        while True:
+            rows = s.execute(
+                select(Review.id, Review.product_url, Review.source)
+                .where(Review.product_id.is_(None), Review.product_url.is_not(None), Review.id > last_id)
+                .order_by(Review.id).limit(batch)
+            ).all()
+            if not rows:
+                break
+            ids = resolve_ids(s, (r[1] for r in rows), source=rows[0][2])
+            # 기본키 기준 bulk UPDATE(executemany 1회)
+            s.execute(update(Review), [{"id": rid, "product_id": ids[url], "product_url": None}
+                                       for rid, url, _ in rows])
+            bump_data_version(s)
+            s.commit()
+            done += len(rows)
+            last_id = rows[-1][0]
+            print(f"[PRODUCTS] rows={done} (id<={last_id})", flush=True)
+        s.execute(text("DROP INDEX IF EXISTS idx_reviews_product_day"))
+        s.commit()
+        n_products = s.execute(select(func.count()).select_from(Product)).scalar()
+    return {"rows": done, "products": n_products}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backfill", action="store_true", help="reviews.product_url → products/product_id 이전")
+    args = ap.parse_args()
+    if args.backfill:
+        out = backfill()
+        print(f"[OK] rows={out['rows']}, products={out['products']}")
+    else:
+        ap.print_help()
+
+if __name__ == "__main__":
+    main()
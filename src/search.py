@@ -0,0 +1,149 @@
+# src/search.py
+"""
+리뷰 본문 전문 검색(SQLite FTS5, 색인/트리거는 init_db.ensure_fts).
+- 질의: 공백으로 나눈 단어는 AND, "따옴표" 는 구(phrase), -단어 는 제외. 한국어는 어미가 붙으므로
+  각 단어/구의 끝은 접두 일치("삐걱" → 삐걱거려요, 삐걱대요). raw=True 면 FTS5 질의식을 그대로 사용.
+- 필터: source, product_id, pain(불만 라벨, 저장된 pain_mask 비트)
+- 정렬: rank(BM25, 기본) 또는 recent(id 내림차순), 둘 다 키셋 커서로 페이지 이동
+
+예) python -m src.search --q 삐걱 --source coupang
+    python -m src.search --rebuild      # 색인 재구축(reviews 기준)
+"""
+import argparse, json, re
+from typing import Dict
+
+from sqlalchemy import text
+
+from .db import SessionLocal, engine
+from .init_db import FTS_TABLE, ensure_fts, migrate
+from .text import PAIN_MATCHER
+
+SORTS = ("rank", "recent")
+PAGE_MAX = 200
+_TERM_RE = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+# 잘못된 FTS5 질의식일 때 SQLite 오류 메시지(예: "unterminated string", 열 필터 "foo:bar" → "no such column")
+_BAD_QUERY = ("fts5", "syntax", "unterminated string", "no such column", "unknown special query")
+
+
+class SearchError(ValueError):
+    pass
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_query(q: str) -> str:
+    """사용자 질의 → FTS5 MATCH 식. 예) 삐걱 "배송 느" -환불 → "삐걱"* AND "배송 느"* NOT "환불"*"""
+    pos, neg = [], []
+    for m in _TERM_RE.finditer(q or ""):
+        minus, term = m.group(1, 2) if m.group(2) is not None else m.group(3, 4)
+        term = term.strip()
+        if not term or term == "-":
+            continue
+        (neg if minus else pos).append(_quote(term) + "*")
+    if not pos:
+        raise SearchError("query needs at least one search term")
+    expr = " AND ".join(pos)
+    for t in neg:
+        expr = f"({expr}) NOT {t}"
+    return expr
+
+
+def _cursor(sort: str, cursor: str | None):
+    if not cursor:
+        return None
+    try:
+        if sort == "rank":
+            score, rid = cursor.rsplit(":", 1)
+            return float(score), int(rid)
+        return int(cursor)
+    except ValueError:
+        raise SearchError(f"bad cursor: {cursor}")
+
+
+def search(q: str, source: str | None = None, product_id: int | None = None, pain: str | None = None,
+           sort: str = "rank", limit: int = 20, cursor: str | None = None, raw: bool = False) -> Dict:
+    """
+    반환: {"query": MATCH 식, "items": [id/source/product_id/rating/review_day/sentiment_label/body/snippet/score],
+           "next_cursor": 다음 페이지 커서 | None}
+    """
+    if engine.dialect.name != "sqlite":
+        raise SearchError("full-text search requires SQLite FTS5")
+    if sort not in SORTS:
+        raise SearchError(f"sort must be one of {SORTS}")
+    expr = q if raw else build_query(q)
+    limit = max(1, min(limit, PAGE_MAX))
+    after = _cursor(sort, cursor)
+
+    score = f"bm25({FTS_TABLE})"
+    cond = [f"{FTS_TABLE} MATCH :q"]
+    params = {"q": expr, "n": limit}
+    if source:
+        cond.append("r.source = :source")
+        params["source"] = source
+    if product_id is not None:
+        cond.append("r.product_id = :pid")
+        params["pid"] = product_id
+    if pain:
+        if pain not in PAIN_MATCHER.order:
+            raise SearchError(f"pain must be one of {PAIN_MATCHER.order}")
+        cond.append("(r.pain_mask & :bit) != 0")
+        params["bit"] = 1 << PAIN_MATCHER.order.index(pain)
+    if sort == "rank":
+        order = f"{score}, r.id"
+        if after:
+            cond.append(f"({score} > :s OR ({score} = :s AND r.id > :after))")
+            params["s"], params["after"] = after
+    else:
+        order = "r.id DESC"
+        if after:
+            cond.append("r.id < :after")
+            params["after"] = after
+
+    sql = f"""
+        SELECT r.id, r.source, r.product_id, r.rating, r.review_day, r.sentiment_label, r.body,
+               snippet({FTS_TABLE}, 0, '[', ']', '…', 12) AS snippet, {score} AS score
+        FROM {FTS_TABLE} JOIN reviews r ON r.id = {FTS_TABLE}.rowid
+        WHERE {' AND '.join(cond)}
+        ORDER BY {order} LIMIT :n"""
+    with SessionLocal() as s:
+        try:
+            rows = s.execute(text(sql), params).all()
+        except Exception as e:  # FTS5 질의식 문법 오류(raw) 등
+            if any(k in str(e).lower() for k in _BAD_QUERY):
+                raise SearchError(f"bad query: {expr}")
+            raise
+
+    items = [{"id": r.id, "source": r.source, "product_id": r.product_id, "rating": r.rating,
+              "review_day": str(r.review_day) if r.review_day else None,
+              "sentiment_label": r.sentiment_label, "body": r.body, "snippet": r.snippet,
+              "score": round(r.score, 6)} for r in rows]
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = f"{last.score!r}:{last.id}" if sort == "rank" else str(last.id)
+    return {"query": expr, "items": items, "next_cursor": next_cursor}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--q", default=None, help='검색어(예: 삐걱 "배송 느" -환불)')
+    ap.add_argument("--source", default=None)
+    ap.add_argument("--pain", default=None, help=f"불만 라벨: {', '.join(PAIN_MATCHER.order)}")
+    ap.add_argument("--sort", default="rank", choices=SORTS)
+    ap.add_argument("--limit", type=int, default=10)
+    ap.add_argument("--rebuild", action="store_true", help="FTS 색인 재구축")
+    args = ap.parse_args()
+    migrate()
+    if args.rebuild:
+        ensure_fts(rebuild=True)
+        print(f"[OK] {FTS_TABLE} rebuilt")
+    elif args.q:
+        out = search(args.q, source=args.source, pain=args.pain, sort=args.sort, limit=args.limit)
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+    else:
+        ap.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# src/sentiment.py
+"""
+사전(lexicon) 기반 리뷰 감성 점수 [-1, 1] + 라벨(positive/neutral/negative).
+
+배치 단위로 계산한다: 정규화 본문(body_norm)을 한 줄로 이어 붙여 COO 형태의
+문서-단어 행렬(doc 인덱스, 어휘 코드)을 만들고, 어휘별 가중치/부정/강조 여부는 고유 단어당
+한 번만 계산한다. 부정(앞 단어 '안/못', 뒤 단어 '않아요/없어요', 단어 안의 '~지않') 과
+강조(너무/정말 ...)는 이웃 위치 비교로, 문서 점수는 np.bincount 로 한 번에 집계.
+평점(rating)이 있으면 사전 점수와 섞는 사전확률(prior)로 쓴다.
+
+예) python -m src.sentiment --rescore                 # 점수가 없는 리뷰만
+    python -m src.sentiment --rescore --all --source coupang
+"""
+import argparse, threading, time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, update
+
+from .cache import bump_data_version
+from .db import SessionLocal
+from .models import Review
+from .text import normalize
+
+LABELS = ("positive", "neutral", "negative")
+THRESHOLD = 0.15        # |score| 가 이 값 미만이면 neutral
+RATING_WEIGHT = 0.5     # 평점과 사전 점수가 모두 있을 때 평점 비중
+BOOST = 1.5             # 강조어 다음 단어 가중치 배수
+
+# 어간(단어 시작 부분) → 극성. 가장 긴 어간이 우선(예: '불편' 이 '편' 계열보다 먼저)
+LEXICON: Dict[str, float] = {
+    # 긍정
+    "좋": 1.0, "만족": 1.0, "최고": 1.0, "완벽": 1.0, "훌륭": 1.0, "흡족": 0.8, "대박": 0.8,
+    "추천": 0.8, "재구매": 0.8, "짱": 0.8, "튼튼": 0.8, "견고": 0.8, "든든": 0.6,
+    "편하": 0.8, "편해": 0.8, "편안": 0.8, "편리": 0.7, "안락": 0.6, "안정": 0.5, "안심": 0.5,
+    "예쁘": 0.8, "예뻐": 0.8, "이쁘": 0.8, "이뻐": 0.8, "귀엽": 0.6, "귀여": 0.6, "고급": 0.6,
+    "깔끔": 0.7, "꼼꼼": 0.6, "친절": 0.7, "감사": 0.5, "괜찮": 0.5, "넉넉": 0.4,
+    "푹신": 0.5, "부드럽": 0.5, "부드러": 0.5, "빠르": 0.5, "빨라": 0.5, "빨리": 0.4,
+    "저렴": 0.5, "가성비": 0.4, "사랑": 0.6, "굿": 0.7, "good": 0.7, "nice": 0.7, "great": 0.8,
+    # 부정
+    "불만": -1.0, "불량": -1.0, "최악": -1.0, "실망": -1.0, "비추": -1.0, "쓰레기": -1.0,
+    "후회": -0.9, "엉망": -0.9, "짜증": -0.9, "허접": -0.9, "망가": -0.9, "고장": -0.9,
+    "파손": -0.9, "하자": -0.9, "불친절": -0.9, "불편": -0.8, "부실": -0.8, "싸구려": -0.8,
+    "별로": -0.7, "환불": -0.7, "누락": -0.7, "더럽": -0.7, "아쉽": -0.6, "아쉬": -0.6,
+    "반품": -0.6, "삐걱": -0.6, "휘어": -0.6, "찍힘": -0.6, "스크래치": -0.6, "못생": -0.6,
+    "문제": -0.5, "흔들": -0.5, "소음": -0.5, "느리": -0.5, "느려": -0.5, "늦": -0.5,
+    "지연": -0.5, "비싸": -0.5, "비쌈": -0.5, "약하": -0.5, "약함": -0.5, "헐겁": -0.5,
+    "힘들": -0.5, "아프": -0.5, "아파": -0.5, "냄새": -0.4, "딱딱": -0.4, "어렵": -0.4,
+    "어려": -0.4, "교환": -0.4, "bad": -0.7, "worst": -1.0,
+}
+PRE_NEGATORS = {"안", "못", "전혀", "절대"}        # 다음 단어 극성 반전
+POST_NEGATORS = ("않", "없", "아니", "아닌")       # 이 글자로 시작하는 단어는 앞 단어 극성 반전
+INFIX_NEGATORS = ("않", "없", "못")                # 어간 뒤에 붙으면 그 단어 자체 반전(좋지않아요)
+INTENSIFIERS = {"너무", "정말", "진짜", "완전", "매우", "아주", "엄청", "넘", "되게", "굉장히", "많이", "무척"}
+
+_STEMS = sorted(LEXICON, key=len, reverse=True)
+_MAX_STEM = max(map(len, _STEMS))
+_SEP = "\x00"  # 문서 구분 토큰. normalize() 결과에는 나올 수 없는 문자
+
+# 단어 → 코드, 코드별 (극성, 앞부정어, 뒤부정어, 다음 단어 배수). 배치 간(요청 스레드 간) 공유되는 어휘 표.
+# _VOCAB = (코드 dict, 정보 배열) 쌍을 통째로 바꿔 게시한다. dict 는 추가만 되고(기존 코드는 불변)
+# 배열은 읽기 전용이라, 잠금 없이 읽는 쪽은 한 번 꺼낸 쌍 안에서 항상 일관된 값을 본다.
+_lock = threading.Lock()
+_INFO: List[Tuple[float, float, float, float]] = []    # _lock 안에서만 변경
+_VOCAB: Tuple[Dict[str, int], np.ndarray] = ({}, np.zeros((0, 4)))
+MEMO_MAX = 500_000
+
+
+def _stem_weight(word: str) -> float:
+    for k in range(min(len(word), _MAX_STEM), 0, -1):
+        w = LEXICON.get(word[:k])
+        if w is not None:
+            rest = word[k:]
+            return -w if any(n in rest for n in INFIX_NEGATORS) else w
+    return 0.0
+
+
+def _word_info(word: str) -> Tuple[float, float, float, float]:
+    """단어 → (극성, 앞부정어 여부, 뒤부정어 여부, 다음 단어 배수). 고유 단어당 1회."""
+    if word in PRE_NEGATORS:
+        return (0.0, 1.0, 0.0, 1.0)
+    if word in INTENSIFIERS:
+        return (0.0, 0.0, 0.0, BOOST)
+    if word.startswith(POST_NEGATORS):
+        return (0.0, 0.0, 1.0, 1.0)
+    w = _stem_weight(word)
+    if w == 0.0 and len(word) > 2 and word[0] in ("안", "못"):
+        w = -_stem_weight(word[1:])  # 띄어쓰기 없는 부정(안좋아요/못쓰겠어요)
+    return (w, 0.0, 0.0, 1.0)
+
+
+def _lookup(codes: Dict[str, int], info: np.ndarray, words: List[str]) -> np.ndarray | None:
+    try:
+        out = np.fromiter(map(codes.__getitem__, words), dtype=np.int64, count=len(words))
+    except KeyError:
+        return None
+    # 다른 스레드가 dict 에 막 추가한 코드는 이 쌍의 배열보다 뒤에 있을 수 있음
+    return out if not len(out) or out.max() < len(info) else None
+
+
+def _encode(words: List[str]) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+    """
+    단어열 → (어휘 코드 배열, 코드별 정보 배열, 코드 dict). 셋은 같은 어휘 표에서 나온 값.
+    처음 보는 단어가 없으면 잠금 없이 dict 조회만(C 수준), 있으면 _lock 안에서 추가 후 새 쌍을 게시.
+    """
+    global _VOCAB, _INFO
+    codes, info = _VOCAB
+    out = _lookup(codes, info, words)
+    if out is not None:
+        return out, info, codes
+    with _lock:
+        codes, info = _VOCAB
+        new = set(words).difference(codes)
+        if len(codes) + len(new) > MEMO_MAX:
+            codes, _INFO = {}, []       # 새 표로 교체(이전 쌍을 읽는 스레드는 그대로 사용)
+            new = set(words)
+        for w in new:
+            codes[w] = len(_INFO)
+            _INFO.append(_word_info(w))
+        info = np.array(_INFO, dtype=np.float64).reshape(-1, 4)
+        info.flags.writeable = False
+        _VOCAB = (codes, info)
+        return np.fromiter(map(codes.__getitem__, words), dtype=np.int64, count=len(words)), info, codes
+
+
+def _lexicon_scores(norms: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    정규화된 본문 배치 → 문서별 (사전 점수[-1,1], 극성 단어 수).
+    배치 전체를 구분 토큰으로 이어 한 번에 소문자화/분리 → COO 문서-단어 행렬 (doc, code).
+    구분 토큰이 문서 사이에 끼어 있어 이웃 비교(부정/강조)가 문서 경계를 넘지 않는다.
+    """
+    n = len(norms)
+    words = f" {_SEP} ".join(norms).lower().split()
+    if not words:
+        return np.zeros(n), np.zeros(n)
+    codes, info, vocab = _encode(words)
+    weight, pre, post, boost = info[codes].T
+    doc = np.cumsum(codes == vocab[_SEP]) if n > 1 else np.zeros(len(codes), dtype=np.int64)
+
+    negated = np.zeros(len(codes), dtype=bool)
+    negated[1:] |= pre[:-1] > 0                            # 안 좋아요
+    negated[:-1] |= post[1:] > 0                           # 좋지 않아요
+    mult = np.ones(len(codes))
+    mult[1:] = boost[:-1]                                  # 너무 좋아요
+    w = weight * mult * np.where(negated, -1.0, 1.0)
+
+    raw = np.bincount(doc, weights=w, minlength=n)
+    hits = np.bincount(doc, weights=(weight != 0), minlength=n)
+    return np.clip(raw / np.maximum(hits, 1), -1.0, 1.0), hits
+
+
+def score_batch(bodies: Sequence[str | None], ratings: Sequence[float | None] | None = None,
+                norms: Sequence[str | None] | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    리뷰 배치 → (score 배열, label 배열). norms 는 저장된 body_norm(없는 항목만 normalize).
+    평점(1~5)은 (r-3)/2 로 [-1,1] 사전확률로 변환해 사전 점수와 RATING_WEIGHT 비율로 섞고,
+    극성 단어가 없으면 평점만, 평점이 없으면 사전 점수만 사용.
+    """
+    if norms is None:
+        norms = [None] * len(bodies)
+    lex, hits = _lexicon_scores([nm if nm is not None else normalize(b) for b, nm in zip(bodies, norms)])
+    if ratings is None:
+        prior = np.full(len(lex), np.nan)
+    else:
+        prior = pd.to_numeric(pd.Series(list(ratings), dtype=object), errors="coerce").to_numpy(np.float64)
+        prior = np.clip((prior - 3.0) / 2.0, -1.0, 1.0)
+    has_prior = ~np.isnan(prior)
+    mixed = np.where(hits > 0, (1 - RATING_WEIGHT) * lex + RATING_WEIGHT * prior, prior)
+    score = np.round(np.where(has_prior, mixed, lex), 4)
+    label = np.where(score >= THRESHOLD, "positive", np.where(score <= -THRESHOLD, "negative", "neutral"))
+    return score, label
+
+
+def annotate(rows: List[Dict]) -> List[Dict]:
+    """
+    INSERT 파라미터 dict 배치에 sentiment/sentiment_label 을 채움(이미 있으면 건너뜀). 제자리 수정.
+    """
+    todo = [r for r in rows if "sentiment_label" not in r]
+    if todo:
+        score, label = score_batch([r.get("body") for r in todo], [r.get("rating") for r in todo],
+                                   [r.get("body_norm") for r in todo])
+        for r, sc, lb in zip(todo, score.tolist(), label.tolist()):
+            r["sentiment"], r["sentiment_label"] = sc, lb
+    return rows
+
+
+# ---------------------- 재채점(백필) ----------------------
+def rescore(source: str | None = None, rescore_all: bool = False, batch: int = 100_000) -> Dict:
+    """
+    저장된 리뷰의 감성 점수 갱신. 기본은 점수 없는 행만, rescore_all 이면 전체(사전 수정 후).
+    id 순 keyset 배치라 중단 후 다시 실행해도 남은 행부터.
+    """
+    t0 = time.perf_counter()
+    done, last_id, score_s = 0, 0, 0.0
+    with SessionLocal() as s:
+        while True:
+            stmt = (select(Review.id, Review.body, Review.rating, Review.body_norm)
+                    .where(Review.id > last_id))
+            if source:
+                stmt = stmt.where(Review.source == source)
+            if not rescore_all:
+                stmt = stmt.where(Review.sentiment_label.is_(None))
+            rows = s.execute(stmt.order_by(Review.id).limit(batch)).all()
+            if not rows:
+                break
+            t1 = time.perf_counter()
+            score, label = score_batch([r[1] for r in rows], [r[2] for r in rows], [r[3] for r in rows])
+            score_s += time.perf_counter() - t1
+            s.execute(update(Review), [
+                {"id": r[0], "sentiment": sc, "sentiment_label": lb}
+                for r, sc, lb in zip(rows, score.tolist(), label.tolist())
+            ])
+            bump_data_version(s)
+            s.commit()
+            done += len(rows)
+            last_id = rows[-1][0]
+            print(f"[SENTIMENT] rows={done} (id<={last_id})", flush=True)
+    return {"updated": done, "seconds": round(time.perf_counter() - t0, 2), "score_seconds": round(score_s, 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rescore", action="store_true", help="저장된 리뷰 감성 점수 계산/갱신")
+    ap.add_argument("--all", action="store_true", help="이미 점수가 있는 행도 다시 계산")
+    ap.add_argument("--source", default=None)
+    ap.add_argument("--batch", type=int, default=100_000)
+    ap.add_argument("--text", default=None, help="문장 하나 점수 확인")
+    args = ap.parse_args()
+    if args.text is not None:
+        score, label = score_batch([args.text])
+        print({"score": float(score[0]), "label": str(label[0])})
+    elif args.rescore:
+        out = rescore(source=args.source, rescore_all=args.all, batch=args.batch)
+        print(f"[OK] updated={out['updated']} in {out['seconds']}s (scoring {out['score_seconds']}s)")
+    else:
+        ap.print_help()
+
+if __name__ == "__main__":
+    main()
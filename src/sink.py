@@ -0,0 +1,199 @@
+# src/sink.py
+"""
+리뷰 저장 공통 경로(수집기/CSV 적재/재처리 공용).
+배치 단위로 해시 → INSERT ... ON CONFLICT(hash_id) DO NOTHING → 트랜잭션 1회 커밋.
+"""
+import math
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, select, update
+
+from . import neardup
+from .cache import bump_data_version
+from .config import NEAR_DUP_MODE
+from .dates import now, parse_review_date
+from .db import SessionLocal, dialect_insert
+from .models import Review, ReviewBand
+from .products import attach_product_ids
+from .sentiment import annotate
+from .term_index import INDEX_COLUMNS, index_reviews
+from .text import text_features
+from .utils import review_hash
+
+_t = Review.__table__
+
+
+def insert_ignore():
+    # hash_id 충돌 행은 건너뛰는 INSERT (SQLite/PostgreSQL 모두 ON CONFLICT DO NOTHING)
+    # 실제 삽입된 행만 RETURNING 으로 돌려받아 용어 색인에 반영(마지막 열 hash_id 는 입력 행 매칭용)
+    return (dialect_insert(_t).on_conflict_do_nothing(index_elements=["hash_id"])
+            .returning(*INDEX_COLUMNS, Review.hash_id))
+
+
+def _text(d: Dict, key: str, default=None) -> str | None:
+    # 문자열 필드: None 은 그대로, 숫자는 문자열로, 그 밖의 타입(list/dict 등)은 ValueError
+    v = d.get(key)
+    if v is None:
+        v = default
+    if v is None or isinstance(v, str):
+        return v
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return str(v)
+    raise ValueError(f"{key} must be a string")
+
+
+def _rating(v) -> float | None:
+    if v is None or v == "":
+        return None
+    if isinstance(v, bool) or not isinstance(v, (int, float, str)):
+        raise ValueError("rating must be a number")
+    try:
+        r = float(v)
+    except ValueError:
+        raise ValueError(f"rating must be a number: {v!r}")
+    if not math.isfinite(r):
+        raise ValueError(f"rating must be a number: {v!r}")
+    return r
+
+
+def _crawled_at(v) -> datetime | date:
+    if v is None or v == "":
+        return now()
+    if isinstance(v, (datetime, date)):
+        return v
+    if isinstance(v, str):
+        try:
+            return datetime.fromisoformat(v)
+        except ValueError:
+            pass
+    raise ValueError(f"crawled_at must be an ISO datetime: {v!r}")
+
+
+def to_row(d: Dict, source: str | None = None, product_url: str | None = None) -> Dict:
+    """
+    리뷰 dict → INSERT 파라미터. source/product_url 은 d 에 없거나 null 일 때의 기본값.
+    rating 은 float(또는 None), body/product_url/review_date 는 문자열로 맞추고, 맞출 수 없거나
+    source 가 비어 있으면 ValueError(외부 입력 검증 — API 는 400, 대량 제출은 레코드 오류로 집계).
+    hash_id 가 없으면 review_hash 로 계산(상대 날짜는 review_day 기준), 본문 전처리 결과(text_features)도 함께 채움.
+    review_day 는 review_date 를 정규화(상대 날짜는 d["crawled_at"] 또는 지금 기준).
+    """
+    if not isinstance(d, dict):
+        raise ValueError("review must be a JSON object")
+    row = {
+        "source": _text(d, "source", source),
+        "product_url": _text(d, "product_url", product_url),
+        "rating": _rating(d.get("rating")),
+        "body": _text(d, "body"),
+        "review_date": _text(d, "review_date"),
+    }
+    if not row["source"]:
+        raise ValueError("source is required")
+    row["review_day"] = parse_review_date(row["review_date"], _crawled_at(d.get("crawled_at")))
+    # 상대 날짜("3일 전")는 수집일마다 문자열이 바뀌므로 해시에는 정규화한 날짜를 넣음(같은 리뷰 = 같은 해시)
+    hash_date = row["review_date"]
+    if row["review_day"] and parse_review_date(hash_date) is None:
+        hash_date = row["review_day"].isoformat()
+    row["hash_id"] = _text(d, "hash_id") or review_hash(
+        row["source"], row["product_url"], row["body"], hash_date)
+    row.update(text_features(row["body"]))
+    return row
+
+
+def upsert_rows(s, rows: List[Dict]) -> int:
+    """
+    이미 해시된 행 배치를 현재 트랜잭션에서 INSERT(충돌 무시) + 용어 색인 갱신. 커밋은 호출 측.
+    감성 점수가 없는 행은 배치 단위로 채점해 함께 저장, product_url 은 product_id 로 바꿔 저장.
+    유사 중복(src.neardup)은 NEAR_DUP_MODE 에 따라 dup_of 를 달아 저장(색인 제외)하거나 건너뜀.
+    반환: 실제 삽입된 행 수
+    """
+    if not rows:
+        return 0
+    annotate(rows)
+    attach_product_ids(s, rows)
+    if NEAR_DUP_MODE == "off":
+        targets, keys = [None] * len(rows), [None] * len(rows)
+    else:
+        targets, keys = neardup.check(s, [(r["body"], r["product_id"]) for r in rows])
+        if NEAR_DUP_MODE == "skip":
+            keep = [i for i, t in enumerate(targets) if t is None]
+            rows, keys, targets = [rows[i] for i in keep], [keys[i] for i in keep], [None] * len(keep)
+    for r, t in zip(rows, targets):
+        r["dup_of"] = t[1] if t is not None and t[0] == "id" else None
+    if not rows:
+        return 0
+
+    inserted = s.execute(insert_ignore(), rows).all()
+    if not inserted:
+        return 0
+    ids = {r[-1]: r[0] for r in inserted}
+    pos = {}
+    for i, r in enumerate(rows):
+        pos.setdefault(r["hash_id"], i)  # 같은 해시가 배치에 여럿이면 삽입되는 건 첫 행
+    originals, links, index_rows = [], [], []
+    for r in inserted:
+        i = pos[r[-1]]
+        t = targets[i]
+        if t is not None and t[0] == "row":
+            t = ("id", ids.get(rows[t[1]]["hash_id"]))  # 배치 안 원본이 이미 있던 행이면 None
+            if t[1] is not None:
+                links.append({"id": r[0], "dup_of": t[1]})
+        if t is None or t[1] is None:
+            originals.append((r[0], keys[i]))
+            index_rows.append(r[:-1])
+        else:
+            index_rows.append((r[0], r[1], None, None, None, None))  # 색인 max id 만 갱신
+    if links:
+        s.execute(update(Review), links)
+    neardup.register(s, [i for i, _ in originals], [k for _, k in originals])
+    index_reviews(s, index_rows)
+    bump_data_version(s)
+    return len(inserted)
+
+
+def delete_reviews(ids: Iterable[int]) -> int:
+    """
+    리뷰 삭제 + 용어 색인 차감(한 트랜잭션). 반환: 삭제 건수
+    원본을 지우면 그 유사 중복 중 가장 먼저 저장된 것이 새 원본이 됨(neardup.promote, 색인에 반영).
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    with SessionLocal() as s:
+        promoted = neardup.promote(s, ids)
+        s.execute(delete(ReviewBand).where(ReviewBand.review_id.in_(ids)))
+        gone = s.execute(
+            delete(Review).where(Review.id.in_(ids)).returning(*INDEX_COLUMNS, Review.dup_of)
+        ).all()
+        # 유사 중복 행은 색인에 없으므로 차감하지 않음
+        index_reviews(s, [r[:-1] for r in gone if r[-1] is None], sign=-1)
+        index_reviews(s, promoted)
+        if gone:
+            bump_data_version(s)
+        s.commit()
+    return len(gone)
+
+
+def existing_hashes(hashes: Iterable[str], chunk: int = 500) -> set[str]:
+    """이미 저장된 hash_id 집합(IN 조회를 chunk 단위로 나눔)."""
+    hashes = list(dict.fromkeys(hashes))
+    found = set()
+    with SessionLocal() as s:
+        for i in range(0, len(hashes), chunk):
+            part = hashes[i:i + chunk]
+            found.update(s.execute(select(Review.hash_id).where(Review.hash_id.in_(part))).scalars())
+    return found
+
+
+def store_reviews(reviews: Iterable[Dict], source: str | None = None,
+                  product_url: str | None = None) -> Tuple[int, int]:
+    """
+    리뷰 dict 배치를 해시 후 한 트랜잭션으로 저장. 반환: (inserted, duplicated)
+    """
+    rows = [to_row(d, source=source, product_url=product_url) for d in reviews]
+    if not rows:
+        return 0, 0
+    with SessionLocal() as s:
+        n = upsert_rows(s, rows)
+        s.commit()
+    return n, len(rows) - n
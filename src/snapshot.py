@@ -0,0 +1,243 @@
+# src/snapshot.py
+"""
+분석용 Parquet 스냅샷(열 지향). OLTP reviews 테이블을 ORM 으로 한 행씩 읽는 대신,
+전처리된 토큰/불만 마스크/감성 값을 source·월 단위 파티션 파일로 내보내고
+대용량 인사이트는 필요한 열만(memory-map) 읽는다 → 무거운 분석이 API 의 SQLite 쓰기와 경쟁하지 않음.
+
+- 배치: {SNAPSHOT_DIR}/reviews/source=<source>/month=<YYYY-MM>/part-<첫 id>-<끝 id>.parquet
+  (month: review_day, 없으면 적재일 created_at). 빈 본문 행은 내보내지 않음
+- 증분: _manifest.json 의 last_id 이후 행만 추가. 이미 내보낸 행의 변경(삭제, 재채점,
+  유사 중복 재판정)이나 TEXT_VERSION 변경은 --full 로 다시 만든다
+- 읽기: 파일 이름의 id 범위로 필요한 파일만 고르고, 열 선택 + memory_map 으로 읽음
+
+예) python -m src.snapshot --export             # 증분 내보내기
+    python -m src.snapshot --export --full      # 전체 다시 만들기
+    python -m src.snapshot --insights --limit 200000 --source coupang   # DB 없이 스냅샷으로 분석
+"""
+import argparse, json, os, re, shutil
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import select
+
+from .config import SNAPSHOT_DIR
+from .db import ReadSession
+from .models import Review
+from .text import TEXT_VERSION, doc_tokens
+
+BATCH = 100_000
+MANIFEST = "_manifest.json"
+_PART_RE = re.compile(r"part-(\d+)-(\d+)\.parquet$")
+
+SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("product_id", pa.int64()),
+    ("rating", pa.float64()),
+    ("review_day", pa.date32()),
+    ("sentiment", pa.float64()),
+    ("sentiment_label", pa.string()),
+    ("dup_of", pa.int64()),
+    ("pain_mask", pa.int64()),
+    ("tokens", pa.string()),        # 불용어 제거 토큰(공백 구분, 현재 TEXT_VERSION 기준)
+    ("body", pa.string()),
+])
+_COLUMNS = (Review.id, Review.source, Review.product_id, Review.rating, Review.review_day, Review.created_at,
+            Review.sentiment, Review.sentiment_label, Review.dup_of,
+            Review.body, Review.tokens, Review.pain_mask, Review.text_ver)
+
+
+class SnapshotMissing(LookupError):
+    # 스냅샷을 아직 내보내지 않았거나 SNAPSHOT_DIR 이 없음(API 는 409)
+    def __init__(self, root: str = SNAPSHOT_DIR):
+        super().__init__(f"no snapshot in {root}; run python -m src.snapshot --export")
+
+
+def load_manifest(root: str = SNAPSHOT_DIR) -> Dict | None:
+    path = os.path.join(root, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(root: str, manifest: Dict):
+    tmp = os.path.join(root, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, os.path.join(root, MANIFEST))
+
+
+def _month(day, created) -> str:
+    d = day or (created.date() if created else None)
+    return d.strftime("%Y-%m") if d else "unknown"
+
+
+def _write_group(root: str, source: str, month: str, cols: Dict[str, list]) -> int:
+    part = os.path.join(root, "reviews", f"source={source}", f"month={month}")
+    os.makedirs(part, exist_ok=True)
+    ids = cols["id"]
+    path = os.path.join(part, f"part-{ids[0]:010d}-{ids[-1]:010d}.parquet")
+    table = pa.Table.from_pydict(cols, schema=SCHEMA)
+    pq.write_table(table, path + ".tmp", compression="zstd")
+    os.replace(path + ".tmp", path)
+    return len(ids)
+
+
+def export(root: str = SNAPSHOT_DIR, full: bool = False, batch: int = BATCH) -> Dict:
+    """
+    last_id 이후 리뷰를 배치(키셋)로 읽어 (source, 월) 파티션 파일로 추가. full=True 면 새로 만든 뒤 교체.
+    반환: {"rows", "files", "last_id", "full"}
+    """
+    manifest = None if full else load_manifest(root)
+    if manifest and manifest.get("text_ver") != TEXT_VERSION:
+        print(f"[SNAPSHOT] text_ver {manifest.get('text_ver')} -> {TEXT_VERSION}, full export")
+        manifest = None
+    full = manifest is None
+    out_root = root + ".tmp" if full else root
+    if full:
+        shutil.rmtree(out_root, ignore_errors=True)
+    os.makedirs(out_root, exist_ok=True)
+
+    last_id = manifest["last_id"] if manifest else 0
+    total_rows = manifest.get("rows", 0) if manifest else 0
+    rows_out, files = 0, 0
+    with ReadSession() as s:
+        while True:
+            rows = s.execute(select(*_COLUMNS).where(Review.id > last_id)
+                             .order_by(Review.id).limit(batch)).all()
+            if not rows:
+                break
+            groups: Dict[Tuple[str, str], Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+            for r in rows:
+                if not r.body:
+                    continue
+                if r.text_ver == TEXT_VERSION and r.tokens is not None:
+                    tokens, mask = r.tokens, r.pain_mask
+                else:
+                    toks, mask = doc_tokens(r.body, r.tokens, r.pain_mask, r.text_ver)
+                    tokens = " ".join(toks)
+                g = groups[(r.source, _month(r.review_day, r.created_at))]
+                for k, v in (("id", r.id), ("product_id", r.product_id), ("rating", r.rating),
+                             ("review_day", r.review_day), ("sentiment", r.sentiment),
+                             ("sentiment_label", r.sentiment_label), ("dup_of", r.dup_of),
+                             ("pain_mask", mask), ("tokens", tokens), ("body", r.body)):
+                    g[k].append(v)
+            for (source, month), cols in groups.items():
+                rows_out += _write_group(out_root, source, month, cols)
+                files += 1
+            last_id = rows[-1].id
+            print(f"[SNAPSHOT] rows={rows_out} files={files} (id<={last_id})", flush=True)
+
+    manifest = {"last_id": last_id, "text_ver": TEXT_VERSION, "rows": total_rows + rows_out,
+                "exported_at": datetime.now(timezone.utc).isoformat()}
+    _write_manifest(out_root, manifest)
+    if full:
+        old = root + ".old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(root):
+            os.replace(root, old)
+        os.replace(out_root, root)
+        shutil.rmtree(old, ignore_errors=True)
+    return {"rows": rows_out, "files": files, "last_id": last_id, "full": full}
+
+
+# ---------------------- 읽기 ----------------------
+def _files(root: str, source: str | None) -> List[Tuple[str, int, int]]:
+    """(경로, 첫 id, 끝 id). source 가 있으면 해당 파티션 디렉터리만."""
+    base = os.path.join(root, "reviews")
+    if not os.path.isdir(base):
+        return []
+    dirs = [f"source={source}"] if source else sorted(os.listdir(base))
+    out = []
+    for d in dirs:
+        sdir = os.path.join(base, d)
+        if not os.path.isdir(sdir):
+            continue
+        for month in sorted(os.listdir(sdir)):
+            mdir = os.path.join(sdir, month)
+            for name in os.listdir(mdir):
+                m = _PART_RE.match(name)
+                if m:
+                    out.append((os.path.join(mdir, name), int(m.group(1)), int(m.group(2))))
+    return out
+
+
+def read_window(limit: int | None, source: str | None = None, columns=("tokens", "pain_mask"),
+                root: str = SNAPSHOT_DIR) -> pa.Table:
+    """
+    유사 중복을 뺀 최근 limit 건(limit=None 이면 전체)의 지정 열.
+    1) 각 파일의 id/dup_of 열만 읽어 창의 하한 id 를 구하고 2) 하한 이상 id 를 가진 파일에서만 본 열을 읽음.
+    """
+    files = _files(root, source)
+    empty = pa.table({c: pa.array([], SCHEMA.field(c).type) for c in columns})
+    if not files:
+        return empty
+    floor = 0
+    if limit is not None:
+        ids = []
+        for path, _, _ in files:
+            t = pq.read_table(path, columns=["id", "dup_of"], memory_map=True)
+            ids.append(t["id"].filter(pc.is_null(t["dup_of"])).to_numpy())
+        ids = np.concatenate(ids)
+        if len(ids) > limit:
+            floor = int(np.partition(ids, len(ids) - limit)[len(ids) - limit])
+    parts = []
+    for path, _, hi in files:
+        if hi < floor:
+            continue
+        t = pq.read_table(path, columns=list(dict.fromkeys(("id", "dup_of", *columns))), memory_map=True)
+        keep = pc.and_(pc.is_null(t["dup_of"]), pc.greater_equal(t["id"], floor))
+        parts.append(t.filter(keep).select(list(columns)))
+    return pa.concat_tables(parts) if parts else empty
+
+
+def snapshot_docs(limit: int | None, source: str | None = None, root: str = SNAPSHOT_DIR) -> List[Tuple[List[str], int]]:
+    """insights._fetch_docs 와 같은 (토큰, 불만 마스크) 목록을 스냅샷에서."""
+    t = read_window(limit, source, ("tokens", "pain_mask"), root)
+    masks = t["pain_mask"].fill_null(0).to_pylist()
+    return [(tok.split() if tok else [], m) for tok, m in zip(t["tokens"].to_pylist(), masks)]
+
+
+def snapshot_sentiment(limit: int | None, source: str | None = None, bins: int = 10,
+                       root: str = SNAPSHOT_DIR) -> Tuple[List, Dict[int, int]]:
+    """insights.sentiment_dict 입력: ([(라벨, 건수, 점수 합)], {구간: 건수})."""
+    t = read_window(limit, source, ("sentiment", "sentiment_label"), root)
+    labels = np.array(t["sentiment_label"].to_pylist(), dtype=object)
+    score = t["sentiment"].to_numpy(zero_copy_only=False).astype(np.float64)
+    by_label = []
+    for label in dict.fromkeys(labels.tolist()):
+        sel = labels == label
+        sc = score[sel]
+        by_label.append((label, int(sel.sum()), float(np.nansum(sc)) if label is not None else None))
+    ok = ~np.isnan(score)
+    b = np.where(score[ok] >= 1, bins - 1, ((score[ok] + 1) * (bins / 2)).astype(np.int64))
+    hist = {int(k): int(v) for k, v in zip(*np.unique(b, return_counts=True))}
+    return by_label, hist
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--export", action="store_true", help="증분 내보내기(처음이면 전체)")
+    ap.add_argument("--full", action="store_true", help="전체 다시 만들기")
+    ap.add_argument("--insights", action="store_true", help="스냅샷으로 인사이트 계산(DB 조회 없음)")
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--source", default=None)
+    ap.add_argument("--dir", default=SNAPSHOT_DIR)
+    args = ap.parse_args()
+    if args.export:
+        out = export(args.dir, full=args.full)
+        print(f"[OK] rows={out['rows']}, files={out['files']}, last_id={out['last_id']}, full={out['full']}")
+    elif args.insights:
+        from .insights import compute_insights
+        out = compute_insights(limit=args.limit, source=args.source, snapshot=args.dir)
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+    else:
+        ap.print_help()
+
+if __name__ == "__main__":
+    main()
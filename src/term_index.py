@@ -0,0 +1,180 @@
+# src/term_index.py
+"""
+소스별 단어/바이그램/불만 라벨 색인(term_stats) 유지 및 조회.
+리뷰가 삽입·삭제될 때 같은 트랜잭션에서 증분 반영하므로, 전체 구간 인사이트는
+코퍼스 크기가 아니라 어휘 크기에 비례하는 시간으로 답할 수 있다.
+
+예) python -m src.term_index --rebuild            # 전체 재구축(최초 1회/정합성 복구)
+    python -m src.term_index --rebuild --source coupang
+"""
+import argparse
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, select, delete, desc, func
+
+from .cache import bump_data_version
+from .db import SessionLocal, dialect_insert
+from .models import Review, TermStat, TermIndexSource
+from .text import PAIN_MATCHER, bigrams, doc_tokens
+
+KINDS = ("uni", "bi", "pain")
+TERM_MAX_LEN = 200     # TermStat.term 길이. 창 분석(insights._analyze_docs)도 같은 상한으로 거름
+# index_reviews 가 받는 행 형태(INSERT/DELETE ... RETURNING 과 재구축 SELECT 공용)
+INDEX_COLUMNS = (Review.id, Review.source, Review.body,
+                 Review.tokens, Review.pain_mask, Review.text_ver)
+
+
+def _doc_terms(body: str, tokens: str | None, mask: int | None, text_ver: int | None) -> Dict[str, Counter]:
+    toks, mask = doc_tokens(body, tokens, mask, text_ver)
+    return {
+        "uni": Counter(toks),
+        "bi": Counter(bigrams(toks)),
+        "pain": Counter(PAIN_MATCHER.labels(mask)),
+    }
+
+
+class _Delta:
+    """(source, kind, term) 별 tf/df 증감 + 소스별 문서 수 증감 집계."""
+
+    def __init__(self):
+        self.terms: Dict[Tuple[str, str, str], List[int]] = defaultdict(lambda: [0, 0])
+        self.docs: Counter = Counter()
+        self.max_id: Dict[str, int] = {}
+
+    def add(self, review_id: int | None, source: str, body: str | None, tokens: str | None = None,
+            mask: int | None = None, text_ver: int | None = None, sign: int = 1):
+        if review_id is not None and sign > 0:
+            self.max_id[source] = max(self.max_id.get(source, 0), review_id)
+        if not body:  # _fetch_docs 와 같이 빈 본문은 분석 대상 아님
+            self.docs[source] += 0  # max_review_id 갱신을 위해 소스 키만 등록
+            return
+        for kind, counts in _doc_terms(body, tokens, mask, text_ver).items():
+            for term, n in counts.items():
+                if len(term) > TERM_MAX_LEN:
+                    continue
+                v = self.terms[(source, kind, term)]
+                v[0] += sign * n
+                v[1] += sign
+        self.docs[source] += sign
+
+    def flush(self, s, chunk: int = 500):
+        if self.terms:
+            stmt = dialect_insert(TermStat.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["source", "kind", "term"],
+                set_={"tf": TermStat.tf + stmt.excluded.tf, "df": TermStat.df + stmt.excluded.df},
+            )
+            s.execute(stmt, [
+                {"source": src, "kind": kind, "term": term, "tf": tf, "df": df}
+                for (src, kind, term), (tf, df) in self.terms.items()
+            ])
+            # df 가 줄어든 키만 골라 0 이하가 된 행 삭제(테이블 전체를 훑지 않음)
+            shrunk = defaultdict(list)
+            for (src, kind, term), v in self.terms.items():
+                if v[1] < 0:
+                    shrunk[(src, kind)].append(term)
+            for (src, kind), terms in shrunk.items():
+                for i in range(0, len(terms), chunk):
+                    s.execute(delete(TermStat).where(
+                        TermStat.source == src, TermStat.kind == kind,
+                        TermStat.term.in_(terms[i:i + chunk]), TermStat.df <= 0))
+        for src, n in self.docs.items():
+            stmt = dialect_insert(TermIndexSource.__table__)
+            mx = self.max_id.get(src, 0)
+            cur = func.coalesce(TermIndexSource.max_review_id, 0)
+            s.execute(
+                stmt.values(source=src, docs=n, max_review_id=mx).on_conflict_do_update(
+                    index_elements=["source"],
+                    set_={"docs": TermIndexSource.docs + n,
+                          "max_review_id": case((cur > mx, cur), else_=mx)},
+                )
+            )
+
+
+def index_reviews(s, rows: Iterable[Tuple], sign: int = 1):
+    """
+    INDEX_COLUMNS 형태 (id, source, body, tokens, pain_mask, text_ver) 행들을 현재 트랜잭션에서
+    색인에 반영. sign=-1 이면 삭제 반영. 커밋은 호출 측(리뷰 INSERT/DELETE 와 같은 트랜잭션).
+    """
+    delta = _Delta()
+    for row in rows:
+        delta.add(*row, sign=sign)
+    delta.flush(s)
+
+
+# ---------------------- 조회 ----------------------
+def index_status(source: str | None = None) -> Dict:
+    """색인 문서 수와 반영된 최대 id (source=None 이면 전체 합)."""
+    with SessionLocal() as s:
+        stmt = select(func.sum(TermIndexSource.docs), func.max(TermIndexSource.max_review_id))
+        if source:
+            stmt = stmt.where(TermIndexSource.source == source)
+        docs, max_id = s.execute(stmt).one()
+    return {"docs": int(docs or 0), "max_review_id": max_id or 0}
+
+def top_terms(kind: str, source: str | None = None, topk: int = 15, min_df: int = 1) -> List[Dict]:
+    with SessionLocal() as s:
+        if source:
+            stmt = (select(TermStat.term, TermStat.tf)
+                    .where(TermStat.source == source, TermStat.kind == kind, TermStat.df >= min_df)
+                    .order_by(desc(TermStat.tf), desc(TermStat.term)).limit(topk))
+        else:
+            tf, df = func.sum(TermStat.tf), func.sum(TermStat.df)
+            stmt = (select(TermStat.term, tf)
+                    .where(TermStat.kind == kind)
+                    .group_by(TermStat.term).having(df >= min_df)
+                    .order_by(desc(tf), desc(TermStat.term)).limit(topk))
+        return [{"term": t, "freq": int(n)} for t, n in s.execute(stmt).all()]
+
+def pain_point_counts(source: str | None = None) -> List[Dict]:
+    with SessionLocal() as s:
+        df = func.sum(TermStat.df)
+        stmt = select(TermStat.term, df).where(TermStat.kind == "pain")
+        if source:
+            stmt = stmt.where(TermStat.source == source)
+        stmt = stmt.group_by(TermStat.term).having(df > 0).order_by(desc(df))
+        return [{"label": t, "count": int(n)} for t, n in s.execute(stmt).all()]
+
+
+# ---------------------- 재구축 ----------------------
+def rebuild(source: str | None = None, batch: int = 20_000) -> Dict:
+    """
+    reviews 전체를 스트리밍으로 읽어 색인을 새로 만든다(메모리는 어휘 크기에 비례).
+    유사 중복(dup_of 있음) 행은 단어 집계에서 빼고 max id 에만 반영.
+    """
+    delta = _Delta()
+    with SessionLocal() as s:
+        stmt = select(*INDEX_COLUMNS, Review.dup_of)
+        if source:
+            stmt = stmt.where(Review.source == source)
+        for *row, dup_of in s.execute(stmt.execution_options(yield_per=batch)):
+            if dup_of is not None:
+                row = (row[0], row[1], None)
+            delta.add(*row)
+
+    with SessionLocal() as s:
+        for model in (TermStat, TermIndexSource):
+            d = delete(model)
+            if source:
+                d = d.where(model.source == source)
+            s.execute(d)
+        delta.flush(s)
+        bump_data_version(s)
+        s.commit()
+    return {"docs": sum(delta.docs.values()), "terms": len(delta.terms)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rebuild", action="store_true", help="reviews 전체로 색인 재구축")
+    ap.add_argument("--source", default=None)
+    args = ap.parse_args()
+    if args.rebuild:
+        out = rebuild(source=args.source)
+        print(f"[OK] indexed docs={out['docs']}, terms={out['terms']}")
+    else:
+        print(index_status(args.source))
+
+if __name__ == "__main__":
+    main()
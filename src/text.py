@@ -0,0 +1,156 @@
+# src/text.py
+"""
+리뷰 텍스트 정규화/토큰화 공통 규칙(분석·색인 공용, sklearn 의존 없음).
+tokenize() 는 CountVectorizer(token_pattern=TOKEN_PATTERN, stop_words=STOPWORDS) 와 같은 토큰열.
+"""
+import re
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Tuple
+
+# 한국어/일반 리뷰에서 자주 등장하는 의미 없는 단어들(필요시 계속 추가)
+STOPWORDS = {
+    "그리고","하지만","해서","해서요","정말","진짜","너무","조금","약간","그냥","아주","매우","많이",
+    "제품","상품","구매","사용","리뷰","후기","평가","배송","포장","판매자","구매자","가격","사진",
+    "같아요","같습니다","듯","부분","정도","이번","이것","저것","그것","거","것","때","보고","보고싶",
+    "좋아요","괜찮아요","추천","비추","만족","불만","최고","최악","문의","답변","설명","상세",
+}
+
+PAIN_KEYWORDS = {
+    "가격":        ["가격","가성비","비싸","비용","할인","쿠폰"],
+    "배송/포장":   ["배송","포장","파손","늦","지연","빠르","택배"],
+    "색상/이미지": ["색상","색깔","컬러","사진","이미지","화면","실물","색감"],
+    "사이즈/규격": ["사이즈","크기","규격","높이","폭","길이","두께","맞지"],
+    "내구성/품질": ["내구","튼튼","약함","헐겁","부러","스크래치","하자","불량","휘어","찍힘"],
+    "설치/조립":   ["설치","조립","설명서","드라이버","피스","구멍","수평","볼트","나사"],
+    "냄새/소음":   ["냄새","향","소음","삐걱","삑","소리"],
+    "착석감/사용감":["편하","불편","앉았","쿠션","등받이","허리","딱딱","푹신"],
+}
+
+TOKEN_PATTERN = r"(?u)[가-힣A-Za-z]{2,}"  # 한글/영문 2자 이상 토큰
+
+# 리뷰에 저장되는 전처리 결과(body_norm/tokens/pain_mask)의 규칙 버전.
+# STOPWORDS / PAIN_KEYWORDS / 토큰 규칙을 바꾸면 올리고 python -m src.backfill_text 로 재계산
+TEXT_VERSION = 1
+
+_RUN_RE = re.compile(r"[가-힣A-Za-z]+")  # TOKEN_PATTERN 의 길이 제한 없는 형태(최대 연속 구간)
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_HANGUL_WORD = re.compile(r"[가-힣]+")
+
+
+class KeywordMatcher:
+    """
+    라벨별 키워드 목록을 한 번에 찾는 다중 패턴 매처(라벨별 개별 검색과 같은 결과).
+    - 전방탐색 교대 정규식 1개로 모든 위치의 최장 키워드를 찾고, 같은 위치의 더 짧은
+      키워드(= 접두사)의 라벨은 미리 합쳐 둔다.
+    - 키워드가 모두 한글이면 일치는 반드시 한 '한글 연속 구간' 안에 있으므로, 토큰화에서
+      이미 얻은 단어 구간별 라벨 비트마스크를 메모해 두고 문서는 사전 조회만으로 판정.
+      (단어별 스캔은 어휘당 1회)
+    """
+
+    MEMO_MAX = 500_000
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.order = list(groups)
+        bit = {label: 1 << i for i, label in enumerate(self.order)}
+        kw_mask = defaultdict(int)
+        for label, kws in groups.items():
+            for k in kws:
+                kw_mask[k] |= bit[label]
+        self._mask = {
+            k: reduce(or_, (kw_mask[p] for p in kw_mask if k.startswith(p)), 0) for k in kw_mask
+        }
+        alts = "|".join(re.escape(k) for k in sorted(kw_mask, key=len, reverse=True))
+        self._re = re.compile(f"(?=({alts}))")
+        self.words_ok = all(_HANGUL_WORD.fullmatch(k) for k in kw_mask)
+        self._memo: Dict[str, int] = {}
+
+    def mask(self, text: str) -> int:
+        return reduce(or_, map(self._mask.__getitem__, set(self._re.findall(text or ""))), 0)
+
+    def mask_words(self, words: List[str]) -> int:
+        """단어(토큰화 전 연속 구간) 목록 → 라벨 비트마스크. words_ok 일 때만 원문 검색과 동일."""
+        memo = self._memo
+        try:
+            return reduce(or_, map(memo.__getitem__, words), 0)
+        except KeyError:
+            if len(memo) >= self.MEMO_MAX:
+                memo.clear()
+            for w in words:
+                if w not in memo:
+                    memo[w] = self.mask(w)
+            return reduce(or_, map(memo.__getitem__, words), 0)
+
+    def labels(self, mask: int) -> List[str]:
+        return [label for i, label in enumerate(self.order) if mask >> i & 1]
+
+
+PAIN_MATCHER = KeywordMatcher(PAIN_KEYWORDS)
+
+
+def normalize(text: str) -> str:
+    if not text:
+        return ""
+    t = text.replace("\n"," ").strip()
+    t = re.sub(r"[^가-힣A-Za-z0-9\s]", " ", t)
+    t = re.sub(r"\s+", " ", t)
+    return t
+
+def word_runs(text: str) -> List[str]:
+    """
+    normalize() → lower() 후 한글/영문 연속 구간(1자 포함)과 같은 결과.
+    normalize 는 구간 밖 문자만 바꾸고 구간 문자의 소문자화는 ASCII 뿐이므로 원문에서 바로 추출.
+    """
+    return _RUN_RE.findall((text or "").translate(_ASCII_LOWER))
+
+def tokens_from_runs(runs: List[str]) -> List[str]:
+    # TOKEN_PATTERN(2자 이상) + 불용어 제거
+    return [w for w in runs if len(w) > 1 and w not in STOPWORDS]
+
+def tokenize(text: str) -> List[str]:
+    # CountVectorizer 기본값(lowercase=True) → token_pattern → 불용어 제거 순서 그대로
+    return tokens_from_runs(word_runs(text))
+
+def bigrams(tokens: List[str]) -> List[str]:
+    return [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+def pain_mask(text: str, runs: List[str] | None = None) -> int:
+    # 원문 기준 부분 문자열 매칭과 동일. runs(word_runs 결과)를 주면 단어 메모 경로 사용
+    if runs is not None and PAIN_MATCHER.words_ok:
+        return PAIN_MATCHER.mask_words(runs)
+    return PAIN_MATCHER.mask(text)
+
+def pain_labels(text: str, runs: List[str] | None = None) -> List[str]:
+    # PAIN_KEYWORDS 순서
+    return PAIN_MATCHER.labels(pain_mask(text, runs))
+
+
+# ---------------------- 저장용 전처리 ----------------------
+def text_features(body: str | None) -> Dict:
+    """
+    INSERT 시 본문과 함께 저장하는 전처리 결과. 본문은 삽입 후 바뀌지 않으므로 한 번만 계산.
+    - body_norm: normalize(body)
+    - tokens: tokenize(body) 를 공백으로 이은 문자열(토큰에는 공백이 없음)
+    - pain_mask: PAIN_KEYWORDS 순서의 라벨 비트마스크
+    """
+    if not body:
+        return {"body_norm": None, "tokens": None, "pain_mask": None, "text_ver": TEXT_VERSION}
+    runs = word_runs(body)
+    return {
+        "body_norm": normalize(body),
+        "tokens": " ".join(tokens_from_runs(runs)),
+        "pain_mask": pain_mask(body, runs),
+        "text_ver": TEXT_VERSION,
+    }
+
+def doc_tokens(body: str | None, tokens: str | None = None, mask: int | None = None,
+               text_ver: int | None = None) -> Tuple[List[str], int]:
+    """
+    저장된 전처리 결과가 현재 규칙 버전이면 그대로, 아니면(백필 전 행) 본문에서 계산.
+    반환: (토큰 목록, 불만 라벨 비트마스크)
+    """
+    if text_ver == TEXT_VERSION and tokens is not None and mask is not None:
+        return tokens.split(), mask
+    runs = word_runs(body)
+    return tokens_from_runs(runs), pain_mask(body, runs)
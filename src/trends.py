@@ -0,0 +1,121 @@
+# src/trends.py
+"""
+기간 버킷(일/주/월)별 리뷰 추세: 건수, 평균 평점, 감성 분포, 상위 단어와 직전 구간 대비 변화.
+review_day(정규화 날짜) 범위 조건 + (product_id, review_day)/(source, review_day) 인덱스로
+필요한 구간만 읽는다. 집계는 DB 에서 일 단위로 한 번 → 주/월은 파이썬에서 합산.
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import case, func, select
+
+from .dates import BUCKETS, bucket_start
+from .db import ReadSession
+from .models import Review
+from .text import doc_tokens
+
+BATCH = 20_000
+
+
+def _filters(product_id: int | None, source: str | None, start: date | None, end: date | None):
+    cond = [Review.dup_of.is_(None)]
+    if product_id is not None:
+        cond.append(Review.product_id == product_id)
+    if source:
+        cond.append(Review.source == source)
+    if start:
+        cond.append(Review.review_day >= start)
+    if end:
+        cond.append(Review.review_day <= end)
+    return cond
+
+
+def _next_bucket(d: date, bucket: str) -> date:
+    if bucket == "day":
+        return d + timedelta(days=1)
+    if bucket == "week":
+        return d + timedelta(days=7)
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _term_shift(cur: Counter, prev: Counter | None, topk: int, min_tf: int = 2) -> Dict[str, List[Dict]]:
+    """직전 구간 대비 단어 비중(tf/전체 tf) 변화 상위(rising)/하위(falling)."""
+    if prev is None or not cur or not prev:
+        return {"rising": [], "falling": []}
+    n_cur, n_prev = sum(cur.values()), sum(prev.values())
+    delta = {t: cur[t] / n_cur - prev[t] / n_prev
+             for t in set(cur) | set(prev) if cur[t] >= min_tf or prev[t] >= min_tf}
+    ranked = sorted(delta.items(), key=lambda x: (x[1], x[0]))
+    fmt = lambda items: [{"term": t, "freq": cur[t], "prev_freq": prev[t], "share_delta": round(d, 4)}
+                         for t, d in items]
+    return {"rising": fmt([x for x in reversed(ranked) if x[1] > 0][:topk]),
+            "falling": fmt([x for x in ranked if x[1] < 0][:topk])}
+
+
+def compute_trends(product_id: int | None = None, source: str | None = None,
+                   start: date | None = None, end: date | None = None,
+                   bucket: str = "week", topk: int = 5) -> Dict:
+    """
+    topk=0 이면 단어 집계(본문/토큰 읽기)는 건너뛰고 수치 추세만.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of {BUCKETS}")
+    cond = _filters(product_id, source, start, end)
+
+    with ReadSession() as s:
+        day = Review.review_day
+        daily = s.execute(
+            select(day, func.count(), func.count(Review.rating), func.sum(Review.rating),
+                   func.count(Review.sentiment), func.sum(Review.sentiment),
+                   func.sum(case((Review.sentiment_label == "positive", 1), else_=0)),
+                   func.sum(case((Review.sentiment_label == "negative", 1), else_=0)))
+            .where(day.is_not(None), *cond).group_by(day).order_by(day)
+        ).all()
+        undated = s.execute(
+            select(func.count()).where(day.is_(None), *_filters(product_id, source, None, None))
+        ).scalar()
+
+        terms: Dict[date, Counter] = defaultdict(Counter)
+        if topk > 0 and daily:
+            stmt = (select(day, Review.body, Review.tokens, Review.pain_mask, Review.text_ver)
+                    .where(day.is_not(None), Review.body.is_not(None), Review.body != "", *cond))
+            for part in s.execute(stmt.execution_options(yield_per=BATCH)).partitions():
+                for d, *doc in part:
+                    terms[bucket_start(d, bucket)].update(doc_tokens(*doc)[0])
+
+    acc: Dict[date, List[float]] = {}
+    for d, n, rn, rsum, sn, ssum, pos, neg in daily:
+        a = acc.setdefault(bucket_start(d, bucket), [0, 0, 0.0, 0, 0.0, 0, 0])
+        for i, v in enumerate((n, rn, rsum or 0.0, sn, ssum or 0.0, pos or 0, neg or 0)):
+            a[i] += v
+
+    series, prev_terms = [], None
+    if acc:
+        cur, last = min(acc), max(acc)
+        while cur <= last:
+            n, rn, rsum, sn, ssum, pos, neg = acc.get(cur, [0, 0, 0.0, 0, 0.0, 0, 0])
+            item = {
+                "period": cur.isoformat(),
+                "count": int(n),
+                "rating_avg": round(rsum / rn, 3) if rn else None,
+                "sentiment_avg": round(ssum / sn, 4) if sn else None,
+                "sentiment": {"positive": int(pos), "negative": int(neg), "neutral": int(sn - pos - neg)},
+            }
+            if topk > 0:
+                tc = terms.get(cur, Counter())
+                item["top_terms"] = [{"term": t, "freq": f}
+                                     for t, f in sorted(tc.items(), key=lambda x: (-x[1], x[0]))[:topk]]
+                item.update(_term_shift(tc, prev_terms, topk))
+                prev_terms = tc
+            series.append(item)
+            cur = _next_bucket(cur, bucket)
+
+    return {
+        "bucket": bucket,
+        "from": start.isoformat() if start else (series[0]["period"] if series else None),
+        "to": end.isoformat() if end else None,
+        "total": int(sum(x["count"] for x in series)),
+        "undated": int(undated or 0),
+        "series": series,
+    }
@@ -1,5 +1,6 @@
 import hashlib
 import json
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 def review_hash(source: str | None, product_url: str | None,
                 body: str | None, review_date: str | None) -> str:
@@ -9,4 +10,25 @@ def review_hash(source: str | None, product_url: str | None,
     payload = json.dumps([
         source or "", product_url or "", body or "", review_date or ""
     ], ensure_ascii=False)
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
\ No newline at end of file
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "src", "spec", "ctag", "lptag", "itime", "wpcid", "wref", "wtime",
+                    "redirect", "mcid", "traceid", "clickbeacon", "campaignid", "sourcetype",
+                    "searchid", "rank", "isaddedcart", "addtag", "pagetype", "pagevalue"}
+
+def canonical_url(url: str | None) -> str | None:
+    """
+    상품 URL 정규화(products.url). 스킴/호스트 소문자, fragment·추적 파라미터 제거, 파라미터 정렬.
+    쿠팡 상품(/vp/products/<id>)은 옵션/판매자(itemId, vendorItemId)와 무관하게 리뷰가 같으므로 경로만.
+    """
+    if not url:
+        return None
+    u = urlsplit(url.strip())
+    host = (u.hostname or "").lower()
+    path = u.path.rstrip("/") or "/"
+    if host.endswith("coupang.com") and path.startswith("/vp/products/"):
+        return urlunsplit(("https", host, path, "", ""))
+    query = sorted((k, v) for k, v in parse_qsl(u.query, keep_blank_values=True)
+                   if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS)
+    netloc = host + (f":{u.port}" if u.port else "")
+    return urlunsplit(((u.scheme or "https").lower(), netloc, path, urlencode(query), ""))
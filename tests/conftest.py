@@ -0,0 +1,27 @@
+# tests/conftest.py
+"""
+테스트 공용 설정: src 모듈을 불러오기 전에 DATABASE_URL/SNAPSHOT_DIR 을 임시 디렉터리로 돌림
+(운영 DB storage/reviews.sqlite3 는 건드리지 않음).
+"""
+import os, tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="reviews_test_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.sqlite3')}"
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ["SNAPSHOT_DIR"] = os.path.join(_TMP, "snapshots")
+
+
+@pytest.fixture
+def db():
+    """빈 스키마의 테스트 DB. 테스트가 끝나면 모든 테이블과 프로세스 안 상품 id 캐시를 비움."""
+    from src import products
+    from src.db import Base, engine
+    from src.init_db import migrate
+    migrate()
+    yield engine
+    with engine.begin() as c:
+        for t in reversed(Base.metadata.sorted_tables):
+            c.execute(t.delete())
+    products._ids.clear()
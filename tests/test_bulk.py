@@ -0,0 +1,96 @@
+# tests/test_bulk.py
+"""
+ingest.bulk: 증분 JSON 배열 파서(작은 READ_SIZE 로 청크 경계를 일부러 흔듦)가 json.loads 와 같은 원소를
+내는지, 깨진 입력은 ValueError 인지, store_stream 이 배치별/오류 건수를 정확히 세는지 확인.
+"""
+import io, json
+
+import pytest
+
+from src.ingest import bulk
+
+ARRAYS = [
+    "[]",
+    " \n [ ] ",
+    '[{"body": "좋아요 👍", "rating": 5}]',
+    '[{"body": "배송 \\"빠름\\" [끝]", "n": {"x": [1, 2, {"y": null}]}}, {"body": "한글 ㅎㅎ"}]',
+    "[1.5, 12e3, -0.25, 100, 0, -7, 3.14159e-2, true, false, null]",
+    '[ {"a" : 1} ,\n {"b" : "\\u00e9\\ud83d\\ude00"} ,\t{"c": -1.0E+2} ]',
+    "[" + ", ".join(json.dumps({"body": "리뷰 " * (i % 9), "rating": i % 5 + 0.5}, ensure_ascii=False)
+                    for i in range(200)) + "]",
+]
+
+
+def _parse(text: str):
+    return [obj for _, obj, _ in bulk.iter_json_array(io.BytesIO(text.encode("utf-8")))]
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 5, 7, 64, 1 << 16])
+@pytest.mark.parametrize("text", ARRAYS, ids=range(len(ARRAYS)))
+def test_matches_json_loads(monkeypatch, read_size, text):
+    monkeypatch.setattr(bulk, "READ_SIZE", read_size)
+    assert _parse(text) == json.loads(text)
+
+
+@pytest.mark.parametrize("text, msg", [
+    ('{"a": 1}', "array expected"),
+    ("", "array expected"),
+    ('[{"a": 1} {"b": 2}]', "',' expected"),
+    ('[{"a": 1}, {"b": 2}', "expected"),
+    ('[{"a": 1}, {"b": ', "invalid JSON"),
+    ("[1, 2,]", "invalid JSON"),
+])
+def test_malformed_raises(monkeypatch, text, msg):
+    monkeypatch.setattr(bulk, "READ_SIZE", 3)
+    with pytest.raises(ValueError, match=msg):
+        _parse(text)
+
+
+def test_elements_before_error_are_yielded(monkeypatch):
+    monkeypatch.setattr(bulk, "READ_SIZE", 4)
+    it = bulk.iter_json_array(io.BytesIO(b'[{"a": 1}, {"b": 2} {"c": 3}]'))
+    assert [next(it)[1], next(it)[1]] == [{"a": 1}, {"b": 2}]
+    with pytest.raises(ValueError):
+        next(it)
+
+
+def test_record_size_limit(monkeypatch):
+    monkeypatch.setattr(bulk, "READ_SIZE", 16)
+    monkeypatch.setattr(bulk, "MAX_RECORD", 100)
+    ok = json.dumps([{"body": "x" * 40}] * 5)          # 원소 하나는 한도 안, 배열 전체는 한도 밖
+    assert len(_parse(ok)) == 5
+    with pytest.raises(ValueError, match="too large"):
+        _parse(json.dumps([{"body": "x"}, {"body": "y" * 300}]))
+
+
+def test_store_stream_counts_per_batch(db):
+    lines = [
+        {"body": "첫 번째 정상 리뷰", "rating": 5},
+        {"body": "평점이 이상함", "rating": "별로"},          # to_row 검증 실패
+        {"body": "두 번째 정상 리뷰", "rating": "4"},
+        "not an object",                                    # 객체 아님
+        None,                                               # 파싱 실패 자리(아래에서 깨진 줄로 대체)
+        {"body": "첫 번째 정상 리뷰", "rating": 5},          # 첫 레코드와 같은 해시 → 중복
+        {"body": "포장이 꼼꼼해서 좋았어요", "source": None},  # source 가 null 이면 기본값(partner)
+        {"body": "네 번째", "rating": [1]},                  # 검증 실패
+    ]
+    text = "\n".join("{broken" if d is None else json.dumps(d, ensure_ascii=False) for d in lines) + "\n\n"
+    out = bulk.store_stream(bulk.iter_ndjson(io.BytesIO(text.encode("utf-8"))), source="partner", batch=2)
+
+    assert (out["inserted"], out["duplicated"], out["errors"]) == (3, 1, 4)
+    assert out["aborted"] is None
+    assert [(b["rows"], b["inserted"], b["duplicated"], b["errors"]) for b in out["batches"]] == [
+        (2, 2, 0, 1),     # 1, 2(오류), 3
+        (2, 1, 1, 2),     # 4(오류), 5(파싱 실패), 6(중복), 7
+        (0, 0, 0, 1),     # 8(오류) — 끝에 남은 오류만 있는 배치도 기록
+    ]
+    assert sum(b["errors"] for b in out["batches"]) == out["errors"]
+    assert sum(b["rows"] for b in out["batches"]) == out["inserted"] + out["duplicated"]
+    assert [e["record"] for e in out["error_detail"]] == [2, 4, 5, 8]
+
+
+def test_store_stream_aborts_on_broken_array_after_storing_prefix(db):
+    text = '[{"body": "하나"}, {"body": "둘", "rating": "x"}, {"body": "셋"} {"body": "넷"}]'
+    out = bulk.store_stream(bulk.iter_json_array(io.BytesIO(text.encode("utf-8"))), batch=10)
+    assert out["inserted"] == 2 and out["errors"] == 1
+    assert "',' expected" in out["aborted"]
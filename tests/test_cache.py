@@ -0,0 +1,81 @@
+# tests/test_cache.py
+"""
+cache: 샤드 쓰기 카운터(합이 쓰기마다 +1), 커밋 감지(since_commit) — 커밋이 없으면 result_version 이
+DB 를 읽지 않고, 같은 프로세스/다른 연결의 커밋은 바로 반영되는지.
+"""
+import threading
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src import cache, insights
+from src.db import SessionLocal, engine, make_engine
+from src.models import DataVersion, Review
+from src.sink import delete_reviews, store_reviews
+
+
+def _count_queries():
+    n = [0]
+
+    def on_exec(*_):
+        n[0] += 1
+    event.listen(engine, "before_cursor_execute", on_exec)
+    return n, lambda: event.remove(engine, "before_cursor_execute", on_exec)
+
+
+def test_bumps_sum_across_shards(db):
+    assert cache.data_version() == 0
+
+    def bump():
+        with SessionLocal() as s:
+            cache.bump_data_version(s)
+            cache.bump_data_version(s)
+            s.commit()
+    threads = [threading.Thread(target=bump) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.data_version() == 12
+    with SessionLocal() as s:
+        assert s.execute(select(func.count()).select_from(DataVersion)).scalar() <= cache.SHARDS
+
+
+def test_result_version_skips_db_until_commit(db):
+    store_reviews([{"body": "배송 빠르고 좋아요"}], source="a")
+    v1 = insights.result_version("a")
+    n, stop = _count_queries()
+    try:
+        assert insights.result_version("a") == v1
+        assert n[0] == 0
+    finally:
+        stop()
+
+    store_reviews([{"body": "포장이 엉망이에요"}], source="b")     # 다른 소스 쓰기도 카운터는 바뀜
+    v2 = insights.result_version("a")
+    assert v2 != v1 and v2[0] == v1[0]
+
+    with SessionLocal() as s:
+        ids = s.execute(select(func.max(Review.id))).scalar()
+    delete_reviews([ids])
+    assert insights.result_version("a") != v2
+
+
+def test_commit_from_other_connection_is_seen(db):
+    v1 = insights.result_version()
+    other = make_engine(str(engine.url))       # 다른 프로세스 대신 별도 엔진(별도 연결)
+    try:
+        with sessionmaker(bind=other)() as s:
+            cache.bump_data_version(s)
+            s.commit()
+    finally:
+        other.dispose()
+    assert insights.result_version() == (v1[0], v1[1] + 1)
+
+
+def test_rolled_back_write_keeps_version(db):
+    v1 = insights.result_version()
+    with SessionLocal() as s:
+        cache.bump_data_version(s)
+        s.rollback()
+    assert insights.result_version() == v1
@@ -0,0 +1,34 @@
+# tests/test_cooccurrence.py
+"""
+cooccurrence.compute_cooccurrence: 어휘 선정(첫 읽기)과 공동출현 행렬(두 번째 읽기)이 같은 창을 보는지.
+두 읽기 사이에 리뷰가 삽입돼도 결과가 삽입 전과 같아야 함.
+"""
+import random
+
+from src import cooccurrence
+from src.sink import store_reviews
+
+WORDS = ["배송", "포장", "가격", "품질", "색상", "사이즈", "냄새", "소음", "교환", "환불", "만족", "추천"]
+
+
+def _reviews(n, seed):
+    rnd = random.Random(seed)
+    return [{"body": " ".join(rnd.sample(WORDS, 4)) + f" 리뷰{seed}_{i}", "review_date": "2024-05-01"}
+            for i in range(n)]
+
+
+def test_window_fixed_between_reads(db, monkeypatch):
+    store_reviews(_reviews(200, 1), source="shop")
+    before = cooccurrence.compute_cooccurrence(limit=120, source="shop", min_count=3)
+    assert before["total"] == 120
+
+    real = cooccurrence._select_vocab
+
+    def select_then_insert(*args, **kwargs):
+        vocab = real(*args, **kwargs)
+        store_reviews(_reviews(50, 2), source="shop")   # 첫 읽기와 두 번째 읽기 사이의 쓰기
+        return vocab
+
+    monkeypatch.setattr(cooccurrence, "_select_vocab", select_then_insert)
+    during = cooccurrence.compute_cooccurrence(limit=120, source="shop", min_count=3)
+    assert during == before
@@ -0,0 +1,104 @@
+# tests/test_crawl_state.py
+"""
+collectors.crawl_state.crawl_pages: 최신순 목록을 페이지 단위로 흉내 내어
+중간에 끊긴 수집 뒤에도 못 본 페이지를 이어서 수집하는지, 완결 뒤에는 새 리뷰에서 멈추는지 확인.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.collectors.crawl_state import crawl_pages, load_state
+from src.db import SessionLocal
+from src.models import Review
+from src.sink import to_row
+
+URL = "https://www.coupang.com/vp/products/77"
+PER_PAGE = 5
+
+
+class Crash(RuntimeError):
+    pass
+
+
+def _review(n: int) -> dict:
+    # n 이 클수록 최신. 하루 1건
+    day = date(2025, 1, 1) + timedelta(days=n)
+    return to_row({"body": f"리뷰 번호 {n} 내용 {'가나다라' * (n % 7 + 1)}", "review_date": day.isoformat(),
+                   "rating": 5}, source="coupang", product_url=URL)
+
+
+class Listing:
+    """최신순 리뷰 목록(페이지당 PER_PAGE 건). fetch 호출 기록 + crash_at 페이지에서 예외."""
+
+    def __init__(self, n: int):
+        self.newest = n - 1
+        self.fetched = []
+
+    def add(self, k: int):
+        self.newest += k
+
+    def crawl(self, max_pages: int, crash_at: int | None = None):
+        def fetch(page: int):
+            if page == crash_at:
+                raise Crash(page)
+            hi = self.newest - (page - 1) * PER_PAGE
+            if hi < 0:
+                return None
+            self.fetched.append(page)
+            return [_review(n) for n in range(hi, max(hi - PER_PAGE, -1), -1)]
+        self.fetched = []
+        return crawl_pages("coupang", URL, fetch, max_pages, sorted_latest=True)
+
+
+def _stored() -> int:
+    with SessionLocal() as s:
+        return s.execute(select(func.count()).select_from(Review)).scalar_one()
+
+
+def test_interrupted_first_crawl_is_resumed(db):
+    lst = Listing(50)   # 10 페이지
+    with pytest.raises(Crash):
+        lst.crawl(max_pages=10, crash_at=4)
+    assert _stored() == 15
+    st = load_state("coupang", URL)
+    assert st["complete"] is False and st["backfill_before"] == (date(2025, 1, 1) + timedelta(days=35)).isoformat()
+
+    # 다음 수집: 1~3 페이지는 이미 저장됐지만 멈추지 않고 4~10 페이지까지 이어서 봄
+    out = lst.crawl(max_pages=10)
+    assert lst.fetched == list(range(1, 11))
+    assert out["inserted"] == 35 and _stored() == 50
+    assert load_state("coupang", URL)["complete"] is True
+
+    # 완결 뒤 새 리뷰 7건: 이미 저장된 리뷰가 나온 2 페이지에서 멈춤
+    lst.add(7)
+    out = lst.crawl(max_pages=10)
+    assert lst.fetched == [1, 2]
+    assert out["inserted"] == 7 and _stored() == 57
+
+
+def test_head_crawl_interrupted_before_known_reviews(db):
+    lst = Listing(20)
+    lst.crawl(max_pages=10)
+    assert _stored() == 20 and load_state("coupang", URL)["complete"] is True
+
+    # 새 리뷰 3 페이지분: 2 페이지에서 끊기면 3 페이지(사이 구간)가 빠진 채 남음
+    lst.add(15)
+    with pytest.raises(Crash):
+        lst.crawl(max_pages=10, crash_at=3)
+    assert _stored() == 30 and load_state("coupang", URL)["complete"] is False
+
+    # 1 페이지의 저장된 리뷰에서 멈추지 않고, 원래 완결 구간(4 페이지)에 닿을 때 멈춤
+    out = lst.crawl(max_pages=10)
+    assert lst.fetched == [1, 2, 3, 4]
+    assert out["inserted"] == 5 and _stored() == 35
+    assert load_state("coupang", URL)["complete"] is True
+
+
+def test_page_budget_counts_only_pages_with_new_reviews(db):
+    lst = Listing(40)   # 8 페이지
+    lst.crawl(max_pages=3)
+    assert _stored() == 15 and load_state("coupang", URL)["complete"] is False
+    lst.crawl(max_pages=3)   # 1~3 은 따라잡기(예산 제외), 4~6 이 새 페이지
+    assert lst.fetched == [1, 2, 3, 4, 5, 6]
+    assert _stored() == 30
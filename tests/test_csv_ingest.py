@@ -0,0 +1,147 @@
+# tests/test_csv_ingest.py
+"""
+ingest.csv_to_sqlite: 일괄/스트리밍 적재가 예전 행 단위 적재기(pd.read_csv 전체 추론 + iterrows +
+str(작성일))와 같은 hash_id/review_date 를 만드는지 확인(이미 적재한 CSV 를 다시 넣어도 중복으로 걸러짐).
+"""
+from io import StringIO
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+from src.db import SessionLocal
+from src.ingest import csv_to_sqlite as ingest
+from src.models import Review
+from src.utils import review_hash
+
+DATES = {
+    "text": ["2024-05-01", "2024.05.02", "3일 전", "", "2024-05-04"],
+    "int": ["20240501", "20240502", "20240503", "20240504", "20240505"],
+    "int_blank": ["20240501", "", "20240503", "20240504", "20240505"],
+    "float": ["20240501", "20240502.5", "20240503", "1e3", "20240505"],
+    "bool": ["true", "FALSE", "", "True", "false"],
+    "mixed": ["20240501", "20240502", "20240503", "20240504", "어제"],
+    "blank": ["", "", "", "", ""],
+}
+
+
+def _write(tmp_path, dates, name="reviews.csv"):
+    p = tmp_path / name
+    bodies = [f"본문 {i} " + "좋아요 " * (i + 1) for i in range(len(dates))]
+    df = pd.DataFrame({"product_url": [f"https://shop.example/p/{i % 2}" for i in range(len(dates))],
+                       "rating": [5, 4, "", 2, 1][:len(dates)], "body": bodies, "review_date": dates})
+    df.to_csv(p, index=False)
+    return str(p)
+
+
+def _baseline(path, source="partner"):
+    # 예전 csv_to_sqlite.ingest_csv 의 해시 입력(파일 전체 dtype 추론 + 행 Series 값)
+    df = pd.read_csv(path)
+    out = {}
+    for _, r in df.iterrows():
+        review_date = str(r.get("review_date"))
+        out[review_hash(source, r.get("product_url"), r.get("body"), review_date)] = review_date
+    return out
+
+
+def _stored():
+    with SessionLocal() as s:
+        return dict(s.execute(select(Review.hash_id, Review.review_date)).all())
+
+
+@pytest.mark.parametrize("case", sorted(DATES))
+def test_ingest_csv_matches_baseline_hashes(db, tmp_path, case):
+    path = _write(tmp_path, DATES[case])
+    ingest.ingest_csv(path, "partner", "generic")
+    assert _stored() == _baseline(path)
+
+
+@pytest.mark.parametrize("case", ["int_blank", "float", "mixed", "text"])
+def test_stream_matches_baseline_hashes(db, tmp_path, case):
+    # 청크 ~2 행: 청크마다 추론이 달랐다면(빈 칸 있는/없는 청크) 해시가 갈렸을 입력
+    path = _write(tmp_path, DATES[case])
+    ingest.ingest_csv_stream([path], "partner", "generic", chunk_bytes=120, workers=2)
+    assert _stored() == _baseline(path)
+
+
+def test_date_kind_follows_pandas_inference():
+    cases = [["1", "2"], ["1", None], ["1", "2.5"], [" 1", "+2"], ["007"], ["1e3"], ["inf", "1"],
+             ["1_000"], ["True", "false"], ["True", None], ["True", "1"], ["1e400"],
+             ["9223372036854775808", "1"], ["9223372036854775808", "-1"], [None, None]]
+    dtype_kind = {"i": "int", "u": "int", "f": "float", "b": "bool", "O": "str"}
+    for vals in cases:
+        csv = "d\n" + "\n".join("" if v is None else v for v in vals) + "\n"
+        inferred = pd.read_csv(StringIO(csv), skip_blank_lines=False)["d"]
+        vals = [float("nan") if v is None else v for v in vals]   # 문자열로 읽은 빈 칸 = NaN
+        kind = ingest.date_kind(ingest._value_kinds(vals))
+        want = dtype_kind[inferred.dtype.kind]
+        if want == "str" and inferred.dropna().map(type).eq(bool).all() and len(inferred.dropna()):
+            want = "bool"   # bool + NaN 은 object 컬럼에 bool 값
+        assert kind == want, vals
+        assert [ingest._date_text(v, kind) for v in vals] == [str(v) for v in inferred.tolist()], vals
+
+
+# ---------------------- 스트리밍 재개 ----------------------
+def _messy_csv(tmp_path, n=60):
+    # 여러 줄 따옴표 필드, "" 이스케이프, 빈 줄, CRLF 가 섞인 파일
+    lines = ["product_url,rating,body,review_date"]
+    for i in range(n):
+        body = f'"리뷰 {i}\r\n둘째 줄 ""인용"" {i}"' if i % 3 == 0 else f"리뷰 {i} 한 줄 {'좋아요 ' * (i % 5)}"
+        lines.append(f"https://shop.example/p/{i % 4},{i % 5 + 1},{body},2024-05-{i % 28 + 1:02d}")
+        if i % 7 == 0:
+            lines.append("")
+    p = tmp_path / "messy.csv"
+    p.write_bytes(("\r\n".join(lines) + "\r\n").encode("utf-8"))
+    return str(p)
+
+
+def test_ranges_split_only_at_record_boundaries(tmp_path):
+    path = _messy_csv(tmp_path)
+    header = ingest._header(path)
+    ranges = list(ingest._ranges(path, len(header), 100))
+    assert ranges[0][0] == len(header) and len(ranges) > 5
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    frames = [pd.read_csv(StringIO((header + open(path, "rb").read()[lo:hi]).decode()), dtype=str)
+              for lo, hi in ranges]
+    whole = pd.read_csv(path, dtype=str)
+    assert pd.concat(frames, ignore_index=True).equals(whole)
+
+
+def test_stream_resumes_from_byte_offset(db, tmp_path, monkeypatch):
+    path = _messy_csv(tmp_path)
+    expected = len(pd.read_csv(path))
+    real = ingest.upsert_rows
+    calls = []
+
+    def crash_after_3(s, rows):
+        if len(calls) == 3:
+            raise KeyboardInterrupt("stop after chunk 3")
+        calls.append(len(rows))
+        return real(s, rows)
+
+    monkeypatch.setattr(ingest, "upsert_rows", crash_after_3)
+    with pytest.raises(KeyboardInterrupt):
+        ingest.ingest_csv_stream([path], "partner", "generic", chunk_bytes=200, workers=2)
+    done = sum(calls)
+    assert 0 < done < expected and len(_stored()) == done
+
+    # 재개: 저장된 바이트 위치로 이동 → 이미 넣은 행을 다시 보내지 않음(중복 0)
+    monkeypatch.setattr(ingest, "upsert_rows", real)
+    header_len = len(ingest._header(path))
+    reads = []
+    real_ranges = ingest._ranges
+    monkeypatch.setattr(ingest, "_ranges", lambda p, start, n: reads.append(start) or real_ranges(p, start, n))
+    out = ingest.ingest_csv_stream([path], "partner", "generic", chunk_bytes=200, workers=2)
+    assert out == {"inserted": expected - done, "duplicated": 0}
+    assert reads[-1] > header_len
+    assert len(_stored()) == expected
+    assert set(_stored()) == set(_baseline_stream(path))
+
+    # 끝난 파일은 건너뜀
+    assert ingest.ingest_csv_stream([path], "partner", "generic", chunk_bytes=200, workers=2) == \
+        {"inserted": 0, "duplicated": 0}
+
+
+def _baseline_stream(path, source="partner"):
+    df = pd.read_csv(path, dtype=str)
+    return [review_hash(source, u, b, str(d)) for u, b, d in zip(df.product_url, df.body, df.review_date)]
@@ -0,0 +1,57 @@
+# tests/test_dates.py
+"""dates.parse_review_date: 절대 날짜 표기들, 상대 날짜(수집 시각 기준, REVIEW_TZ 날짜), 해석 불가 입력."""
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.dates import TZ, parse_review_date
+
+REF = datetime(2024, 3, 31, 12, 0, tzinfo=timezone.utc)      # REVIEW_TZ 기준으로도 3월 31일 낮
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-05-01", date(2024, 5, 1)),
+    ("2024.5.1", date(2024, 5, 1)),
+    ("2024/05/01 13:20", date(2024, 5, 1)),
+    ("2024년 5월 1일", date(2024, 5, 1)),
+    ("작성일 2024. 05. 01.", date(2024, 5, 1)),
+    ("24.05.01", date(2024, 5, 1)),
+    ("2024-02-30", None),                    # 없는 날짜
+    ("2024-13-01", None),
+])
+def test_absolute_dates_ignore_ref(value, expected):
+    assert parse_review_date(value) == expected
+    assert parse_review_date(value, REF) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("3일 전", date(2024, 3, 28)),
+    ("2주 전", date(2024, 3, 17)),
+    ("1주일 전", date(2024, 3, 24)),
+    ("1개월 전", date(2024, 2, 29)),         # 말일 보정(윤년)
+    ("한 달 전", None),                       # 숫자 없는 표현은 해석하지 않음
+    ("13달 전", date(2023, 2, 28)),
+    ("1년 전", date(2023, 3, 31)),
+    ("오늘", date(2024, 3, 31)),
+    ("어제", date(2024, 3, 30)),
+    ("그저께", date(2024, 3, 29)),
+    ("30분 전", date(2024, 3, 31)),
+])
+def test_relative_dates(value, expected):
+    assert parse_review_date(value, REF) == expected
+
+
+def test_relative_needs_ref_and_uses_review_tz():
+    assert parse_review_date("3일 전") is None
+    assert parse_review_date("3일 전", date(2024, 1, 2)) == date(2023, 12, 30)
+    late = datetime(2024, 1, 1, 23, 30, tzinfo=TZ)
+    assert parse_review_date("2시간 전", late) == date(2024, 1, 1)
+    assert parse_review_date("2시간 전", datetime(2024, 1, 1, 1, 0, tzinfo=TZ)) == date(2023, 12, 31)
+    # naive datetime 은 UTC(DB created_at)로 봄
+    naive = datetime(2024, 1, 1, 23, 0)
+    assert parse_review_date("오늘", naive) == naive.replace(tzinfo=timezone.utc).astimezone(TZ).date()
+
+
+@pytest.mark.parametrize("value", [None, "", "   ", "최근", "2024", "날짜 없음"])
+def test_unparseable(value):
+    assert parse_review_date(value, REF) is None
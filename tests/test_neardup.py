@@ -0,0 +1,97 @@
+# tests/test_neardup.py
+"""
+neardup: check/register 판정(배치 안/저장된 원본, 상품 구분, 짧은 리뷰), NEAR_DUP_MODE link/skip 저장,
+원본 삭제 시 가장 먼저 저장된 유사 중복이 새 원본으로 올라가는지(dup_of/밴드/용어 색인).
+"""
+from sqlalchemy import func, select
+
+from src import neardup, sink, term_index
+from src.db import SessionLocal
+from src.models import Review, ReviewBand, TermIndexSource, TermStat
+from src.sink import delete_reviews, store_reviews
+
+BODY = "배송이 정말 빠르고 포장도 꼼꼼해서 아주 만족스러운 구매였습니다 재구매 의사 있어요"
+URL = "https://shop.example.com/products/1"
+
+
+def _variants(n):
+    # 공백/문장부호/이모지만 다른 재수집본(정규화하면 같은 본문)
+    marks = ["!", " 👍", "~~", "!!", " ^^", "..."]
+    return [{"body": BODY + marks[i % len(marks)] * (i // len(marks) + 1), "product_url": URL,
+             "review_date": f"2024-05-0{i + 1}"} for i in range(n)]
+
+
+def _dup_map():
+    with SessionLocal() as s:
+        return dict(s.execute(select(Review.id, Review.dup_of).order_by(Review.id)).all())
+
+
+def _bands(rid):
+    with SessionLocal() as s:
+        return s.execute(select(func.count()).where(ReviewBand.review_id == rid)).scalar()
+
+
+def _index():
+    with SessionLocal() as s:
+        terms = {(r.source, r.kind, r.term): (r.tf, r.df) for r in s.execute(select(TermStat)).scalars()}
+        docs = {r.source: r.docs for r in s.execute(select(TermIndexSource)).scalars()}
+    return terms, docs
+
+
+def test_check_within_batch_and_against_stored(db):
+    items = [(BODY, 1), (BODY + "!!", 1), (BODY, 2), ("좋아요", 1)]
+    with SessionLocal() as s:
+        targets, keys = neardup.check(s, items)
+        assert targets == [None, ("row", 0), None, None]
+        assert keys[3] is None and keys[0] is not None
+        assert (keys[0] == neardup.keys_for(items)[0]).all()
+
+        s.add(Review(id=10, source="a", body=BODY, product_id=1, hash_id="h10"))
+        neardup.register(s, [10], [keys[0]])
+        s.flush()
+        targets, _ = neardup.check(s, [(BODY + " 👍", 1), (BODY + " 👍", 2), ("전혀 다른 내용의 리뷰 본문입니다 길게", 1)])
+        assert targets == [("id", 10), None, None]
+        s.rollback()
+
+
+def test_link_mode_stores_duplicate_with_dup_of(db, monkeypatch):
+    monkeypatch.setattr(sink, "NEAR_DUP_MODE", "link")
+    assert store_reviews(_variants(3), source="a") == (3, 0)
+    ids = list(_dup_map())
+    assert _dup_map() == {ids[0]: None, ids[1]: ids[0], ids[2]: ids[0]}
+    assert _bands(ids[0]) == neardup.BANDS and _bands(ids[1]) == 0
+    assert term_index.index_status("a")["docs"] == 1
+
+
+def test_skip_mode_drops_duplicate(db, monkeypatch):
+    monkeypatch.setattr(sink, "NEAR_DUP_MODE", "skip")
+    assert store_reviews(_variants(1), source="a") == (1, 0)
+    assert store_reviews(_variants(3)[1:], source="a") == (0, 2)
+    assert list(_dup_map().values()) == [None]
+
+
+def test_deleting_original_promotes_earliest_duplicate(db, monkeypatch):
+    monkeypatch.setattr(sink, "NEAR_DUP_MODE", "link")
+    store_reviews(_variants(4), source="a")
+    store_reviews([{"body": "전혀 다른 내용의 리뷰 본문입니다 품질 최고", "product_url": URL}], source="a")
+    o, d1, d2, d3, other = list(_dup_map())
+
+    assert delete_reviews([o, d3]) == 2
+    assert _dup_map() == {d1: None, d2: d1, other: None}
+    assert _bands(o) == 0 and _bands(d1) == neardup.BANDS
+
+    terms, docs = _index()
+    assert docs["a"] == 2
+    term_index.rebuild()
+    assert _index() == (terms, docs)
+
+    # 새 재수집본은 올라간 원본에 연결됨
+    store_reviews([{"body": BODY + "?!", "product_url": URL, "review_date": "2024-06-01"}], source="a")
+    assert list(_dup_map().values())[-1] == d1
+
+
+def test_deleting_original_with_all_duplicates(db, monkeypatch):
+    monkeypatch.setattr(sink, "NEAR_DUP_MODE", "link")
+    store_reviews(_variants(3), source="a")
+    assert delete_reviews(list(_dup_map())) == 3
+    assert _dup_map() == {} and _index() == ({}, {"a": 0})
@@ -0,0 +1,102 @@
+# tests/test_pool.py
+"""
+collectors.pool: run_url_queue + HostRateLimiter 를 로컬 http.server 에 붙여
+서버가 실제로 받은 요청 간격이 호스트 레이트 상한을 넘지 않는지 확인.
+"""
+import threading, time, urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.collectors.pool import HostRateLimiter, run_url_queue
+
+RATE = 20.0   # 건/초
+
+
+@pytest.fixture
+def server():
+    hits = []
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                hits.append((time.monotonic(), self.path))
+            body = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _fetch(url: str) -> int:
+    with urllib.request.urlopen(url, timeout=5) as r:
+        r.read()
+    return 1
+
+
+def _assert_rate(hits, n: int, rate: float, burst: int = 1):
+    times = sorted(t for t, _ in hits)
+    assert len(times) == n
+    # 토큰 버킷: 처음 burst 건 이후로는 1/rate 초에 1건 → n 건에 최소 (n - burst)/rate 초
+    span = times[-1] - times[0]
+    assert span >= (n - burst) / rate * 0.9
+    # 어느 구간을 잘라 봐도 1초 창 안의 요청 수가 rate + burst 를 넘지 않음
+    for i, t0 in enumerate(times):
+        in_window = sum(1 for t in times[i:] if t - t0 < 1.0)
+        assert in_window <= rate + burst
+
+
+def test_queue_limits_request_rate_across_workers(server):
+    base, hits = server
+    urls = [f"{base}/p/{i}" for i in range(12)]
+    limiter = HostRateLimiter(rate=RATE, burst=1)
+    results = run_url_queue(urls, lambda ctx, u: _fetch(u), workers=4, limiter=limiter)
+
+    assert [r["url"] for r in results] == urls
+    assert all(r["ok"] and r["inserted"] == 1 for r in results)
+    assert {r["worker"] for r in results} == {0, 1, 2, 3}
+    _assert_rate(hits, len(urls), RATE)
+
+
+def test_handler_acquires_per_request(server):
+    # URL 당 요청 여러 건(탐색 + 재접속 등): handler 가 요청마다 토큰을 받고 큐에는 limiter 를 넘기지 않음
+    base, hits = server
+    limiter = HostRateLimiter(rate=RATE, burst=1)
+
+    def handler(ctx, url):
+        for k in range(3):
+            limiter.acquire(url)
+            _fetch(f"{url}?r={k}")
+        return 3
+
+    urls = [f"{base}/p/{i}" for i in range(5)]
+    results = run_url_queue(urls, handler, workers=3)
+
+    assert all(r["ok"] for r in results)
+    _assert_rate(hits, 3 * len(urls), RATE)
+
+
+def test_limiter_buckets_are_per_host():
+    clock = [0.0]
+    slept = []
+
+    def sleep(s):
+        slept.append(s)
+        clock[0] += s
+
+    lim = HostRateLimiter(rate=1.0, burst=1, clock=lambda: clock[0], sleep=sleep)
+    assert lim.acquire("http://a.example/x") == 0
+    assert lim.acquire("http://b.example/x") == 0       # 다른 호스트는 별도 버킷
+    assert lim.acquire("http://a.example/y") == pytest.approx(1.0)
+    assert slept == [pytest.approx(1.0)]
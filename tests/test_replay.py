@@ -0,0 +1,36 @@
+# tests/test_replay.py
+"""
+collectors.replay: 스냅샷 수집 시각(파일명/수정 시각)을 상대 날짜 기준으로 써서
+같은 스냅샷을 언제 재처리해도 같은 review_day/hash_id 가 나오는지 확인.
+"""
+import os
+from datetime import datetime, timezone
+
+from src.collectors.replay import captured_at
+from src.sink import to_row
+
+
+def test_captured_at_from_collector_filename(tmp_path):
+    p = tmp_path / "123_20260101-120000-250Z_loaded.html"
+    p.write_text("")
+    assert captured_at(str(p)) == datetime(2026, 1, 1, 12, 0, 0, 250_000, tzinfo=timezone.utc)
+
+
+def test_captured_at_falls_back_to_mtime(tmp_path):
+    p = tmp_path / "loaded.html"
+    p.write_text("")
+    t = datetime(2025, 12, 31, 15, 30, tzinfo=timezone.utc)
+    os.utime(p, (t.timestamp(), t.timestamp()))
+    assert captured_at(str(p)) == t
+
+
+def test_relative_date_hash_depends_on_capture_time_only():
+    item = {"source": "coupang", "product_url": "https://www.coupang.com/vp/products/1",
+            "body": "좋아요", "review_date": "3일 전"}
+    at = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    a = to_row({**item, "crawled_at": at})
+    b = to_row({**item, "crawled_at": at})
+    later = to_row({**item, "crawled_at": datetime(2026, 1, 5, 12, tzinfo=timezone.utc)})
+    assert a["review_day"].isoformat() == "2025-12-29"
+    assert a["hash_id"] == b["hash_id"]
+    assert later["hash_id"] != a["hash_id"]   # 다른 시각에 본 "3일 전" 은 다른 날
@@ -0,0 +1,87 @@
+# tests/test_reviews_api.py
+"""
+GET /api/reviews 키셋 페이지: X-Next-Cursor 를 따라가면 id 내림차순 전체를 누락/중복 없이 보고,
+페이지를 넘기는 사이 삽입된 리뷰가 뒤 페이지를 밀지 않음. NDJSON 내보내기도 같은 순서/커서/limit.
+"""
+import json
+
+import pytest
+
+from src import app as app_module
+from src.sink import store_reviews
+
+URL_A = "https://shop.example.com/item?id=1"
+URL_B = "https://shop.example.com/item?id=2"
+
+
+@pytest.fixture
+def client(db):
+    reviews = [{"body": f"리뷰 본문 {i}번 {'가' * i}", "source": "a" if i % 3 else "b",
+                "product_url": URL_A if i % 2 else URL_B, "review_date": "2024-05-01"} for i in range(45)]
+    store_reviews(reviews)
+    return app_module.app.test_client()
+
+
+def _walk(client, query, limit):
+    ids, cursor = [], None
+    while True:
+        r = client.get(f"/api/reviews?limit={limit}{query}" + (f"&cursor={cursor}" if cursor else ""))
+        assert r.status_code == 200
+        page = r.get_json()
+        assert len(page) <= limit
+        ids += [x["id"] for x in page]
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+        assert int(cursor) == page[-1]["id"]
+
+
+def _all(client, query=""):
+    return [x["id"] for x in client.get(f"/api/reviews?limit=1000{query}").get_json()]
+
+
+@pytest.mark.parametrize("query", ["", "&source=a", "&source=b", f"&product_url={URL_A}", "&source=a&product_id=2"])
+@pytest.mark.parametrize("limit", [1, 7, 15, 45])
+def test_cursor_walk_covers_everything_once(client, query, limit):
+    whole = _all(client, query)
+    assert whole == sorted(whole, reverse=True)
+    assert _walk(client, query, limit) == whole
+
+
+def test_filters(client):
+    rows = client.get("/api/reviews?limit=100&source=b").get_json()
+    assert rows and {r["source"] for r in rows} == {"b"}
+    rows = client.get(f"/api/reviews?limit=100&product_url={URL_A}").get_json()
+    assert rows and {r["product_url"] for r in rows} == {URL_A}
+    assert client.get("/api/reviews?product_url=https://unknown.example.com/x").get_json() == []
+
+
+def test_inserts_between_pages_do_not_shift_cursor(client):
+    first = client.get("/api/reviews?limit=10")
+    cursor = first.headers["X-Next-Cursor"]
+    before = client.get(f"/api/reviews?limit=10&cursor={cursor}").get_json()
+    store_reviews([{"body": f"새 리뷰 {i}", "source": "a"} for i in range(5)])
+    assert client.get(f"/api/reviews?limit=10&cursor={cursor}").get_json() == before
+
+
+def test_ndjson_export(client):
+    whole = _all(client)
+    def ndjson(q):
+        r = client.get(f"/api/reviews?format=ndjson{q}")
+        assert r.mimetype == "application/x-ndjson"
+        return [json.loads(line)["id"] for line in r.get_data(as_text=True).splitlines()]
+
+    assert ndjson("") == whole
+    assert ndjson("&limit=12") == whole[:12]
+    assert ndjson(f"&cursor={whole[9]}&limit=5") == whole[10:15]
+    r = client.get("/api/reviews?limit=3", headers={"Accept": "application/x-ndjson"})
+    assert len(r.get_data(as_text=True).splitlines()) == 3
+
+
+def test_ndjson_batches(client, monkeypatch):
+    monkeypatch.setattr(app_module, "EXPORT_BATCH", 4)     # 배치 경계를 여러 번 넘김
+    whole = _all(client)
+    r = client.get("/api/reviews?format=ndjson&limit=10")
+    assert [json.loads(x)["id"] for x in r.get_data(as_text=True).splitlines()] == whole[:10]
+    r = client.get("/api/reviews?format=ndjson")
+    assert [json.loads(x)["id"] for x in r.get_data(as_text=True).splitlines()] == whole
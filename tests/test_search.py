@@ -0,0 +1,91 @@
+# tests/test_search.py
+"""
+search: 사용자 질의 → FTS5 식(build_query), 잘못된 입력은 SearchError, rank/recent 키셋 커서로
+페이지를 끝까지 넘기면 한 번에 받은 결과와 같은 순서·같은 집합(누락/중복 없음).
+"""
+import pytest
+
+from src.search import SearchError, _cursor, build_query, search
+from src.sink import store_reviews
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("삐걱", '"삐걱"*'),
+    ("  삐걱   소리 ", '"삐걱"* AND "소리"*'),
+    ('삐걱 "배송 느" -환불', '("삐걱"* AND "배송 느"*) NOT "환불"*'),
+    ('-"부분 환불" 교환 -반품', '(("교환"*) NOT "부분 환불"*) NOT "반품"*'),
+    ('say"hi', '"say""hi"*'),
+    ('AND OR NEAR', '"AND"* AND "OR"* AND "NEAR"*'),     # 연산자 단어도 그냥 검색어
+    ("교환 - 환불", '"교환"* AND "환불"*'),
+])
+def test_build_query(q, expected):
+    assert build_query(q) == expected
+
+
+@pytest.mark.parametrize("q", ["", "   ", "-환불", '""', "- -"])
+def test_build_query_needs_positive_term(q):
+    with pytest.raises(SearchError):
+        build_query(q)
+
+
+def test_cursor_parsing():
+    assert _cursor("rank", None) is None
+    assert _cursor("rank", "-1.25e-06:42") == (-1.25e-06, 42)
+    assert _cursor("recent", "42") == 42
+    for sort, bad in (("rank", "42"), ("rank", "x:1"), ("recent", "1.5"), ("recent", "a")):
+        with pytest.raises(SearchError):
+            _cursor(sort, bad)
+
+
+@pytest.fixture
+def corpus(db):
+    bodies = []
+    for i in range(37):
+        extra = " 삐걱" * (i % 4)               # BM25 점수 동률 묶음이 여럿 생기도록
+        bodies.append(f"의자 {i}번 후기 삐걱거려요{extra} 조립 설명서{' 환불' if i % 5 == 0 else ''}")
+    bodies += ["전혀 관계없는 리뷰 본문 첫째", "전혀 관계없는 리뷰 본문 둘째"]
+    store_reviews([{"body": b, "review_date": "2024-05-01"} for b in bodies], source="shop")
+    return bodies
+
+
+def _all_pages(q, sort, limit, **kw):
+    items, cursor, pages = [], None, 0
+    while True:
+        out = search(q, sort=sort, limit=limit, cursor=cursor, **kw)
+        items += out["items"]
+        pages += 1
+        cursor = out["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.parametrize("sort", ["rank", "recent"])
+@pytest.mark.parametrize("limit", [1, 4, 7, 37, 100])
+def test_keyset_pages_match_single_query(corpus, sort, limit):
+    whole = search("삐걱", sort=sort, limit=200)["items"]
+    assert len(whole) == 37
+    paged, pages = _all_pages("삐걱", sort, limit)
+    assert [r["id"] for r in paged] == [r["id"] for r in whole]
+    assert pages == 37 // limit + 1
+
+
+def test_rank_order_and_filters(corpus):
+    items = search("삐걱", sort="rank", limit=200)["items"]
+    scores = [r["score"] for r in items]
+    assert scores == sorted(scores)
+    recent = [r["id"] for r in search("삐걱", sort="recent", limit=200)["items"]]
+    assert recent == sorted(recent, reverse=True)
+    assert len(search('삐걱 -환불', limit=200)["items"]) == 37 - 8
+    assert search("삐걱", source="other")["items"] == []
+    assert all("[" in r["snippet"] for r in items)
+
+
+def test_bad_arguments(corpus):
+    with pytest.raises(SearchError):
+        search("삐걱", sort="oldest")
+    with pytest.raises(SearchError):
+        search("삐걱", pain="없는라벨")
+    for raw in ('"unterminated', "foo:bar", "AND", "*", "(삐걱"):
+        with pytest.raises(SearchError):
+            search(raw, raw=True)
+    assert len(search('"삐걱"* NOT 환불', raw=True, limit=200)["items"]) == 37 - 8
@@ -0,0 +1,34 @@
+# tests/test_snapshot_api.py
+"""
+/api/insights?snapshot=1: 스냅샷을 내보내기 전에는 빈 결과가 아니라 409, 내보낸 뒤에는 스냅샷 기준 결과.
+"""
+import pytest
+
+from src import app as app_module
+from src import insights, snapshot
+from src.sink import store_reviews
+
+
+@pytest.fixture
+def client(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "SNAPSHOT_DIR", str(tmp_path / "snap"))
+    monkeypatch.setattr(insights, "SNAPSHOT_DIR", str(tmp_path / "snap"))
+    return app_module.app.test_client()
+
+
+def test_snapshot_insights_without_export_is_409(client):
+    for q in ("snapshot=1", "snapshot=1&async=1"):
+        r = client.get(f"/api/insights?{q}")
+        assert r.status_code == 409
+        assert "python -m src.snapshot" in r.get_json()["error"]
+
+
+def test_snapshot_insights_after_export(client, tmp_path):
+    bodies = ["배송 빠르고 포장 꼼꼼해요", "색상이 사진과 달라서 실망", "가격 대비 품질 최고",
+              "사이즈가 작아서 교환했어요", "냄새가 심해서 환불 요청"]
+    store_reviews([{"body": b, "review_date": "2024-05-01"} for b in bodies], source="shop")
+    snapshot.export(str(tmp_path / "snap"))
+    r = client.get("/api/insights?snapshot=1&min_df=1")
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["total"] == 5 and data["snapshot"]["last_id"] >= 5
@@ -0,0 +1,69 @@
+# tests/test_term_index.py
+"""
+term_index: 삽입·삭제마다의 증분 반영(index_reviews) 결과가 rebuild() 로 처음부터 만든 색인과 같은지,
+TERM_MAX_LEN 상한이 색인 경로와 창 분석 경로(insights._analyze_docs)에 똑같이 걸리는지.
+"""
+import random
+
+from sqlalchemy import select
+
+from src import insights, term_index
+from src.db import SessionLocal
+from src.models import Review, TermIndexSource, TermStat
+from src.sink import delete_reviews, store_reviews
+
+WORDS = ["배송", "포장", "가격", "품질", "색상", "사이즈", "냄새", "소음", "교환", "환불", "만족", "추천",
+         "느림", "파손", "불량", "최고"]
+LONG = "가" * (term_index.TERM_MAX_LEN + 5)
+
+
+def _reviews(n, seed):
+    rnd = random.Random(seed)
+    out = [{"body": " ".join(rnd.sample(WORDS, 5)) + f" 고유{seed}x{i}", "review_date": "2024-05-01"}
+           for i in range(n)]
+    out.append({"body": f"{LONG} 배송 최고 {seed}번째", "review_date": "2024-05-02"})  # 상한 넘는 단어
+    out.append({"body": "", "review_date": "2024-05-02"})                              # 빈 본문
+    return out
+
+
+def _index():
+    with SessionLocal() as s:
+        terms = {(r.source, r.kind, r.term): (r.tf, r.df) for r in s.execute(select(TermStat)).scalars()}
+        docs = {r.source: (r.docs, r.max_review_id) for r in s.execute(select(TermIndexSource)).scalars()}
+    return terms, docs
+
+
+def test_incremental_matches_rebuild(db):
+    store_reviews(_reviews(60, 1), source="a")
+    store_reviews(_reviews(40, 2), source="b")
+    store_reviews(_reviews(30, 3), source="a")
+    with SessionLocal() as s:
+        ids = s.execute(select(Review.id).order_by(Review.id)).scalars().all()
+    delete_reviews(ids[5:40:3] + ids[61:63] + ids[70:100])   # 소스별 최대 id 는 남김(색인은 삭제된 id 도 반영된 것으로 봄)
+
+    terms, docs = _index()
+    assert all(df > 0 for _, df in terms.values())
+    assert not any(len(t) > term_index.TERM_MAX_LEN for _, _, t in terms)
+    term_index.rebuild()
+    assert _index() == (terms, docs)
+
+
+def test_deleting_last_doc_of_a_term_drops_its_row(db):
+    store_reviews([{"body": "빠름 유일한단어"}, {"body": "빠름 느림 불량"}], source="a")
+    with SessionLocal() as s:
+        rid = s.execute(select(Review.id).where(Review.body.contains("유일한단어"))).scalar_one()
+    delete_reviews([rid])
+    terms, _ = _index()
+    assert ("a", "uni", "유일한단어") not in terms
+    assert terms[("a", "uni", "빠름")] == (1, 1)
+
+
+def test_term_cap_same_in_index_and_window(db):
+    store_reviews(_reviews(30, 4), source="a")
+    via_index = insights.compute_insights(limit=10_000, source="a", min_df=1, topk=200, use_index=True)
+    via_window = insights.compute_insights(limit=10_000, source="a", min_df=1, topk=200, use_index=False)
+    for key in ("total", "top_terms", "top_bigrams"):
+        assert via_index[key] == via_window[key], key
+    by_label = lambda out: sorted((p["label"], p["count"]) for p in out["pain_points"])   # 동률 순서는 경로마다 다름
+    assert by_label(via_index) == by_label(via_window)
+    assert LONG not in {t["term"] for t in via_window["top_terms"]}
@@ -0,0 +1,56 @@
+# tests/test_text.py
+"""
+text: 토큰화/불만 라벨 단일 패스가 기존 방식(normalize → lower → TOKEN_PATTERN → 불용어 제거,
+라벨별 키워드 정규식 검색)과 같은 결과인지. 원문 검색(mask)과 단어 메모 경로(mask_words) 모두.
+"""
+import random, re
+
+import pytest
+
+from src.text import (PAIN_KEYWORDS, PAIN_MATCHER, STOPWORDS, TOKEN_PATTERN, KeywordMatcher, normalize,
+                      pain_labels, pain_mask, text_features, tokenize, word_runs)
+
+_PIECES = (sorted({k for kws in PAIN_KEYWORDS.values() for k in kws}) + sorted(STOPWORDS)[:15]
+           + ["의자", "튼튼해요", "삐걱거려요", "불편해요", "늦게", "Good", "NICE", "a", "가", "x1", "ㅎㅎ",
+              "👍", "!!", "\n", "   ", "3일", "USB-C", "Ａ"])
+
+
+def _texts(n, seed=3):
+    rnd = random.Random(seed)
+    return [rnd.choice(["", " "]).join(rnd.choice(_PIECES) for _ in range(rnd.randint(0, 25))) for _ in range(n)]
+
+
+def _legacy_tokens(t):
+    return [w for w in re.findall(TOKEN_PATTERN, normalize(t).lower()) if w not in STOPWORDS]
+
+
+def _legacy_labels(t):
+    return [label for label, kws in PAIN_KEYWORDS.items()
+            if t and re.search("|".join(map(re.escape, kws)), t)]
+
+
+@pytest.mark.parametrize("text", _texts(400) + ["", "불편하고 늦게 와서 냄새", "가성비가격쿠폰할인"])
+def test_single_pass_matches_legacy(text):
+    assert tokenize(text) == _legacy_tokens(text)
+    assert PAIN_MATCHER.labels(PAIN_MATCHER.mask(text)) == _legacy_labels(text)
+    assert pain_labels(text, word_runs(text)) == _legacy_labels(text)
+    feats = text_features(text)
+    if text:
+        assert feats["tokens"].split() == _legacy_tokens(text)
+        assert feats["pain_mask"] == pain_mask(text)
+
+
+def test_overlapping_and_prefix_keywords():
+    m = KeywordMatcher({"a": ["불"], "b": ["불편"], "c": ["편하"], "d": ["abc", "b"]})
+    assert m.labels(m.mask("불편하다")) == ["a", "b", "c"]
+    assert m.labels(m.mask("xabcx")) == ["d"]
+    assert m.labels(m.mask("")) == []
+    assert not m.words_ok                      # 영문 키워드가 있으면 단어 메모 경로를 쓰지 않음
+    assert KeywordMatcher({"a": ["불편"]}).words_ok
+
+
+def test_word_memo_survives_reset():
+    m = KeywordMatcher(PAIN_KEYWORDS)
+    m.MEMO_MAX = 3
+    for t in _texts(50, seed=9):
+        assert m.mask_words(word_runs(t)) == m.mask(t)
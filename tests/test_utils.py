@@ -0,0 +1,43 @@
+# tests/test_utils.py
+"""utils.canonical_url: 같은 상품을 가리키는 URL 변형이 한 products.url 로 모이는지."""
+import pytest
+
+from src.utils import canonical_url
+
+COUPANG = "https://www.coupang.com/vp/products/12345"
+
+
+@pytest.mark.parametrize("url", [
+    COUPANG,
+    COUPANG + "/",
+    "HTTPS://WWW.Coupang.com/vp/products/12345",
+    "http://www.coupang.com/vp/products/12345",
+    COUPANG + "?itemId=1&vendorItemId=2",
+    COUPANG + "?vendorItemId=9&q=의자&utm_source=x#sdpReview",
+    "  " + COUPANG + "  ",
+])
+def test_coupang_product_keeps_path_only(url):
+    assert canonical_url(url) == COUPANG
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://Shop.Example.com/item?b=2&a=1", "https://shop.example.com/item?a=1&b=2"),
+    ("https://shop.example.com/item/?id=7&utm_medium=cpc&fbclid=zz&gclid=y#top",
+     "https://shop.example.com/item?id=7"),
+    ("https://shop.example.com:8443/item?id=7&RANK=3", "https://shop.example.com:8443/item?id=7"),
+    ("https://shop.example.com", "https://shop.example.com/"),
+    ("https://shop.example.com/item?flag=&id=7", "https://shop.example.com/item?flag=&id=7"),
+    ("https://m.coupang.com/vm/products/1?itemId=2", "https://m.coupang.com/vm/products/1?itemId=2"),
+])
+def test_generic_urls(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_empty():
+    assert canonical_url(None) is None
+    assert canonical_url("") is None
+
+
+def test_idempotent():
+    for u in ("https://Shop.Example.com/item/?b=2&a=1&utm_x=1", COUPANG + "?itemId=1"):
+        assert canonical_url(canonical_url(u)) == canonical_url(u)